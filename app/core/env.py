@@ -1,8 +1,12 @@
+import logging
 import os
 
 from dotenv import load_dotenv
 
 
+logger = logging.getLogger(__name__)
+
+
 def load_env() -> None:
     load_dotenv()
 
@@ -17,3 +21,18 @@ def get_required_env(name: str) -> str:
 def is_force_extract_enabled() -> bool:
     value = os.getenv("PLANZ_FORCE_EXTRACT", "")
     return value.strip().lower() in {"true", "1", "yes"}
+
+
+def parse_domain_values(raw: str) -> dict[str, float]:
+    """Parse ``"muenchen.de=21600,example.com=3600"`` into a domain -> number map."""
+    values: dict[str, float] = {}
+    for item in raw.split(","):
+        domain, _, value = item.partition("=")
+        domain = domain.strip().lower()
+        if not domain or not value.strip():
+            continue
+        try:
+            values[domain] = float(value)
+        except ValueError:
+            logger.warning("Ignoring invalid per-domain setting: %s", item)
+    return values
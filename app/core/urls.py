@@ -22,3 +22,9 @@ def canonicalize_url(url: str) -> str:
 def extract_domain(url: str) -> str:
     parsed = urlparse(url if "://" in url else f"https://{url}")
     return parsed.netloc.lower()
+
+
+def bare_domain(url_or_domain: str) -> str:
+    """Lower-cased host without a leading ``www.``, from a URL or a bare domain."""
+    domain = extract_domain(url_or_domain) if "://" in url_or_domain else url_or_domain.lower()
+    return domain[4:] if domain.startswith("www.") else domain
@@ -22,6 +22,28 @@ def ensure_sqlite_schema(engine: Engine) -> None:
             conn.execute(text("ALTER TABLE source_urls ADD COLUMN last_extraction_status TEXT"))
         if "last_extraction_error" not in columns:
             conn.execute(text("ALTER TABLE source_urls ADD COLUMN last_extraction_error TEXT"))
+        if "content_length" not in columns:
+            conn.execute(text("ALTER TABLE source_urls ADD COLUMN content_length INTEGER"))
+        if "etag" not in columns:
+            conn.execute(text("ALTER TABLE source_urls ADD COLUMN etag VARCHAR(255)"))
+        if "last_modified" not in columns:
+            conn.execute(text("ALTER TABLE source_urls ADD COLUMN last_modified VARCHAR(64)"))
+        if "bytes_read" not in columns:
+            conn.execute(text("ALTER TABLE source_urls ADD COLUMN bytes_read INTEGER"))
+        if "truncated_reason" not in columns:
+            conn.execute(text("ALTER TABLE source_urls ADD COLUMN truncated_reason VARCHAR(40)"))
+        if "revisit_checks" not in columns:
+            conn.execute(text("ALTER TABLE source_urls ADD COLUMN revisit_checks INTEGER"))
+        if "revisit_changes" not in columns:
+            conn.execute(text("ALTER TABLE source_urls ADD COLUMN revisit_changes INTEGER"))
+        if "revisit_observed_s" not in columns:
+            conn.execute(text("ALTER TABLE source_urls ADD COLUMN revisit_observed_s FLOAT"))
+        if "last_changed_at" not in columns:
+            conn.execute(text("ALTER TABLE source_urls ADD COLUMN last_changed_at DATETIME"))
+        if "next_fetch_at" not in columns:
+            conn.execute(text("ALTER TABLE source_urls ADD COLUMN next_fetch_at DATETIME"))
+        if "content_text" not in columns:
+            conn.execute(text("ALTER TABLE source_urls ADD COLUMN content_text TEXT"))
         event_columns = _get_columns(conn, "events")
         if event_columns:
             if "external_key" not in event_columns:
@@ -1,8 +1,11 @@
 from app.db.models.acquisition_issue import AcquisitionIssue
 from app.db.models.calendar_sync import CalendarSync
+from app.db.models.domain_circuit import DomainCircuit
 from app.db.models.event import Event
 from app.db.models.event_series import EventSeries
 from app.db.models.feed_token import FeedToken
+from app.db.models.listing_item import ListingItem
+from app.db.models.llm_stage_usage import LlmStageUsage
 from app.db.models.search_query import SearchQuery
 from app.db.models.search_result import SearchResult
 from app.db.models.search_run import SearchRun
@@ -22,7 +25,10 @@ __all__ = [
     "SearchResult",
     "SourceUrlDiscovery",
     "AcquisitionIssue",
+    "DomainCircuit",
     "EventSeries",
+    "ListingItem",
+    "LlmStageUsage",
     "User",
     "FeedToken",
     "UserPreference",
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+from sqlalchemy import Integer, Text, Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.db.models.acquisition_issue import AwareDateTime
+
+
+class DomainCircuit(Base):
+    """Circuit-breaker state for a fetch domain, kept across runs."""
+
+    __tablename__ = "domain_circuits"
+
+    id: Mapped[UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid4)
+    domain: Mapped[str] = mapped_column(Text, unique=True)
+    state: Mapped[str] = mapped_column(Text, default="closed")
+    consecutive_failures: Mapped[int] = mapped_column(Integer, default=0)
+    opened_at: Mapped[datetime | None] = mapped_column(AwareDateTime(), nullable=True)
+    open_until: Mapped[datetime | None] = mapped_column(AwareDateTime(), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        AwareDateTime(),
+        default=lambda: datetime.now(tz=timezone.utc),
+    )
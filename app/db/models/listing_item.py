@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+from sqlalchemy import Text, Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.schema import UniqueConstraint
+
+from app.db.base import Base
+from app.db.models.acquisition_issue import AwareDateTime
+
+
+class ListingItem(Base):
+    """Fingerprint of one item on a listing, kept across runs to skip unchanged items."""
+
+    __tablename__ = "listing_items"
+    __table_args__ = (UniqueConstraint("listing_url", "item_key"),)
+
+    id: Mapped[UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid4)
+    listing_url: Mapped[str] = mapped_column(Text)
+    item_key: Mapped[str] = mapped_column(Text)
+    fingerprint: Mapped[str] = mapped_column(Text)
+    first_seen_at: Mapped[datetime] = mapped_column(
+        AwareDateTime(),
+        default=lambda: datetime.now(tz=timezone.utc),
+    )
+    last_seen_at: Mapped[datetime] = mapped_column(
+        AwareDateTime(),
+        default=lambda: datetime.now(tz=timezone.utc),
+    )
+    gone_at: Mapped[datetime | None] = mapped_column(AwareDateTime(), nullable=True)
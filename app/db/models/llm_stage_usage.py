@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+from sqlalchemy import Float, Integer, Text, Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.db.models.acquisition_issue import AwareDateTime
+
+
+class LlmStageUsage(Base):
+    """LLM calls, tokens and latency of one pipeline stage in one script run."""
+
+    __tablename__ = "llm_stage_usage"
+
+    id: Mapped[UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid4)
+    run_id: Mapped[UUID] = mapped_column(Uuid(as_uuid=True), index=True)
+    script: Mapped[str] = mapped_column(Text)
+    stage: Mapped[str] = mapped_column(Text)
+    calls: Mapped[int] = mapped_column(Integer, default=0)
+    errors: Mapped[int] = mapped_column(Integer, default=0)
+    retries: Mapped[int] = mapped_column(Integer, default=0)
+    prompt_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    completion_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    cost_usd: Mapped[float] = mapped_column(Float, default=0.0)
+    latency_p50_s: Mapped[float] = mapped_column(Float, default=0.0)
+    latency_p95_s: Mapped[float] = mapped_column(Float, default=0.0)
+    started_at: Mapped[datetime] = mapped_column(AwareDateTime())
+    recorded_at: Mapped[datetime] = mapped_column(
+        AwareDateTime(),
+        default=lambda: datetime.now(tz=timezone.utc),
+    )
@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, Uuid
+from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, Text, Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -38,7 +38,24 @@ class SourceUrl(Base):
     fetch_status: Mapped[str | None] = mapped_column(String(20), nullable=True)
     content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     content_excerpt: Mapped[str | None] = mapped_column(Text, nullable=True)
+    content_text: Mapped[str | None] = mapped_column(Text, nullable=True)
+    content_length: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    etag: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    last_modified: Mapped[str | None] = mapped_column(String(64), nullable=True)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    bytes_read: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    truncated_reason: Mapped[str | None] = mapped_column(String(40), nullable=True)
+    revisit_checks: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    revisit_changes: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    revisit_observed_s: Mapped[float | None] = mapped_column(Float, nullable=True)
+    last_changed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    next_fetch_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
     last_extracted_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     last_extracted_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True),
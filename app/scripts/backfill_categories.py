@@ -1,16 +1,18 @@
 """Backfill EventSeries.category via minimal LLM prompt for rows where category IS NULL."""
 from __future__ import annotations
 
+from datetime import datetime, timezone
 import logging
-import os
 
-from openai import OpenAI
 from sqlalchemy import select
 
 from app.db.session import SessionLocal
 from app.db.models.event import Event
 from app.db.models.event_series import EventSeries
 from app.domain.constants import EVENT_CATEGORIES
+from app.services.llm.gateway import complete_text, llm_gateway
+from app.services.llm.response_cache import configure_llm_cache
+from app.services.llm.usage import record_llm_usage
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,20 +21,21 @@ _MODEL = "gpt-4.1-nano"
 _VALID = set(EVENT_CATEGORIES)
 
 
-def _categorize(client: OpenAI, title: str, description: str) -> str:
+def _categorize(title: str, description: str) -> str:
     prompt = (
         f"Event title: {title}\nDescription: {description[:500]}\n\n"
         f'Return exactly one word — the category of this kids event: '
         f'{", ".join(EVENT_CATEGORIES)}'
     )
     try:
-        response = client.chat.completions.create(
+        raw = complete_text(
+            "backfill_categories",
+            accept=lambda content: content.strip().lower() in _VALID,
             model=_MODEL,
             messages=[{"role": "user", "content": prompt}],
             max_tokens=10,
             temperature=0,
-        )
-        raw = response.choices[0].message.content.strip().lower()
+        ).strip().lower()
         return raw if raw in _VALID else "other"
     except Exception:
         logger.exception("Categorization failed for title=%r", title)
@@ -40,9 +43,6 @@ def _categorize(client: OpenAI, title: str, description: str) -> str:
 
 
 def backfill_categories() -> None:
-    api_key = os.getenv("OPENAI_API_KEY")
-    client = OpenAI(api_key=api_key)
-
     with SessionLocal() as session:
         series_list = session.scalars(
             select(EventSeries).where(
@@ -53,7 +53,7 @@ def backfill_categories() -> None:
         logger.info("Found %d series needing categorization", len(series_list))
 
         for series in series_list:
-            category = _categorize(client, series.title or "", series.description or "")
+            category = _categorize(series.title or "", series.description or "")
             series.category = category
 
             # Propagate to linked Event rows
@@ -68,4 +68,15 @@ def backfill_categories() -> None:
 
 
 if __name__ == "__main__":
-    backfill_categories()
+    llm_cache = configure_llm_cache()
+    started_at = datetime.now(tz=timezone.utc)
+    try:
+        backfill_categories()
+    finally:
+        for line in llm_gateway().summary_lines():
+            logger.info(line)
+        with SessionLocal() as session:
+            record_llm_usage(session, "backfill_categories", started_at)
+            session.commit()
+        if llm_cache is not None:
+            logger.info(llm_cache.summary_line())
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import argparse
+from datetime import date, datetime
+import re
+import timeit
+from zoneinfo import ZoneInfo
+
+from app.services.extract.german_dates import (
+    find_date_range,
+    find_schedule,
+    parse_display_datetime,
+    parse_month,
+)
+
+SCHEDULE_TEXTS = [
+    "Der Gasteig brummt Fr. 06.03.2026 09:00 - 11:00 Uhr Gasteig HP8 Tickets",
+    "Kindheit am Nil Museum Ägyptischer Kunst Sa. 07.03.2026 10:00 Uhr",
+    "Puppentheater Musik Hans-Sachs-Str. 7 Kaufen",
+]
+RANGE_TEXTS = [
+    "03 MÄRZ bis 05 MÄRZ Kindheit am Nil Di. 03.03.2026 10:00 - 20:00 Uhr",
+    "12 Okt. bis 03 Nov Ausstellung",
+    "Ohne Zeitraum",
+]
+DISPLAY_VALUES = ["06.03.2026 - 09:00:00", "07.03.2026 - 17:30:00", "invalid"]
+
+
+# The per-call implementations the grammar module replaced, for comparison.
+
+
+def _baseline_schedule(text: str):
+    match = re.search(
+        r"((?:Mo|Di|Mi|Do|Fr|Sa|So)\.\s+\d{2}\.\d{2}\.\d{4}\s+\d{2}:\d{2}(?:\s*-\s*\d{2}:\d{2})?\s*Uhr)",
+        text,
+    )
+    if not match:
+        return None
+    match = re.search(
+        r"(?:Mo|Di|Mi|Do|Fr|Sa|So)\.\s+(\d{2})\.(\d{2})\.(\d{4})\s+(\d{2}):(\d{2})(?:\s*-\s*(\d{2}):(\d{2}))?\s*Uhr",
+        match.group(1),
+    )
+    day, month, year, start_h, start_m, end_h, end_m = match.groups()
+    tz = ZoneInfo("Europe/Berlin")
+    start = datetime(int(year), int(month), int(day), int(start_h), int(start_m), tzinfo=tz)
+    end = None
+    if end_h and end_m:
+        end = datetime(int(year), int(month), int(day), int(end_h), int(end_m), tzinfo=tz)
+    return start, end
+
+
+def _baseline_range(text: str, reference_year: int):
+    match = re.search(
+        r"(\d{2})\s+([A-Za-zÄÖÜäöüß\.]+)\s+bis\s+(\d{2})\s+([A-Za-zÄÖÜäöüß\.]+)",
+        text,
+    )
+    if not match:
+        return None
+    start_day, start_month_name, end_day, end_month_name = match.groups()
+    start_month = parse_month(start_month_name)
+    end_month = parse_month(end_month_name)
+    if start_month is None or end_month is None:
+        return None
+    start_date = date(reference_year, start_month, int(start_day))
+    end_year = reference_year + 1 if end_month < start_month else reference_year
+    return start_date, date(end_year, end_month, int(end_day))
+
+
+def _baseline_display(value: str):
+    try:
+        parsed = datetime.strptime(value.strip(), "%d.%m.%Y - %H:%M:%S")
+    except ValueError:
+        return None
+    return parsed.replace(tzinfo=ZoneInfo("Europe/Berlin"))
+
+
+CASES = {
+    "schedule": (SCHEDULE_TEXTS, find_schedule, _baseline_schedule),
+    "date_range": (
+        RANGE_TEXTS,
+        lambda text: find_date_range(text, 2026),
+        lambda text: _baseline_range(text, 2026),
+    ),
+    "display_datetime": (DISPLAY_VALUES, parse_display_datetime, _baseline_display),
+}
+
+
+def benchmark_case(name: str, number: int) -> tuple[float, float]:
+    """Return (grammar, baseline) microseconds per call for ``name``."""
+    inputs, grammar, baseline = CASES[name]
+
+    def run(function) -> float:
+        elapsed = min(
+            timeit.repeat(lambda: [function(value) for value in inputs], number=number, repeat=3)
+        )
+        return elapsed / (number * len(inputs)) * 1e6
+
+    return run(grammar), run(baseline)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Microbenchmark the German date/time grammar against per-call parsing."
+    )
+    parser.add_argument("--number", type=int, default=20000, help="Loops per timing")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    for name in CASES:
+        grammar_us, baseline_us = benchmark_case(name, args.number)
+        print(
+            f"[{name}] grammar_us={grammar_us:.2f} baseline_us={baseline_us:.2f} "
+            f"speedup={baseline_us / grammar_us:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
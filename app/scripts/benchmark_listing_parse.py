@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+import time
+import tracemalloc
+
+from app.services.extract.muenchen_listing_parser import (
+    build_tree,
+    lxml_available,
+    next_link_href,
+    parse_listing,
+)
+
+BASE_URL = "https://www.muenchen.de/veranstaltungen/event/kinder"
+
+# name -> build_tree kwargs
+MODES = {
+    "bs4-full": {"backend": "bs4", "scoped": False},
+    "bs4-scoped": {"backend": "bs4", "scoped": True},
+    "lxml": {"backend": "lxml"},
+}
+
+_ITEM = """
+<li class="m-listing__list-item">
+  <div class="m-event-list-item" itemprop="event" itemscope="">
+    <div class="m-event-list-item__date">
+      <div class="m-date-range">
+        <time class="m-date-range__item" datetime="2026-03-{day:02d}T12:00:00Z"></time>
+        <time class="m-date-range__item" datetime="2026-03-{day:02d}T12:00:00Z"></time>
+      </div>
+    </div>
+    <div class="m-event-list-item__body">
+      <h3 class="m-event-list-item__headline">
+        <a href="/veranstaltungen/kinder/event-{index}"><span>Event {index}</span></a>
+      </h3>
+      <p class="m-event-list-item__detail">
+        <time datetime="{day:02d}.03.2026 - 10:00:00">Sa. {day:02d}.03.2026 10:00</time> Uhr
+      </p>
+      <p class="m-event-list-item__detail" itemprop="location">Venue {index}</p>
+    </div>
+    <div class="m-event-list-item__meta">
+      <a href="https://tickets.example.com/{index}"><span>Tickets</span></a>
+    </div>
+  </div>
+</li>
+"""
+
+_CHROME = """
+<header><nav><ul>{links}</ul></nav></header>
+<script>window.dataLayer = [{payload}];</script>
+"""
+
+
+def synthetic_listing_page(items: int, chrome_links: int = 300) -> str:
+    """A muenchen.de-shaped listing page with ``items`` events and site chrome around them."""
+    links = "".join(
+        f'<li><a href="/themen/{index}">Thema {index}</a></li>' for index in range(chrome_links)
+    )
+    payload = ",".join(f'{{"k{index}": "v{index}"}}' for index in range(chrome_links))
+    body = "".join(
+        _ITEM.format(index=index, day=index % 28 + 1) for index in range(items)
+    )
+    return (
+        "<html><head><title>Kinder</title></head><body>"
+        + _CHROME.format(links=links, payload=payload)
+        + f'<ul class="m-listing">{body}</ul>'
+        + '<a rel="next" href="?page=2">Weiter</a>'
+        + f"<footer><ul>{links}</ul></footer></body></html>"
+    )
+
+
+_GENERIC_CARD = """
+<li class="event">
+  <h3><a href="/veranstaltungen/kinder/event-{index}">Event {index}</a></h3>
+  <p>Sa. {day:02d}.03.2026 10:00 - 12:00 Uhr</p>
+  <span class="location">Venue {index}</span>
+  <a class="button" href="https://tickets.example.com/{index}">Tickets</a>
+</li>
+"""
+
+
+def synthetic_generic_page(items: int) -> str:
+    """A third-party calendar page: event cards without muenchen.de markup or a "card" class."""
+    body = "".join(
+        _GENERIC_CARD.format(index=index, day=index % 28 + 1) for index in range(items)
+    )
+    return f"<html><body><main><ul>{body}</ul></main></body></html>"
+
+
+SYNTHETIC_PAGES = {
+    "muenchen": synthetic_listing_page,
+    "generic": synthetic_generic_page,
+}
+
+
+@dataclass
+class ParseResult:
+    mode: str
+    parse_ms: float
+    peak_kib: float
+    items: int
+
+
+def benchmark_page(html: str, mode: str, repeat: int) -> ParseResult:
+    kwargs = MODES[mode]
+
+    def run() -> int:
+        tree = build_tree(html, **kwargs)
+        next_link_href(tree)
+        return len(parse_listing(html, BASE_URL, soup=tree))
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        items = run()
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        run()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return ParseResult(mode, min(timings) * 1000, peak / 1024, items)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Compare listing parse modes by parse time and peak memory per page."
+    )
+    parser.add_argument("paths", nargs="*", help="Saved listing pages (HTML files)")
+    parser.add_argument(
+        "--synthetic",
+        default="100",
+        help="Comma-separated item counts of generated pages when no paths are given",
+    )
+    parser.add_argument(
+        "--kind",
+        choices=sorted(SYNTHETIC_PAGES),
+        default="muenchen",
+        help="Markup of the generated pages",
+    )
+    parser.add_argument(
+        "--modes",
+        default=",".join(MODES),
+        help="Comma-separated modes (default: all)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per page and mode")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    modes = [name.strip() for name in args.modes.split(",") if name.strip()]
+    if "lxml" in modes and not lxml_available():
+        print("lxml is not installed; skipping the lxml mode")
+        modes.remove("lxml")
+    pages = [(path, open(path, encoding="utf-8").read()) for path in args.paths]
+    if not pages:
+        build = SYNTHETIC_PAGES[args.kind]
+        for count in (int(value) for value in args.synthetic.split(",") if value.strip()):
+            pages.append((f"synthetic:{args.kind}:{count}", build(count)))
+
+    for label, html in pages:
+        print(f"{label} bytes={len(html.encode())}")
+        for mode in modes:
+            result = benchmark_page(html, mode, args.repeat)
+            per_item = result.parse_ms / result.items if result.items else 0.0
+            print(
+                f"  [{result.mode}] parse_ms={result.parse_ms:.1f} "
+                f"ms_per_item={per_item:.3f} peak_kib={result.peak_kib:.0f} "
+                f"items={result.items}"
+            )
+    # tracemalloc only sees Python allocations; lxml's tree lives in libxml2's heap.
+    print("note: peak_kib excludes memory allocated inside libxml2 (lxml mode)")
+
+
+if __name__ == "__main__":
+    main()
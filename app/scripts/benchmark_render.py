@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import argparse
+
+from app.core.env import load_env
+from app.logging import configure_logging
+from app.services.fetch.playwright_fetcher import close_browser_pool, get_browser_pool
+from app.services.fetch.render_profiles import PROFILES, RenderMetrics, get_profile
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Compare Playwright render profiles by render time and bytes transferred."
+    )
+    parser.add_argument("url", help="URL to render")
+    parser.add_argument(
+        "--profiles",
+        default=",".join(PROFILES),
+        help="Comma-separated profile names (default: all)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Renders per profile")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Render timeout in seconds")
+    return parser
+
+
+def benchmark_profiles(
+    url: str,
+    profile_names: list[str],
+    repeat: int,
+    timeout: float,
+    pool=None,
+) -> dict[str, list[RenderMetrics]]:
+    pool = pool or get_browser_pool()
+    results: dict[str, list[RenderMetrics]] = {}
+    for name in profile_names:
+        profile = get_profile(name)
+        runs: list[RenderMetrics] = []
+        for _ in range(repeat):
+            metrics = RenderMetrics()
+            _text, error, _status = pool.fetch(url, timeout, profile, metrics)
+            if error:
+                print(f"[{name}] error={error}")
+                continue
+            runs.append(metrics)
+        results[name] = runs
+    return results
+
+
+def main() -> None:
+    load_env()
+    configure_logging()
+    args = build_parser().parse_args()
+    names = [name.strip() for name in args.profiles.split(",") if name.strip()]
+    try:
+        results = benchmark_profiles(args.url, names, args.repeat, args.timeout)
+    finally:
+        close_browser_pool()
+
+    for name, runs in results.items():
+        if not runs:
+            print(f"[{name}] no successful renders")
+            continue
+        avg_s = sum(run.render_s for run in runs) / len(runs)
+        avg_bytes = sum(run.bytes_transferred for run in runs) // len(runs)
+        avg_requests = sum(run.requests for run in runs) / len(runs)
+        avg_blocked = sum(run.blocked for run in runs) / len(runs)
+        print(
+            f"[{name}] renders={len(runs)} render_s={avg_s:.2f} bytes={avg_bytes} "
+            f"requests={avg_requests:.0f} blocked={avg_blocked:.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,12 @@ from app.services.fetch.diagnostics import (
     contains_date_token,
     contains_event_list_marker,
 )
-from app.services.fetch.playwright_fetcher import fetch_url_playwright, is_allowlisted
+from app.services.fetch.http_client import close_http_clients, get_http_client
+from app.services.fetch.playwright_fetcher import (
+    close_browser_pool,
+    fetch_url_playwright,
+    is_allowlisted,
+)
 from app.core.urls import extract_domain
 
 
@@ -28,15 +33,14 @@ class FetchResult:
 
 def _plain_fetch(url: str, timeout: float = 10.0) -> FetchResult:
     try:
-        with httpx.Client(timeout=timeout, follow_redirects=True) as client:
-            response = client.get(url)
-            return FetchResult(
-                text=response.text,
-                error=None,
-                status=response.status_code,
-                final_url=str(response.url),
-                content_type=response.headers.get("content-type"),
-            )
+        response = get_http_client().get(url, timeout=timeout)
+        return FetchResult(
+            text=response.text,
+            error=None,
+            status=response.status_code,
+            final_url=str(response.url),
+            content_type=response.headers.get("content-type"),
+        )
     except httpx.HTTPStatusError as exc:
         resp = exc.response
         return FetchResult(
@@ -72,6 +76,7 @@ def main() -> None:
     url = sys.argv[1]
     plain = _plain_fetch(url)
     _print_report("plain", plain)
+    close_http_clients()
 
     use_playwright = os.getenv("PLANZ_USE_PLAYWRIGHT", "").strip().lower() in {"true", "1", "yes"}
     domain = extract_domain(url)
@@ -85,6 +90,7 @@ def main() -> None:
             content_type=None,
         )
         _print_report("playwright", pw_result)
+        close_browser_pool()
 
 
 if __name__ == "__main__":
@@ -8,6 +8,8 @@ from app.db.session import engine, get_session
 from app.logging import configure_logging
 from app.services.extract.llm_event_extractor import extract_events_from_text
 from app.services.extract.extract_and_store import extract_and_store_for_sources
+from app.services.llm.response_cache import configure_llm_cache
+from app.services.llm.usage import save_llm_usage
 
 
 def run_extract_events() -> dict[str, int]:
@@ -29,11 +31,28 @@ def run_extract_events() -> dict[str, int]:
     return stats
 
 
+def _save_llm_usage(started_at: datetime) -> None:
+    session_gen = get_session()
+    session = next(session_gen)
+    try:
+        save_llm_usage(session, "extract_events", started_at)
+    finally:
+        try:
+            next(session_gen)
+        except StopIteration:
+            pass
+
+
 def main() -> None:
     load_env()
     configure_logging()
     ensure_sqlite_schema(engine)
-    stats = run_extract_events()
+    llm_cache = configure_llm_cache()
+    started_at = datetime.now(tz=timezone.utc)
+    try:
+        stats = run_extract_events()
+    finally:
+        _save_llm_usage(started_at)
     print(f"Sources processed: {stats['sources_processed']}")
     print(f"Sources skipped (no content): {stats['sources_skipped_no_content']}")
     print(f"Sources skipped (unchanged hash): {stats['sources_skipped_unchanged_hash']}")
@@ -42,6 +61,8 @@ def main() -> None:
     print(f"Sources error extraction: {stats['sources_error_extraction']}")
     print(f"Sources past-only: {stats['sources_past_only']}")
     print(f"Events created: {stats['events_created_total']}")
+    if llm_cache is not None:
+        print(llm_cache.summary_line())
 
 
 if __name__ == "__main__":
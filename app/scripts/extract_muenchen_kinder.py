@@ -1,19 +1,37 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import date, datetime, timezone
 import logging
+import multiprocessing
+from typing import Iterable
 
 from app.config import settings
 from app.core.env import load_env
 from app.db.migrations.sqlite import ensure_sqlite_schema
 from app.db.session import engine, get_session
 from app.logging import configure_logging
+from app.services.extract.german_dates import find_date_range
+from app.services.extract.listing_items import ListingItemTracker
 from app.services.extract.series_cache import enrich_with_series_cache
 from app.services.extract.store_extracted_events import store_extracted_events
 from app.services.extract.muenchen_listing_parser import parse_listing
-from app.services.fetch.http_fetcher import fetch_url_text
-from app.services.fetch.listing_pagination import enumerate_listing_pages
+from app.services.fetch.cassette import CASSETTE_MODES, configure_cassette
+from app.services.fetch.circuit_breaker import CIRCUIT_OPEN_ERROR, CircuitBreaker, guarded
+from app.services.fetch.conditional import ConditionalFetcher
+from app.services.fetch.http_client import close_http_clients, pool_stats
+from app.services.fetch.http_fetcher import (
+    ConditionalFetchResult,
+    fetch_url_conditional,
+    fetch_url_text,
+)
+from app.services.fetch.page_cache import CACHE_MODES, PageCache
+from app.services.fetch.politeness import get_scheduler, polite
+from app.services.fetch.listing_pagination import ListingPage, iter_listing_pages
+from app.services.llm.gateway import llm_gateway
+from app.services.llm.response_cache import LLM_CACHE_MODES, configure_llm_cache
+from app.services.llm.usage import save_llm_usage
 from app.services.calendar.google_calendar_service import GoogleCalendarClient
 from app.services.calendar.sync_events import sync_unsynced_events
 from app.utils.heartbeat import start_heartbeat
@@ -26,32 +44,13 @@ from app.services.extract.weekend_slicer import classify_event_time
 
 logger = logging.getLogger(__name__)
 TICKET_PREFIX = "🎟 "
-_MONTHS = {
-    "JAN": 1,
-    "JANUAR": 1,
-    "FEB": 2,
-    "FEBRUAR": 2,
-    "MAERZ": 3,
-    "MÄRZ": 3,
-    "APR": 4,
-    "APRIL": 4,
-    "MAI": 5,
-    "JUN": 6,
-    "JUNI": 6,
-    "JUL": 7,
-    "JULI": 7,
-    "AUG": 8,
-    "AUGUST": 8,
-    "SEP": 9,
-    "SEPT": 9,
-    "SEPTEMBER": 9,
-    "OKT": 10,
-    "OKTOBER": 10,
-    "NOV": 11,
-    "NOVEMBER": 11,
-    "DEZ": 12,
-    "DEZEMBER": 12,
-}
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -81,14 +80,50 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Skip LLM detail-page summarization (fast debug mode)",
     )
+    parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=1,
+        help="Processes parsing listing pages and expanding their items (1 = in-process)",
+    )
+    parser.add_argument(
+        "--all-items",
+        action="store_true",
+        help="Process every listing item, not only items that are new or changed since the last run",
+    )
+    parser.add_argument(
+        "--cache-mode",
+        choices=CACHE_MODES,
+        default="use",
+        help="Detail-page cache: use cached pages, refresh them, or bypass the cache",
+    )
+    parser.add_argument(
+        "--llm-cache",
+        choices=LLM_CACHE_MODES,
+        default=None,
+        help="LLM response cache: use, refresh or bypass it (default: PLANZ_LLM_CACHE)",
+    )
+    parser.add_argument(
+        "--cassette",
+        choices=CASSETTE_MODES,
+        default=None,
+        help="Record HTTP and LLM traffic to a cassette, or replay it offline (default: PLANZ_CASSETTE)",
+    )
+    parser.add_argument("--cassette-path", default=None, help="Cassette archive path")
+    parser.add_argument(
+        "--cassette-latency",
+        type=float,
+        default=None,
+        help="Replay latency as a multiple of the recorded latency (0 = no delay)",
+    )
     return parser
 
 
-def _make_detail_fetcher():
+def _make_detail_fetcher(page_fetcher=fetch_url_text):
     """Return a fetcher that accepts a URL and returns plain text (wraps fetch_url_text)."""
 
     def fetcher(url: str) -> str:
-        text, _error, _status = fetch_url_text(url)
+        text, _error, _status = page_fetcher(url)
         return text or ""
 
     return fetcher
@@ -119,20 +154,25 @@ def extract_detail_events_from_listing(
     listing_html: str,
     listing_url: str,
     max_items: int | None = None,
+    listing_soup=None,
+    listing_items: list[dict] | None = None,
 ) -> list[dict]:
-    events: list[dict] = []
-    listing_meta = parse_listing(listing_html, listing_url)
-    items_processed = 0
-    for item in listing_meta:
-        if max_items is not None and items_processed >= max_items:
-            break
+    listing_meta = (
+        listing_items
+        if listing_items is not None
+        else parse_listing(listing_html, listing_url, soup=listing_soup)
+    )
+    return _collect_events(expand_listing_items(listing_meta), max_items)
+
+
+def expand_listing_items(items: list[dict]) -> list[tuple[dict, list[dict]]]:
+    """Pair each listing item with the event rows it expands to (possibly none)."""
+    expanded: list[tuple[dict, list[dict]]] = []
+    for item in items:
         detail_url = item.get("detail_url")
         address = item.get("address")
         ticket_url = item.get("ticket_url")
         extracted = _structured_events_from_listing_item(item)
-        if not extracted:
-            continue
-        items_processed += 1
         for ev in extracted:
             if detail_url:
                 ev["detail_url"] = detail_url
@@ -146,6 +186,27 @@ def extract_detail_events_from_listing(
                 ev["source_url"] = detail_url
             if address and not ev.get("location"):
                 ev["location"] = address
+        expanded.append((item, extracted))
+    return expanded
+
+
+def expand_listing_page(listing_html: str, listing_url: str) -> list[tuple[dict, list[dict]]]:
+    """Parse a listing page and expand its items; runs in ``--workers`` processes.
+
+    Takes and returns only plain strings and dicts so it pickles cheaply.
+    """
+    return expand_listing_items(parse_listing(listing_html, listing_url))
+
+
+def _collect_events(expanded: list[tuple[dict, list[dict]]], max_items: int | None) -> list[dict]:
+    events: list[dict] = []
+    items_processed = 0
+    for _item, extracted in expanded:
+        if max_items is not None and items_processed >= max_items:
+            break
+        if not extracted:
+            continue
+        items_processed += 1
         events.extend(extracted)
     return events
 
@@ -222,25 +283,7 @@ def _extract_date_range_bounds(item: dict, reference_year: int) -> tuple[date, d
     if range_start and range_end and range_end > range_start:
         return range_start, range_end
 
-    listing_text = item.get("listing_text") or ""
-    import re
-
-    match = re.search(
-        r"(\d{2})\s+([A-Za-zÄÖÜäöüß\.]+)\s+bis\s+(\d{2})\s+([A-Za-zÄÖÜäöüß\.]+)",
-        listing_text,
-    )
-    if not match:
-        return None
-    start_day, start_month_name, end_day, end_month_name = match.groups()
-    start_month = _parse_german_month(start_month_name)
-    end_month = _parse_german_month(end_month_name)
-    if start_month is None or end_month is None:
-        return None
-
-    start_date = date(reference_year, start_month, int(start_day))
-    end_year = reference_year + 1 if end_month < start_month else reference_year
-    end_date = date(end_year, end_month, int(end_day))
-    return start_date, end_date
+    return find_date_range(item.get("listing_text") or "", reference_year)
 
 
 def _parse_iso_date(value: object) -> date | None:
@@ -252,16 +295,6 @@ def _parse_iso_date(value: object) -> date | None:
         return None
 
 
-def _parse_german_month(value: str) -> int | None:
-    normalized = value.strip().rstrip(".").upper()
-    normalized = (
-        normalized.replace("Ä", "AE")
-        .replace("Ö", "OE")
-        .replace("Ü", "UE")
-    )
-    return _MONTHS.get(normalized)
-
-
 def _copy_time_to_date(source: datetime, target_date: date) -> datetime:
     return datetime(
         target_date.year,
@@ -284,30 +317,98 @@ def _apply_paid_prefix(events: list[dict]) -> list[dict]:
     return events
 
 
-def _deduplicate_events(events: list[dict]) -> list[dict]:
+def _event_key(event: dict) -> tuple:
+    return (
+        event.get("title") or "",
+        (event.get("start_time") or "")[:19],
+        event.get("location") or "",
+    )
+
+
+def _deduplicate_events(events: list[dict], known: Iterable[dict] = ()) -> list[dict]:
     """Remove duplicate events that share the same title, start_time, and location.
 
     muenchen.de often lists the same performance multiple times with different
     ticket URLs (different seating categories). Keep only the first occurrence.
+    Events duplicating one of ``known`` (rows of unchanged listing items that
+    an incremental run skips) are dropped as well.
 
     start_time is compared without timezone offset (first 19 chars) to handle
     inconsistent CET/CEST parsing across listing items for the same show.
     """
-    seen: set[tuple] = set()
+    seen: set[tuple] = {_event_key(event) for event in known}
     result: list[dict] = []
     for event in events:
-        start = (event.get("start_time") or "")[:19]
-        key = (
-            event.get("title") or "",
-            start,
-            event.get("location") or "",
-        )
+        key = _event_key(event)
         if key not in seen:
             seen.add(key)
             result.append(event)
     return result
 
 
+def _circuit_open_result() -> ConditionalFetchResult:
+    return ConditionalFetchResult(text=None, error=CIRCUIT_OPEN_ERROR, status=None)
+
+
+def _save_breaker(session, breaker: CircuitBreaker) -> None:
+    for line in breaker.summary_lines():
+        logger.info(line)
+    try:
+        breaker.save(session)
+        session.commit()
+    except Exception:  # noqa: BLE001
+        session.rollback()
+        logger.exception("Failed to persist circuit breaker state")
+
+
+def _add_llm_usage(totals: RunStats) -> None:
+    usage = llm_gateway().totals()
+    totals.llm_calls = usage.calls
+    totals.llm_prompt_tokens = usage.prompt_tokens
+    totals.llm_completion_tokens = usage.completion_tokens
+    totals.llm_cost_usd = usage.cost_usd
+
+
+def _make_listing_tracker(session, listing_url: str, args) -> ListingItemTracker | None:
+    """Incremental runs need persisted, enriched results and must see every item they record."""
+    if not args.persist or args.all_items:
+        return None
+    if args.max_events is not None:
+        logger.info("Incremental listing processing disabled with --max-events")
+        return None
+    if args.no_llm:
+        # Items stored without summaries must come back on the next enriched run.
+        logger.info("Incremental listing processing disabled with --no-llm")
+        return None
+    return ListingItemTracker(session, listing_url)
+
+
+def _listing_complete(pages: list[ListingPage]) -> bool:
+    """Only a crawl that fetched the whole listing can tell an item is gone."""
+    return bool(pages) and all(
+        page.html is not None and not page.error and not page.truncated for page in pages
+    )
+
+
+def _listing_pool(workers: int) -> ProcessPoolExecutor | None:
+    """Process pool for listing parsing, or None for in-process parsing.
+
+    Workers start from a fork server (spawn where unavailable): by the first
+    submit this process already runs the prefetch threads, the politeness
+    scheduler and HTTP pools, and forking it could inherit held locks.
+    """
+    if workers <= 1:
+        return None
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+
+
+def _submit_listing_page(executor: ProcessPoolExecutor | None, page) -> Future | None:
+    if executor is None or page.error or page.html is None:
+        return None
+    return executor.submit(expand_listing_page, page.html, page.url)
+
+
 def _resolve_sync_limit(max_events: int | None) -> int:
     if max_events is not None:
         return max_events
@@ -321,6 +422,8 @@ def main() -> None:
     load_env()
     configure_logging("DEBUG" if args.verbose else None)
     ensure_sqlite_schema(engine)
+    cassette = configure_cassette(args.cassette, args.cassette_path, args.cassette_latency)
+    llm_cache = configure_llm_cache(args.llm_cache)
 
     start_url = "https://www.muenchen.de/veranstaltungen/event/kinder"
     now = datetime.now(tz=timezone.utc)
@@ -329,46 +432,75 @@ def main() -> None:
     session = next(session_gen)
     created = 0
     updated = 0
+    # Listing and detail pages share muenchen.de's politeness budget and
+    # circuit; cache hits never reach the network, so they bypass both.
+    breaker = CircuitBreaker.from_env().load(session)
+    network_fetch = guarded(polite(fetch_url_conditional), breaker, _circuit_open_result)
+    listing_fetcher = ConditionalFetcher(fetch=network_fetch)
+    page_cache = PageCache.from_env() if args.cache_mode != "off" else None
+    detail_fetcher = ConditionalFetcher(
+        fetch=network_fetch,
+        cache=page_cache,
+        cache_mode=args.cache_mode,
+    )
+    # Pages go to the pool as pagination yields them and are merged back in
+    # page order, so dedup sees events in the same order as a serial run.
+    executor = _listing_pool(args.workers)
     try:
         domain_row = get_or_create_domain(session, "muenchen.de")
         source_url = prepare_source_url(session, start_url, domain_row)
 
         overall_timer = Timer("overall")
         overall_timer.__enter__()
-        pages = list(
-            enumerate_listing_pages(
-                start_url=start_url,
-                fetcher=fetch_url_text,
-                max_pages=args.pages,
-            )
-        )
+        pages = []
+        expansions: list[Future | None] = []
+        for page in iter_listing_pages(
+            start_url=start_url,
+            fetcher=listing_fetcher,
+            max_pages=args.pages,
+            build_trees=executor is None,
+        ):
+            pages.append(page)
+            expansions.append(_submit_listing_page(executor, page))
         if pages:
-            logger.info("Listing pages to process: %s", ", ".join(pages))
+            logger.info("Listing pages to process: %s", ", ".join(page.url for page in pages))
         logger.info("Found listing pages: %s", len(pages))
 
+        tracker = _make_listing_tracker(session, start_url, args)
+        listing_complete = _listing_complete(pages)
         all_events = []
+        unchanged_events: list[dict] = []
         run_stats: list[RunStats] = []
         remaining_events = args.max_events
-        for idx, page_url in enumerate(pages, 1):
+        for idx, page in enumerate(pages, 1):
             if remaining_events is not None and remaining_events <= 0:
                 break
             stats = RunStats(page_index=idx, page_total=len(pages))
-            with Timer("fetch") as t_fetch:
-                text, error, status = fetch_url_text(page_url)
-            stats.fetch_s = t_fetch.elapsed
-            if error or text is None:
+            stats.fetch_s = page.fetch_s
+            if page.error or page.html is None:
                 stats.errors_count += 1
-                stats.total_elapsed_s = t_fetch.elapsed
+                stats.total_elapsed_s = page.fetch_s
                 stats.log_status(logger)
                 run_stats.append(stats)
                 continue
             stop_hb = start_heartbeat("extract_page", interval_s=30, logger=logger)
             with Timer("extract") as t_extract:
-                events = extract_detail_events_from_listing(
-                    listing_html=text,
-                    listing_url=page_url,
-                    max_items=remaining_events,
-                )
+                future = expansions[idx - 1]
+                if future is not None:
+                    expanded = future.result()
+                else:
+                    expanded = expand_listing_items(
+                        parse_listing(page.html, page.url, soup=page.soup)
+                    )
+                if tracker is not None:
+                    fresh = []
+                    for item, extracted in expanded:
+                        if tracker.observe(item):
+                            fresh.append((item, extracted))
+                        else:
+                            unchanged_events.extend(extracted)
+                    expanded = fresh
+                events = _collect_events(expanded, remaining_events)
             stop_hb()
             stats.extract_s = t_extract.elapsed
             all_events.extend(events)
@@ -380,12 +512,14 @@ def main() -> None:
             run_stats.append(stats)
 
         logger.info("Extracted raw events: %s", len(all_events))
-        all_events = _deduplicate_events(all_events)
+        all_events = _deduplicate_events(all_events, known=unchanged_events)
         logger.info("After dedup: %s events", len(all_events))
 
         if args.persist and not args.no_llm:
             logger.info("Enriching events with LLM detail-page summaries...")
-            all_events = enrich_with_series_cache(session, all_events, _make_detail_fetcher(), now)
+            all_events = enrich_with_series_cache(
+                session, all_events, _make_detail_fetcher(detail_fetcher), now
+            )
             all_events = _apply_paid_prefix(all_events)
             logger.info("Enrichment complete.")
 
@@ -393,8 +527,9 @@ def main() -> None:
             overall_timer.__exit__(None, None, None)
             totals = RunStats.combine(run_stats)
             totals.total_elapsed_s = overall_timer.elapsed
+            _add_llm_usage(totals)
             logger.info(
-                "DONE pages=%s fetch=%s extract=%s persist=%s sync=%s events=%s errors=%s total=%s",
+                "DONE pages=%s fetch=%s extract=%s persist=%s sync=%s events=%s errors=%s total=%s %s",
                 totals.page_total,
                 format_duration(totals.fetch_s),
                 format_duration(totals.extract_s),
@@ -403,6 +538,7 @@ def main() -> None:
                 totals.events_extracted,
                 totals.errors_count,
                 format_duration(totals.total_elapsed_s),
+                totals.llm_line(),
             )
             return
 
@@ -417,6 +553,10 @@ def main() -> None:
             created += results["created"]
             updated += results["updated"]
             session.commit()
+            if tracker is not None:
+                tracker.commit(now, complete=listing_complete)
+                session.commit()
+                logger.info(tracker.diff.summary_line())
 
         sync_stats = {"synced_count": 0}
         t_sync = Timer("sync")
@@ -440,9 +580,10 @@ def main() -> None:
         totals.events_updated = updated
         totals.events_extracted = len(all_events)
         totals.total_elapsed_s = overall_timer.elapsed
+        _add_llm_usage(totals)
 
         logger.info(
-            "DONE pages=%s fetch=%s extract=%s persist=%s sync=%s events=%s new=%s updated=%s errors=%s total=%s",
+            "DONE pages=%s fetch=%s extract=%s persist=%s sync=%s events=%s new=%s updated=%s errors=%s total=%s %s",
             totals.page_total,
             format_duration(totals.fetch_s),
             format_duration(totals.extract_s),
@@ -453,8 +594,26 @@ def main() -> None:
             totals.events_updated,
             totals.errors_count,
             format_duration(totals.total_elapsed_s),
+            totals.llm_line(),
         )
     finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        logger.info(pool_stats().summary_line())
+        logger.info("listing %s", listing_fetcher.stats.summary_line())
+        logger.info("detail %s", detail_fetcher.stats.summary_line())
+        logger.info(get_scheduler().stats.summary_line())
+        _save_breaker(session, breaker)
+        if cassette is not None:
+            logger.info(cassette.summary_line())
+        if llm_cache is not None:
+            logger.info(llm_cache.summary_line())
+        for line in llm_gateway().summary_lines():
+            logger.info(line)
+        save_llm_usage(session, "extract_muenchen_kinder", now)
+        close_http_clients()
+        if page_cache is not None:
+            page_cache.close()
         try:
             next(session_gen)
         except StopIteration:
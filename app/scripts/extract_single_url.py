@@ -13,7 +13,10 @@ from app.db.session import get_session
 from app.logging import configure_logging
 from app.services.extract.llm_event_extractor import extract_events_from_text
 from app.services.extract.store_extracted_events import store_extracted_events
-from app.services.fetch.http_fetcher import fetch_url_text
+from app.services.fetch.conditional import ConditionalFetcher
+from app.services.fetch.http_client import close_http_clients
+from app.services.fetch.page_cache import CACHE_MODES, PageCache
+from app.services.llm.response_cache import LLM_CACHE_MODES, configure_llm_cache
 
 
 def extract_single(
@@ -91,14 +94,35 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="Extract events from a single URL without DB persistence.")
     parser.add_argument("url", help="URL to fetch and extract")
     parser.add_argument("--persist", action="store_true", help="Persist extracted events to DB")
+    parser.add_argument(
+        "--cache-mode",
+        choices=CACHE_MODES,
+        default="use",
+        help="Page cache: use cached pages, refresh them, or bypass the cache",
+    )
+    parser.add_argument(
+        "--llm-cache",
+        choices=LLM_CACHE_MODES,
+        default=None,
+        help="LLM response cache: use, refresh or bypass it (default: PLANZ_LLM_CACHE)",
+    )
     args = parser.parse_args()
 
-    extract_single(
-        url=args.url,
-        fetcher=fetch_url_text,
-        extractor=extract_events_from_text,
-        persist=args.persist,
-    )
+    page_cache = PageCache.from_env() if args.cache_mode != "off" else None
+    llm_cache = configure_llm_cache(args.llm_cache)
+    try:
+        extract_single(
+            url=args.url,
+            fetcher=ConditionalFetcher(cache=page_cache, cache_mode=args.cache_mode),
+            extractor=extract_events_from_text,
+            persist=args.persist,
+        )
+    finally:
+        close_http_clients()
+        if page_cache is not None:
+            page_cache.close()
+        if llm_cache is not None:
+            print(llm_cache.summary_line())
 
 
 if __name__ == "__main__":
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import argparse
 from datetime import datetime, timezone
 import logging
+from typing import Any
 
 from sqlalchemy import select
 
@@ -11,39 +13,123 @@ from app.db.models.source_domain import SourceDomain
 from app.db.models.source_url import SourceUrl
 from app.db.session import engine, get_session
 from app.logging import configure_logging
-from app.services.fetch.http_fetcher import fetch_url_text
+from app.services.fetch.async_fetcher import FetchJob, FetchOutcome, fetch_urls_concurrently
+from app.services.fetch.circuit_breaker import CIRCUIT_OPEN_ERROR, CircuitBreaker
+from app.services.fetch.http_client import pool_stats
+from app.services.fetch.politeness import get_scheduler
+from app.services.fetch.revisit import RevisitPolicy, is_due
 from app.services.fetch.store_fetch_result import store_fetch_result
+from app.utils.timing import RunStats, Timer
 
 logger = logging.getLogger(__name__)
 
 
-def run_fetch_sources() -> dict[str, int]:
+def _validators(source_url: SourceUrl) -> tuple[str | None, str | None]:
+    # Only revalidate when there is stored content a 304 can stand in for.
+    if source_url.fetch_status != "ok" or not source_url.content_hash:
+        return None, None
+    return source_url.etag, source_url.last_modified
+
+
+def run_fetch_sources(force: bool = False) -> dict[str, Any]:
+    """Fetch allowed sources that are due for a revisit (all of them with ``force``)."""
     ok_count = 0
     error_count = 0
+    not_modified_count = 0
+    skipped_count = 0
+    not_due_count = 0
+    truncated_count = 0
+    bytes_saved = 0
+    breaker_lines: list[str] = []
     now = datetime.now(tz=timezone.utc)
 
     session_gen = get_session()
     session = next(session_gen)
     try:
-        urls = session.scalars(
-            select(SourceUrl)
+        rows = session.execute(
+            select(SourceUrl, SourceDomain.domain)
             .join(SourceDomain, SourceDomain.id == SourceUrl.domain_id)
             .where(SourceDomain.is_allowed.is_(True))
         ).all()
+        if not force:
+            due_rows = [row for row in rows if is_due(row[0], now)]
+            not_due_count = len(rows) - len(due_rows)
+            rows = due_rows
+            if not_due_count:
+                logger.info("Revisit planner skipped %s source(s) not yet due", not_due_count)
+        revisit = RevisitPolicy.from_env()
+        urls = [source_url for source_url, _domain in rows]
+        jobs = []
+        for source_url, domain in rows:
+            etag, last_modified = _validators(source_url)
+            jobs.append(
+                FetchJob(
+                    url=source_url.url,
+                    domain=domain,
+                    etag=etag,
+                    last_modified=last_modified,
+                )
+            )
+        stats = RunStats(page_index=len(jobs), page_total=len(jobs))
+        scheduler = get_scheduler()
+        breaker = CircuitBreaker.from_env().load(session)
 
-        for source_url in urls:
-            text, error = fetch_url_text(source_url.url)
-            store_fetch_result(session, source_url, text=text, error=error, now=now)
-            if text is not None:
+        def _store(index: int, outcome: FetchOutcome) -> None:
+            nonlocal ok_count, error_count, not_modified_count, skipped_count, bytes_saved
+            nonlocal truncated_count
+            source_url = urls[index]
+            if outcome.error == CIRCUIT_OPEN_ERROR:
+                # Keep the last stored fetch result; the domain is known to be down.
+                skipped_count += 1
+                return
+            stats.fetch_s += outcome.elapsed_s
+            if outcome.not_modified:
+                not_modified_count += 1
+                bytes_saved += source_url.content_length or 0
+            store_fetch_result(
+                session,
+                source_url,
+                text=outcome.text,
+                error=outcome.error,
+                now=now,
+                not_modified=outcome.not_modified,
+                etag=outcome.etag,
+                last_modified=outcome.last_modified,
+                revisit=revisit,
+                content_hash=outcome.content_hash,
+                bytes_read=outcome.bytes_read,
+                truncated=outcome.truncated,
+            )
+            if outcome.truncated:
+                truncated_count += 1
+            if outcome.text is not None or outcome.not_modified:
                 ok_count += 1
             else:
                 logger.error(
                     "Fetch failed for url=%s error=%s",
                     source_url.url,
-                    error,
+                    outcome.error,
                 )
                 error_count += 1
 
+        with Timer("fetch_sources") as t_fetch:
+            fetch_urls_concurrently(jobs, _store, scheduler=scheduler, breaker=breaker)
+        stats.errors_count = error_count
+        stats.total_elapsed_s = t_fetch.elapsed
+        if jobs:
+            stats.log_status(logger)
+            logger.info(pool_stats().summary_line())
+            logger.info(scheduler.stats.summary_line())
+            logger.info(
+                "Conditional GET not_modified=%s bytes_saved=%s",
+                not_modified_count,
+                bytes_saved,
+            )
+        breaker.save(session)
+        breaker_lines = breaker.summary_lines()
+        for line in breaker_lines:
+            logger.info(line)
+
         session.commit()
     finally:
         try:
@@ -51,16 +137,43 @@ def run_fetch_sources() -> dict[str, int]:
         except StopIteration:
             pass
 
-    return {"fetched_ok": ok_count, "fetched_error": error_count}
+    return {
+        "fetched_ok": ok_count,
+        "fetched_error": error_count,
+        "fetched_not_modified": not_modified_count,
+        "bytes_saved": bytes_saved,
+        "fetched_skipped_circuit_open": skipped_count,
+        "fetched_skipped_not_due": not_due_count,
+        "fetched_truncated": truncated_count,
+        "circuit_transitions": breaker_lines,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Fetch allowed source URLs.")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Fetch every allowed source, ignoring the revisit schedule",
+    )
+    return parser
 
 
 def main() -> None:
+    args = build_parser().parse_args()
     load_env()
     configure_logging()
     ensure_sqlite_schema(engine)
-    stats = run_fetch_sources()
+    stats = run_fetch_sources(force=args.force)
     print(f"Fetched OK: {stats['fetched_ok']}")
     print(f"Fetched errors: {stats['fetched_error']}")
+    print(f"Fetched not modified: {stats['fetched_not_modified']}")
+    print(f"Bytes saved (304): {stats['bytes_saved']}")
+    print(f"Skipped (circuit open): {stats['fetched_skipped_circuit_open']}")
+    print(f"Skipped (not due): {stats['fetched_skipped_not_due']}")
+    print(f"Truncated (byte cap): {stats['fetched_truncated']}")
+    for line in stats["circuit_transitions"]:
+        print(line)
 
 
 if __name__ == "__main__":
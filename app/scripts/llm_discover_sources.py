@@ -8,12 +8,15 @@ from app.db.session import engine, get_session
 from app.logging import configure_logging
 from app.services.discovery.discover_sources import discover_and_store_sources
 from app.services.llm.client import discover_munich_kids_event_sources
+from app.services.llm.response_cache import configure_llm_cache
+from app.services.llm.usage import record_llm_usage
 
 
 def main() -> None:
     load_env()
     configure_logging()
     ensure_sqlite_schema(engine)
+    configure_llm_cache()
     now = datetime.now(tz=timezone.utc)
 
     session_gen = get_session()
@@ -25,6 +28,8 @@ def main() -> None:
             now=now,
         )
     finally:
+        record_llm_usage(session, "llm_discover_sources", now)
+        session.commit()
         try:
             next(session_gen)
         except StopIteration:
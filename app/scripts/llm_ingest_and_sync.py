@@ -11,9 +11,11 @@ from app.services.calendar.google_calendar_service import GoogleCalendarClient
 from app.services.calendar.mapper import event_to_calendar_event
 from app.services.llm.client import generate_kids_events_munich
 from app.services.llm.parse import parse_kids_events
+from app.services.llm.response_cache import configure_llm_cache
 
 
 def main() -> None:
+    configure_llm_cache()
     raw_events = generate_kids_events_munich()
     parsed_events = parse_kids_events(raw_events)
 
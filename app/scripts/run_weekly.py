@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import argparse
 from datetime import datetime, timezone
+from functools import partial
 import os
 
 from sqlalchemy import func, select
@@ -18,6 +20,8 @@ from app.scripts.extract_events import run_extract_events
 from app.scripts.fetch_sources import run_fetch_sources
 from app.services.calendar.google_calendar_service import GoogleCalendarClient
 from app.services.calendar.sync_events import sync_unsynced_events
+from app.services.llm.response_cache import configure_llm_cache
+from app.services.llm.usage import save_llm_usage
 
 
 def _source_inventory(session) -> dict[str, int]:
@@ -154,6 +158,13 @@ def run_weekly_pipeline(
 
     print(f"Fetched OK: {fetch_stats['fetched_ok']}")
     print(f"Fetched errors: {fetch_stats['fetched_error']}")
+    print(f"Fetched not modified: {fetch_stats.get('fetched_not_modified', 0)}")
+    print(f"Bytes saved (304): {fetch_stats.get('bytes_saved', 0)}")
+    print(f"Skipped (circuit open): {fetch_stats.get('fetched_skipped_circuit_open', 0)}")
+    print(f"Skipped (not due): {fetch_stats.get('fetched_skipped_not_due', 0)}")
+    print(f"Truncated (byte cap): {fetch_stats.get('fetched_truncated', 0)}")
+    for line in fetch_stats.get("circuit_transitions", []):
+        print(line)
     print(f"Sources processed: {extract_stats['sources_processed']}")
     print(f"Events created: {extract_stats['events_created_total']}")
     print(
@@ -187,17 +198,36 @@ def run_weekly_pipeline(
     }
 
 
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run the weekly fetch/extract/sync pipeline.")
+    parser.add_argument(
+        "--force-fetch",
+        action="store_true",
+        help="Fetch every allowed source, ignoring the revisit schedule",
+    )
+    return parser
+
+
 def main() -> None:
+    args = build_parser().parse_args()
     load_env()
     configure_logging()
     ensure_sqlite_schema(engine)
+    llm_cache = configure_llm_cache()
 
     now = datetime.now(tz=timezone.utc)
     session_gen = get_session()
     session = next(session_gen)
     try:
-        run_weekly_pipeline(session=session, now=now)
+        run_weekly_pipeline(
+            session=session,
+            now=now,
+            fetch_runner=partial(run_fetch_sources, force=args.force_fetch),
+        )
     finally:
+        if llm_cache is not None:
+            print(llm_cache.summary_line())
+        save_llm_usage(session, "run_weekly", now)
         try:
             next(session_gen)
         except StopIteration:
@@ -8,6 +8,7 @@ from app.core.urls import canonicalize_url, extract_domain
 from app.services.discovery.source_policies import is_domain_allowed
 from app.services.discovery.store_sources import store_discovered_sources
 from app.services.fetch.http_fetcher import fetch_url_text
+from app.services.fetch.politeness import polite
 
 MIN_TEXT_LEN = 1500
 PREFERRED_URL_KEYWORDS = ["termine", "kalender", "veranstaltungen", "programm"]
@@ -41,7 +42,9 @@ def _has_archive_or_past_signals(text: str, current_year: int) -> bool:
 def discover_and_store_sources(
     session,
     llm_client: Callable[[], list[dict[str, Any]]],
-    http_fetcher: Callable[[str, float], tuple[str | None, str | None]] = fetch_url_text,
+    http_fetcher: Callable[
+        [str, float], tuple[str | None, str | None, int | None]
+    ] = polite(fetch_url_text),
     now: datetime | None = None,
 ) -> dict[str, Any]:
     candidates = llm_client()
@@ -69,7 +72,7 @@ def discover_and_store_sources(
             rejected["blocked_domain"] += 1
             continue
 
-        text, error = http_fetcher(canonical, 5.0)
+        text, error, _status = http_fetcher(canonical, 5.0)
         if error or text is None:
             rejected["fetch_failed"] += 1
             continue
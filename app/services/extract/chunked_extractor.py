@@ -0,0 +1,179 @@
+"""Event extraction from long source pages in overlapping chunks.
+
+A page's cleaned text (one block per line, see ``HtmlToText(blocks=True)``)
+is packed into chunks of at most ``max_chars`` on line boundaries; lines
+longer than that are split at sentence ends. Each chunk after the first
+repeats the last lines of the previous one, up to ``overlap_chars``, so an
+event cut by a chunk boundary is seen whole by one of them.
+
+Chunks are extracted concurrently, at most ``max_workers`` at a time
+(``PLANZ_EXTRACT_CONCURRENCY``, default 4). The events are merged in chunk
+order and an event found again by a later chunk (normalized title, start
+and location) is dropped, after lending it any fields the first one lacks.
+Text that fits in one chunk goes to the extractor unchanged. Text beyond
+``max_text_chars()`` (``PLANZ_EXTRACT_MAX_CHARS``, default 100k) is not
+extracted; fetches store no more than that.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import logging
+import os
+import re
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_CHARS = 8000
+DEFAULT_OVERLAP_CHARS = 800
+DEFAULT_EXTRACT_CONCURRENCY = 4
+DEFAULT_MAX_TEXT_CHARS = 100_000
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+_NON_WORD_RE = re.compile(r"\W+")
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def max_text_chars() -> int:
+    """How much of a page's text is extracted at most."""
+    return _env_int("PLANZ_EXTRACT_MAX_CHARS", DEFAULT_MAX_TEXT_CHARS)
+
+
+def _split_long_line(line: str, max_chars: int) -> list[str]:
+    pieces: list[str] = []
+    for sentence in _SENTENCE_END_RE.split(line):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars + 1)
+            if cut <= 0:
+                cut = max_chars
+            pieces.append(sentence[:cut].rstrip())
+            sentence = sentence[cut:].lstrip()
+        if sentence:
+            pieces.append(sentence)
+    return pieces
+
+
+def _overlap_tail(lines: list[str], budget: int) -> list[str]:
+    """The longest run of trailing ``lines`` whose joined length fits ``budget``."""
+    tail: list[str] = []
+    size = 0
+    for line in reversed(lines):
+        size += len(line) + 1
+        if size > budget:
+            break
+        tail.append(line)
+    tail.reverse()
+    return tail
+
+
+def split_into_chunks(text: str, max_chars: int, overlap_chars: int = 0) -> list[str]:
+    """Pack the non-empty lines of ``text`` into overlapping chunks of at most ``max_chars``."""
+    lines: list[str] = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            lines.extend(_split_long_line(line, max_chars) if len(line) > max_chars else [line])
+
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for line in lines:
+        if current and size + len(line) > max_chars:
+            chunks.append("\n".join(current))
+            current = _overlap_tail(current, min(overlap_chars, max_chars - len(line) - 1))
+            size = sum(len(kept) + 1 for kept in current)
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def _normalize(value: Any) -> str:
+    return _NON_WORD_RE.sub(" ", str(value or "").casefold()).strip()
+
+
+def _normalize_start(value: Any) -> str:
+    try:
+        parsed = datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        return _normalize(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.isoformat(timespec="minutes")
+
+
+def event_identity(event: dict[str, Any]) -> tuple[str, str, str]:
+    return (
+        _normalize(event.get("title")),
+        _normalize_start(event.get("start_time")),
+        _normalize(event.get("location")),
+    )
+
+
+def merge_chunk_events(chunk_events: list[list[Any]]) -> list[Any]:
+    """Events of all chunks in order, without the ones a later chunk found again."""
+    merged: list[Any] = []
+    seen: dict[tuple[str, str, str], dict[str, Any]] = {}
+    for events in chunk_events:
+        for event in events:
+            if not isinstance(event, dict):
+                merged.append(event)
+                continue
+            identity = event_identity(event)
+            first = seen.get(identity)
+            if first is None:
+                seen[identity] = event
+                merged.append(event)
+                continue
+            for key, value in event.items():
+                if first.get(key) in (None, "") and value not in (None, ""):
+                    first[key] = value
+    return merged
+
+
+def extract_events_chunked(
+    text: str,
+    source_url: str,
+    extractor: Callable[[str, str], list[dict]],
+    *,
+    max_chars: int | None = None,
+    overlap_chars: int | None = None,
+    max_workers: int | None = None,
+) -> list[dict]:
+    """Run ``extractor`` over the chunks of ``text`` and merge their events.
+
+    Unset limits fall back to PLANZ_EXTRACT_CHUNK_CHARS,
+    PLANZ_EXTRACT_CHUNK_OVERLAP_CHARS and PLANZ_EXTRACT_CONCURRENCY. Only
+    the first ``max_text_chars()`` of ``text`` are extracted. The first
+    chunk that fails fails the whole page, so it is retried in full.
+    """
+    text = text[: max_text_chars()]
+    if max_chars is None:
+        max_chars = _env_int("PLANZ_EXTRACT_CHUNK_CHARS", DEFAULT_CHUNK_CHARS)
+    if len(text) <= max_chars:
+        return extractor(text, source_url)
+    if overlap_chars is None:
+        overlap_chars = _env_int("PLANZ_EXTRACT_CHUNK_OVERLAP_CHARS", DEFAULT_OVERLAP_CHARS)
+    if max_workers is None:
+        max_workers = _env_int("PLANZ_EXTRACT_CONCURRENCY", DEFAULT_EXTRACT_CONCURRENCY)
+
+    chunks = split_into_chunks(text, max_chars, overlap_chars)
+    if len(chunks) <= 1:
+        return extractor(chunks[0] if chunks else text, source_url)
+    workers = min(max(max_workers, 1), len(chunks))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        chunk_events = list(executor.map(lambda chunk: extractor(chunk, source_url), chunks))
+    events = merge_chunk_events(chunk_events)
+    logger.info(
+        "Extracted url=%s chunks=%s events=%s duplicates=%s",
+        source_url,
+        len(chunks),
+        len(events),
+        sum(len(found) for found in chunk_events) - len(events),
+    )
+    return events
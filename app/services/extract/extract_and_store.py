@@ -9,6 +9,7 @@ from sqlalchemy import select
 from app.core.env import is_force_extract_enabled
 from app.db.models.source_domain import SourceDomain
 from app.db.models.source_url import SourceUrl
+from app.services.extract.chunked_extractor import extract_events_chunked
 from app.services.extract.store_extracted_events import store_extracted_events
 from app.services.search.acquisition_issues import upsert_acquisition_issue
 
@@ -59,8 +60,10 @@ def extract_and_store_for_sources(
                 continue
 
         stats["sources_processed"] += 1
+        # Rows fetched before content_text existed only have the raw excerpt.
+        text = source_url.content_text or source_url.content_excerpt or ""
         try:
-            extracted = extractor(source_url.content_excerpt or "", source_url.url)
+            extracted = extract_events_chunked(text, source_url.url, extractor)
         except Exception as exc:  # noqa: BLE001
             logger.error(
                 "Extraction failed for url=%s: %s",
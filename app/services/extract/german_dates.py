@@ -0,0 +1,157 @@
+"""German date and time grammar for event listings.
+
+The patterns are compiled once, at import, from shared pieces. That way
+every caller recognises these forms the same way:
+
+- weekday schedules ("Fr. 06.03.2026 09:00 - 11:00 Uhr");
+- visible date ranges ("12 Okt bis 03 Nov");
+- muenchen.de ``<time datetime>`` values ("06.03.2026 - 09:00:00");
+- the loose date tokens the fetch diagnostics look for.
+
+One schedule match yields the raw text, the date and both times, so
+callers never search the same text twice.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime
+import re
+from zoneinfo import ZoneInfo
+
+BERLIN = ZoneInfo("Europe/Berlin")
+
+MONTHS = {
+    "JAN": 1,
+    "JANUAR": 1,
+    "FEB": 2,
+    "FEBRUAR": 2,
+    "MAERZ": 3,
+    "MÄRZ": 3,
+    "APR": 4,
+    "APRIL": 4,
+    "MAI": 5,
+    "JUN": 6,
+    "JUNI": 6,
+    "JUL": 7,
+    "JULI": 7,
+    "AUG": 8,
+    "AUGUST": 8,
+    "SEP": 9,
+    "SEPT": 9,
+    "SEPTEMBER": 9,
+    "OKT": 10,
+    "OKTOBER": 10,
+    "NOV": 11,
+    "NOVEMBER": 11,
+    "DEZ": 12,
+    "DEZEMBER": 12,
+}
+
+_WEEKDAY = r"(?:Mo|Di|Mi|Do|Fr|Sa|So)"
+_MONTH_NAME = r"[A-Za-zÄÖÜäöüß\.]+"
+
+SCHEDULE_RE = re.compile(
+    _WEEKDAY
+    + r"\.\s+(?P<day>\d{2})\.(?P<month>\d{2})\.(?P<year>\d{4})"
+    + r"\s+(?P<start_h>\d{2}):(?P<start_m>\d{2})"
+    + r"(?:\s*-\s*(?P<end_h>\d{2}):(?P<end_m>\d{2}))?\s*Uhr"
+)
+DATE_RANGE_RE = re.compile(
+    r"(?P<start_day>\d{2})\s+(?P<start_month>" + _MONTH_NAME + r")"
+    r"\s+bis\s+(?P<end_day>\d{2})\s+(?P<end_month>" + _MONTH_NAME + r")"
+)
+# Same shape strptime("%d.%m.%Y - %H:%M:%S") accepts; ranges are checked by datetime().
+DISPLAY_DATETIME_RE = re.compile(
+    r"(\d{1,2})\.(\d{1,2})\.(\d{4})\s+-\s+(\d{1,2}):(\d{1,2}):(\d{1,2})"
+)
+DATE_TOKEN_RE = re.compile(
+    r"\b\d{1,2}\.\d{1,2}\.\d{4}\b"  # German style
+    r"|\b\d{4}-\d{2}-\d{2}\b"  # ISO
+    r"|\b(?i:Sa|So)\."  # weekend day abbreviations
+)
+_WHITESPACE_RE = re.compile(r"\s+")
+_TRAILING_TIME_RE = re.compile(r"\d{2}:\d{2}$")
+
+
+@dataclass(frozen=True)
+class Schedule:
+    raw: str
+    start: datetime
+    end: datetime | None
+
+
+def find_schedule(text: str) -> Schedule | None:
+    """First weekday schedule in ``text``, parsed in Europe/Berlin."""
+    match = SCHEDULE_RE.search(text)
+    if not match:
+        return None
+    day, month, year, start_h, start_m, end_h, end_m = match.groups()
+    day, month, year = int(day), int(month), int(year)
+    try:
+        start = datetime(year, month, day, int(start_h), int(start_m), tzinfo=BERLIN)
+        end = None
+        if end_h and end_m:
+            end = datetime(year, month, day, int(end_h), int(end_m), tzinfo=BERLIN)
+    except ValueError:
+        return None
+    return Schedule(raw=match.group(0), start=start, end=end)
+
+
+def parse_month(value: str) -> int | None:
+    normalized = value.strip().rstrip(".").upper()
+    normalized = normalized.replace("Ä", "AE").replace("Ö", "OE").replace("Ü", "UE")
+    return MONTHS.get(normalized)
+
+
+def find_date_range(text: str, reference_year: int) -> tuple[date, date] | None:
+    """First "DD Monat bis DD Monat" range in ``text``.
+
+    The range starts in ``reference_year``; an end month before the start
+    month rolls over into the next year.
+    """
+    match = DATE_RANGE_RE.search(text)
+    if not match:
+        return None
+    start_day, start_month_name, end_day, end_month_name = match.groups()
+    start_month = parse_month(start_month_name)
+    end_month = parse_month(end_month_name)
+    if start_month is None or end_month is None:
+        return None
+    end_year = reference_year + 1 if end_month < start_month else reference_year
+    try:
+        return (
+            date(reference_year, start_month, int(start_day)),
+            date(end_year, end_month, int(end_day)),
+        )
+    except ValueError:
+        return None
+
+
+def parse_display_datetime(value: str | None) -> datetime | None:
+    """Parse a muenchen.de ``<time datetime="06.03.2026 - 09:00:00">`` value."""
+    if not value:
+        return None
+    match = DISPLAY_DATETIME_RE.fullmatch(value.strip())
+    if not match:
+        return None
+    day, month, year, hour, minute, second = (int(part) for part in match.groups())
+    try:
+        return datetime(year, month, day, hour, minute, second, tzinfo=BERLIN)
+    except ValueError:
+        return None
+
+
+def normalize_schedule_text(text: str) -> str | None:
+    """Collapse whitespace and add the "Uhr" a bare trailing time implies."""
+    text = _WHITESPACE_RE.sub(" ", text).strip()
+    if not text:
+        return None
+    if "Uhr" in text:
+        return text
+    if _TRAILING_TIME_RE.search(text):
+        return f"{text} Uhr"
+    return text
+
+
+def contains_date_token(text: str) -> bool:
+    return DATE_TOKEN_RE.search(text) is not None
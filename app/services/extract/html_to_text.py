@@ -1,10 +1,179 @@
+"""Plain text of a detail page for the summarizer.
+
+The page is streamed through the stdlib ``HTMLParser`` in chunks instead
+of being built into a tree. Scripts, styles and navigation are dropped
+while parsing. When the page has a main-content region (``main``,
+``article``, ``role="main"`` or the muenchen.de detail container), only
+that region's text is kept. Parsing stops as soon as ``max_chars`` of
+text have been produced. With ``blocks=True`` block-level elements
+(paragraphs, list items, headings, table rows, ...) start a new line, so
+callers can split the text on structural boundaries.
+"""
 from __future__ import annotations
 
-from bs4 import BeautifulSoup
+from html.parser import HTMLParser
+import re
+from typing import Iterator
+
+# Never text: their contents are dropped wherever they appear.
+_SKIP_TAGS = frozenset({"script", "style", "noscript", "template", "svg", "nav"})
+# Site chrome outside a content region; inside one (an article's own header) it is kept.
+_CHROME_TAGS = frozenset({"header", "footer", "aside", "form"})
+_CONTENT_TAGS = frozenset({"main", "article"})
+_CONTENT_CLASSES = frozenset({"m-event-detail"})
+_BLOCK_TAGS = frozenset(
+    "p div section article main li ul ol dl dt dd table tr "
+    "h1 h2 h3 h4 h5 h6 br hr blockquote pre".split()
+)
+# Cheap pre-check: without any content marker the fallback text is final
+# and parsing can stop at the budget as well.
+_CONTENT_MARKER_RE = re.compile(
+    r"<(?:main|article)\b|role=[\"']?main|m-event-detail", re.IGNORECASE
+)
+_CHUNK_CHARS = 16 * 1024
+
+
+class _Region:
+    """An open element tracked by tag name until its matching end tag."""
+
+    __slots__ = ("tag", "depth")
+
+    def __init__(self, tag: str) -> None:
+        self.tag = tag
+        self.depth = 1
+
+    def start(self, tag: str) -> None:
+        if tag == self.tag:
+            self.depth += 1
+
+    def end(self, tag: str) -> bool:
+        """Whether ``tag`` closes the region."""
+        if tag == self.tag:
+            self.depth -= 1
+        return self.depth <= 0
+
+
+def _is_content(tag: str, attrs: list[tuple[str, str | None]]) -> bool:
+    if tag in _CONTENT_TAGS:
+        return True
+    for name, value in attrs:
+        if not value:
+            continue
+        if name == "role" and value.lower() == "main":
+            return True
+        if name == "class" and not _CONTENT_CLASSES.isdisjoint(value.split()):
+            return True
+    return False
+
+
+class _TextCollector(HTMLParser):
+    def __init__(self, max_chars: int | None, has_content: bool, blocks: bool = False) -> None:
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.has_content = has_content
+        self.blocks = blocks
+        self.content: list[str] = []
+        self.fallback: list[str] = []
+        self.content_chars = 0
+        self.fallback_chars = 0
+        self.done = False
+        self._skip: _Region | None = None
+        self._region: _Region | None = None
+        self._break = False
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if self._skip is not None:
+            self._skip.start(tag)
+            return
+        if tag in _SKIP_TAGS or (self._region is None and tag in _CHROME_TAGS):
+            self._skip = _Region(tag)
+            return
+        if self.blocks and tag in _BLOCK_TAGS:
+            self._break = True
+        if self._region is not None:
+            self._region.start(tag)
+        elif _is_content(tag, attrs):
+            self._region = _Region(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._skip is not None:
+            if self._skip.end(tag):
+                self._skip = None
+            return
+        if self.blocks and tag in _BLOCK_TAGS:
+            self._break = True
+        if self._region is not None and self._region.end(tag):
+            self._region = None
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        # <br/>, <img/>: nothing opens, so region depths must not move.
+        if self.blocks and self._skip is None and tag in _BLOCK_TAGS:
+            self._break = True
+
+    def handle_data(self, data: str) -> None:
+        if self.done or self._skip is not None:
+            return
+        words = data.split()
+        if not words:
+            return
+        piece = " ".join(words)
+        if self._break:
+            # Marks a line start; text() turns " \n" into "\n".
+            piece = "\n" + piece
+            self._break = False
+        if self._region is not None:
+            self.content.append(piece)
+            self.content_chars += len(piece) + 1
+            if self.max_chars is not None and self.content_chars >= self.max_chars:
+                self.done = True
+        elif self.max_chars is None or self.fallback_chars < self.max_chars:
+            self.fallback.append(piece)
+            self.fallback_chars += len(piece) + 1
+            if (
+                not self.has_content
+                and self.max_chars is not None
+                and self.fallback_chars >= self.max_chars
+            ):
+                self.done = True
+
+    def text(self) -> str:
+        pieces = self.content or self.fallback
+        text = " ".join(pieces)
+        if self.blocks:
+            text = text.replace(" \n", "\n").lstrip("\n")
+        return text if self.max_chars is None else text[: self.max_chars]
 
 
 class HtmlToText:
-    def extract(self, html: str) -> str:
-        soup = BeautifulSoup(html, "html.parser")
-        text = soup.get_text(" ", strip=True)
-        return " ".join(text.split())
+    def __init__(self, max_chars: int | None = None, *, blocks: bool = False) -> None:
+        self.max_chars = max_chars
+        self.blocks = blocks
+
+    def extract(self, html: str, max_chars: int | None = None) -> str:
+        """Whitespace-normalised main text of ``html``, at most ``max_chars`` long.
+
+        Blocks are separated by newlines when the converter was built with
+        ``blocks=True`` and by single spaces otherwise.
+        """
+        budget = max_chars if max_chars is not None else self.max_chars
+        if not html:
+            return ""
+        collector = _TextCollector(budget, bool(_CONTENT_MARKER_RE.search(html)), self.blocks)
+        for chunk in _chunks(html):
+            collector.feed(chunk)
+            if collector.done:
+                break
+        else:
+            collector.close()
+        return collector.text()
+
+
+def _chunks(html: str) -> Iterator[str]:
+    """Slices of about ``_CHUNK_CHARS`` cut before a ``<``, so no text run is split."""
+    start = 0
+    while start < len(html):
+        cut = html.find("<", start + _CHUNK_CHARS)
+        if cut < 0:
+            cut = len(html)
+        yield html[start:cut]
+        start = cut
@@ -0,0 +1,115 @@
+"""Incremental processing of listing items.
+
+Every ``parse_listing`` item gets a key and a fingerprint. The key is its
+identity: detail page, ticket link and start time. The fingerprint is a
+hash of the whole item. Comparing fingerprints with the ones stored by the
+previous run picks out the items that are new or changed. Only those are
+expanded, enriched and stored. Items a complete crawl no longer finds are
+marked gone.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+import hashlib
+import json
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models.listing_item import ListingItem
+
+
+def listing_item_key(item: dict[str, Any]) -> str:
+    identity = item.get("detail_url") or item.get("title") or ""
+    return f"{identity}|{item.get('ticket_url') or ''}|{item.get('start_time') or ''}"
+
+
+def listing_item_fingerprint(item: dict[str, Any]) -> str:
+    canonical = json.dumps(item, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ListingDiff:
+    new: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    gone: int = 0
+
+    def summary_line(self) -> str:
+        return (
+            f"listing_items new={self.new} changed={self.changed} "
+            f"unchanged={self.unchanged} gone={self.gone}"
+        )
+
+
+class ListingItemTracker:
+    """Compares one run's listing items with the fingerprints of the previous run."""
+
+    def __init__(self, session: Session, listing_url: str) -> None:
+        self.session = session
+        self.listing_url = listing_url
+        self.diff = ListingDiff()
+        self._rows = {
+            row.item_key: row
+            for row in session.scalars(
+                select(ListingItem).where(ListingItem.listing_url == listing_url)
+            )
+        }
+        self._fingerprints: dict[str, str] = {}
+        self._fresh: dict[str, bool] = {}
+
+    def observe(self, item: dict[str, Any]) -> bool:
+        """Classify ``item``; True when it is new or changed.
+
+        A key seen again in the same run (the same item on two pages)
+        follows its first occurrence and is counted once.
+        """
+        key = listing_item_key(item)
+        if key not in self._fresh:
+            fingerprint = listing_item_fingerprint(item)
+            row = self._rows.get(key)
+            if row is None or row.gone_at is not None:
+                self.diff.new += 1
+                self._fresh[key] = True
+            elif row.fingerprint != fingerprint:
+                self.diff.changed += 1
+                self._fresh[key] = True
+            else:
+                self.diff.unchanged += 1
+                self._fresh[key] = False
+            self._fingerprints[key] = fingerprint
+        return self._fresh[key]
+
+    def select(self, items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """The new or changed items among ``items``, in order."""
+        return [item for item in items if self.observe(item)]
+
+    def commit(self, now: datetime, *, complete: bool) -> None:
+        """Store this run's fingerprints; call once the selected items are persisted.
+
+        Only a ``complete`` run (every listing page fetched) marks the
+        items it did not see as gone.
+        """
+        for key, fingerprint in self._fingerprints.items():
+            row = self._rows.get(key)
+            if row is None:
+                row = ListingItem(
+                    listing_url=self.listing_url,
+                    item_key=key,
+                    fingerprint=fingerprint,
+                    first_seen_at=now,
+                )
+                self.session.add(row)
+                self._rows[key] = row
+            row.fingerprint = fingerprint
+            row.last_seen_at = now
+            row.gone_at = None
+        if complete:
+            for key, row in self._rows.items():
+                if key not in self._fingerprints and row.gone_at is None:
+                    row.gone_at = now
+                    self.diff.gone += 1
+        self.session.flush()
@@ -3,7 +3,8 @@ import logging
 import os
 from typing import Any
 
-from openai import OpenAI
+from app.services.llm.gateway import complete_text
+from app.services.llm.response_cache import is_json_object
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +17,6 @@ def extract_events_from_text(text: str, source_url: str) -> list[dict[str, Any]]
     if not api_key:
         raise EnvironmentError("OPENAI_API_KEY is not set")
 
-    client = OpenAI(api_key=api_key)
     prompt = (
         "Return STRICT JSON only. Extract real-world events from the provided text. "
         "Output a JSON object with a single key `events` containing objects with: "
@@ -24,12 +24,14 @@ def extract_events_from_text(text: str, source_url: str) -> list[dict[str, Any]]
         "when possible. If end_time is unknown, omit it."
     )
 
-    response = client.chat.completions.create(
-        **_build_completion_kwargs(text, source_url, prompt)
+    content = complete_text(
+        "extract_events_from_text",
+        accept=is_json_object,
+        **_build_completion_kwargs(text, source_url, prompt),
     )
 
     data = _parse_json_object(
-        response.choices[0].message.content or "{}",
+        content or "{}",
         error_message="LLM returned invalid JSON for extraction",
     )
     if not data:
@@ -47,12 +49,13 @@ def summarize_event_detail(text: str, source_url: str) -> dict[str, Any]:
     if not api_key:
         raise EnvironmentError("OPENAI_API_KEY is not set")
 
-    client = OpenAI(api_key=api_key)
-    response = client.chat.completions.create(
-        **_build_summary_completion_kwargs(text, source_url)
+    content = complete_text(
+        "summarize_event_detail",
+        accept=is_json_object,
+        **_build_summary_completion_kwargs(text, source_url),
     )
     data = _parse_json_object(
-        response.choices[0].message.content or "{}",
+        content or "{}",
         error_message="LLM returned invalid JSON for detail summary",
     )
     if not data:
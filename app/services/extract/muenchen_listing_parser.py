@@ -1,31 +1,196 @@
+"""Listing page parsing for muenchen.de and generic event calendars.
+
+Two tree backends produce equivalent items on well-formed listing markup:
+BeautifulSoup with the stdlib ``html.parser`` (default) and lxml, which
+builds and walks the tree in C and is several times faster on large pages.
+They repair broken markup (unclosed or misnested tags) differently, so on
+malformed pages the items may differ. ``PLANZ_LISTING_PARSER=lxml`` opts in;
+without the lxml package installed the bs4 backend is used.
+
+With bs4, muenchen.de listing pages are parsed in restricted scope: only
+``.m-event-list-item`` subtrees and ``rel=next`` links become tree nodes,
+everything else (header, navigation, footer, scripts) is skipped while
+parsing. Pages without event items get a full parse for the generic path.
+"""
 from __future__ import annotations
 
+from bisect import bisect_left
+from dataclasses import dataclass
 from datetime import date
+import html as _html
+import logging
+import os
 import re
-from typing import Any
+from typing import Any, Iterable
 from urllib.parse import urljoin, urlparse
 from datetime import datetime
-from zoneinfo import ZoneInfo
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+from bs4.filter import ElementFilter
 
-_SCHEDULE_RE = re.compile(
-    r"((?:Mo|Di|Mi|Do|Fr|Sa|So)\.\s+\d{2}\.\d{2}\.\d{4}\s+\d{2}:\d{2}(?:\s*-\s*\d{2}:\d{2})?\s*Uhr)"
+from app.services.extract.german_dates import (
+    SCHEDULE_RE,
+    Schedule,
+    find_schedule,
+    normalize_schedule_text,
+    parse_display_datetime,
 )
 
+try:
+    from lxml import etree as _lxml_etree
+    from lxml import html as _lxml_html
+except ImportError:  # pragma: no cover - optional dependency
+    _lxml_etree = None
+    _lxml_html = None
 
-def parse_listing(html: str, base_url: str) -> list[dict[str, Any]]:
-    soup = BeautifulSoup(html, "html.parser")
+logger = logging.getLogger(__name__)
+
+LISTING_PARSER_BACKENDS = ("bs4", "lxml")
+# bs4's get_text leaves out the strings of these elements (and comments).
+_NON_TEXT_TAGS = ("script", "style", "template", "rt", "rp")
+
+_EVENT_ITEM_CLASS = "m-event-list-item"
+
+_ANCHOR_TAG_RE = re.compile(r"""<a\s(?:[^>"']|"[^"]*"|'[^']*')*>""", re.IGNORECASE)
+_ATTRIBUTE_RE = re.compile(
+    r"""([^\s=/>"']+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?"""
+)
+
+# A BeautifulSoup document, a ScopedTree or an lxml.html root element, see
+# ``build_tree``.
+ListingTree = Any
+
+
+def lxml_available() -> bool:
+    return _lxml_html is not None
+
+
+def resolve_backend(backend: str | None = None) -> str:
+    """Return the listing parser backend to use: ``backend`` or PLANZ_LISTING_PARSER."""
+    backend = (backend or os.getenv("PLANZ_LISTING_PARSER", "bs4")).strip().lower() or "bs4"
+    if backend not in LISTING_PARSER_BACKENDS:
+        raise ValueError(f"Unknown listing parser backend: {backend}")
+    if backend == "lxml" and not lxml_available():
+        logger.warning("PLANZ_LISTING_PARSER=lxml but lxml is not installed; using bs4")
+        return "bs4"
+    return backend
+
+
+class _ListingScope(ElementFilter):
+    """Build tags only for event list items and rel=next links (and their contents)."""
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        attrs = attrs or {}
+        if _EVENT_ITEM_CLASS in _raw_tokens(attrs.get("class")):
+            return True
+        return name == "a" and "next" in _raw_tokens(attrs.get("rel"))
+
+    def allow_string_creation(self, string: str) -> bool:
+        return False
+
+
+def _raw_tokens(value) -> list[str]:
+    if isinstance(value, list):
+        return value
+    return (value or "").split()
+
+
+@dataclass
+class ScopedTree:
+    """A bs4 tree holding only event list items and rel=next links of ``html``."""
+
+    tree: BeautifulSoup
+    html: str
+
+
+def build_tree(html: str, backend: str | None = None, scoped: bool = True) -> ListingTree:
+    """Parse ``html`` with the selected backend.
+
+    With bs4 and ``scoped``, a page that mentions ``m-event-list-item`` is
+    parsed in restricted scope (a ``ScopedTree``). lxml always builds the
+    full tree: its C parser is cheaper than filtering would be. Documents
+    lxml refuses (empty ones, or text with an XML encoding declaration) fall
+    back to a bs4 tree; ``parse_listing`` accepts any of these.
+    """
+    if resolve_backend(backend) == "lxml":
+        try:
+            root = _lxml_html.document_fromstring(html)
+        except (ValueError, _lxml_etree.ParserError):
+            return BeautifulSoup(html, "html.parser")
+        for node in list(root.iter(*_NON_TEXT_TAGS)):
+            node.text = None
+            del node[:]
+        return root
+    if scoped and _EVENT_ITEM_CLASS in html:
+        return ScopedTree(BeautifulSoup(html, "html.parser", parse_only=_ListingScope()), html)
+    return BeautifulSoup(html, "html.parser")
+
+
+def next_link_href(tree: ListingTree) -> str | None:
+    """Return the href of the first ``<a rel="next">`` in ``tree``."""
+    if isinstance(tree, ScopedTree):
+        tree = tree.tree
+    if isinstance(tree, BeautifulSoup):
+        next_link = tree.find("a", rel="next")
+        return next_link.get("href") if next_link else None
+    for link in tree.iter("a"):
+        if "next" in (link.get("rel") or "").split():
+            return link.get("href")
+    return None
+
+
+def scan_next_link_href(html: str) -> str | None:
+    """``next_link_href`` without a tree: scans the raw ``<a>`` start tags of ``html``.
+
+    For callers that only need the pagination link and leave item parsing
+    to someone else.
+    """
+    if "next" not in html:
+        return None
+    for tag in _ANCHOR_TAG_RE.finditer(html):
+        attrs: dict[str, str] = {}
+        for match in _ATTRIBUTE_RE.finditer(tag.group(0), 2):
+            value = next((part for part in match.groups()[1:] if part is not None), "")
+            # Like bs4's html.parser builder, the last duplicate attribute wins.
+            attrs[match.group(1).lower()] = _html.unescape(value)
+        if "next" in attrs.get("rel", "").split():
+            return attrs.get("href")
+    return None
+
+
+def parse_listing(
+    html: str,
+    base_url: str,
+    soup: ListingTree | None = None,
+    backend: str | None = None,
+) -> list[dict[str, Any]]:
+    """Parse listing items.
+
+    Pass ``soup`` (from ``build_tree``) to reuse a tree the caller already
+    built; otherwise ``backend`` picks the parser, see ``resolve_backend``.
+    """
+    if soup is None:
+        soup = build_tree(html, backend)
+    if isinstance(soup, ScopedTree):
+        exact_events = _parse_muenchen_event_items(soup.tree, base_url)
+        if exact_events:
+            return exact_events
+        soup = BeautifulSoup(soup.html, "html.parser")
+    if not isinstance(soup, BeautifulSoup):
+        exact_events = _lxml_muenchen_event_items(soup, base_url)
+        if exact_events:
+            return exact_events
+        return _parse_generic_listing(_index_lxml(soup), base_url)
     exact_events = _parse_muenchen_event_items(soup, base_url)
     if exact_events:
         return exact_events
-    return _parse_generic_listing(soup, base_url)
+    return _parse_generic_listing(_index_bs4(soup), base_url)
 
 
 def _parse_muenchen_event_items(soup: BeautifulSoup, base_url: str) -> list[dict[str, Any]]:
     events: list[dict[str, Any]] = []
     seen_keys: set[str] = set()
-    for item in soup.select(".m-event-list-item"):
+    for item in soup.select(f".{_EVENT_ITEM_CLASS}"):
         headline = item.select_one(".m-event-list-item__headline")
         if headline is None:
             continue
@@ -89,48 +254,221 @@ def _parse_muenchen_event_items(soup: BeautifulSoup, base_url: str) -> list[dict
     return events
 
 
-def _parse_generic_listing(soup: BeautifulSoup, base_url: str) -> list[dict[str, Any]]:
+# -- generic listings ------------------------------------------------------
+#
+# A link's card is its nearest ancestor with class "card"; failing that, the
+# outermost ancestor whose text holds a schedule or that contains an
+# address/location element; failing that, the link's parent. Walking the
+# ancestors of every link and re-reading their text is quadratic in the
+# document size, so _DocumentIndex answers all of these questions from one
+# pass over the tree.
+
+
+class _DocumentIndex:
+    """Pre-order node table of a listing document, built in one pass.
+
+    Node ``i``'s text is ``" ".join(strings[first_string[i]:end_string[i]])``
+    (what ``get_text(" ", strip=True)`` returns), which is a slice of the
+    joined document text, so schedule matches are found once for the whole
+    document and located by character span.
+    """
+
+    def __init__(self) -> None:
+        self.elements: list[Any] = []
+        self.names: list[str] = []
+        self.parents: list[int] = []
+        self.classes: list[list[str]] = []
+        self.first_string: list[int] = []
+        self.end_string: list[int] = []
+        self.strings: list[str] = []
+
+    def add_node(self, element, name: str, parent: int, classes: list[str]) -> int:
+        self.elements.append(element)
+        self.names.append(name)
+        self.parents.append(parent)
+        self.classes.append(classes)
+        self.first_string.append(len(self.strings))
+        self.end_string.append(len(self.strings))
+        return len(self.elements) - 1
+
+    def add_string(self, text: str, node: int) -> None:
+        text = text.strip()
+        if text:
+            self.strings.append(text)
+            self.end_string[node] = len(self.strings)
+
+    def finish(self) -> "_DocumentIndex":
+        count = len(self.elements)
+        self.subtree_end = list(range(count))
+        self.first_address: list[int | None] = [None] * count
+        self.first_location: list[int | None] = [None] * count
+        # Bottom-up: pre-order puts every descendant after its ancestors.
+        for node in range(count - 1, 0, -1):
+            parent = self.parents[node]
+            if parent < 0:
+                continue
+            self.end_string[parent] = max(self.end_string[parent], self.end_string[node])
+            self.subtree_end[parent] = max(self.subtree_end[parent], self.subtree_end[node])
+            for marker, first in (
+                ("address", self.first_address),
+                ("location", self.first_location),
+            ):
+                candidate = node if marker in self.classes[node] else first[node]
+                if candidate is not None and (first[parent] is None or candidate < first[parent]):
+                    first[parent] = candidate
+
+        self.offsets: list[int] = []
+        position = 0
+        for text in self.strings:
+            self.offsets.append(position)
+            position += len(text) + 1
+        self.document_text = " ".join(self.strings)
+        matches = list(SCHEDULE_RE.finditer(self.document_text))
+        self._match_starts = [match.start() for match in matches]
+        self._match_ends = [match.end() for match in matches]
+
+        # Top-down: nearest card and outermost schedule/address candidate.
+        self.nearest_card: list[int | None] = [None] * count
+        self.outer_candidate: list[int | None] = [None] * count
+        for node in range(count):
+            parent = self.parents[node]
+            if "card" in self.classes[node]:
+                self.nearest_card[node] = node
+            elif parent >= 0:
+                self.nearest_card[node] = self.nearest_card[parent]
+            inherited = self.outer_candidate[parent] if parent >= 0 else None
+            if inherited is not None:
+                self.outer_candidate[node] = inherited
+            elif self._is_candidate(node):
+                self.outer_candidate[node] = node
+        self._text_cache: dict[int, str] = {}
+        return self
+
+    def _span(self, node: int) -> tuple[int, int]:
+        first, end = self.first_string[node], self.end_string[node]
+        if first == end:
+            return 0, 0
+        return self.offsets[first], self.offsets[end - 1] + len(self.strings[end - 1])
+
+    def _has_schedule(self, node: int) -> bool:
+        start, end = self._span(node)
+        if start == end:
+            return False
+        # Schedule matches never overlap: if any match lies inside the node,
+        # the first one starting inside it does.
+        index = bisect_left(self._match_starts, start)
+        return index < len(self._match_starts) and self._match_ends[index] <= end
+
+    def _is_candidate(self, node: int) -> bool:
+        if self.first_string[node] == self.end_string[node]:
+            return False
+        return (
+            self._has_schedule(node)
+            or self.first_address[node] is not None
+            or self.first_location[node] is not None
+        )
+
+    def text(self, node: int, separator: str = " ") -> str:
+        if separator != " ":
+            return separator.join(self.strings[self.first_string[node] : self.end_string[node]])
+        cached = self._text_cache.get(node)
+        if cached is None:
+            start, end = self._span(node)
+            cached = self.document_text[start:end]
+            self._text_cache[node] = cached
+        return cached
+
+    def card_for(self, link: int) -> int:
+        parent = self.parents[link]
+        card = self.nearest_card[parent]
+        if card is not None:
+            return card
+        candidate = self.outer_candidate[parent]
+        return candidate if candidate is not None else parent
+
+    def links(self) -> list[int]:
+        return [
+            node
+            for node, name in enumerate(self.names)
+            if name == "a" and self.elements[node].get("href") is not None
+        ]
+
+
+def _index_bs4(soup: BeautifulSoup) -> _DocumentIndex:
+    index = _DocumentIndex()
+    positions = {id(soup): index.add_node(soup, soup.name, -1, [])}
+    for element in soup.descendants:
+        if isinstance(element, Tag):
+            positions[id(element)] = index.add_node(
+                element,
+                element.name,
+                positions[id(element.parent)],
+                _raw_tokens(element.get("class")),
+            )
+        elif type(element) in (NavigableString, CData):
+            # Exactly the string types get_text() reads; comments, doctype and
+            # script/style/template contents are NavigableString subclasses.
+            index.add_string(element, positions[id(element.parent)])
+    return index.finish()
+
+
+def _index_lxml(root) -> _DocumentIndex:
+    index = _DocumentIndex()
+    stack: list[tuple[Any, int]] = [(root, -1)]
+    while stack:
+        item, parent = stack.pop()
+        if isinstance(item, str):
+            index.add_string(item, parent)
+            continue
+        if not isinstance(item.tag, str):
+            continue  # comment or processing instruction; its tail is on the stack
+        node = index.add_node(item, item.tag, parent, _lxml_classes(item))
+        if item.text:
+            index.add_string(item.text, node)
+        for child in reversed(list(item)):
+            if child.tail:
+                stack.append((child.tail, node))
+            stack.append((child, node))
+    return index.finish()
+
+
+def _parse_generic_listing(index: _DocumentIndex, base_url: str) -> list[dict[str, Any]]:
     events: list[dict[str, Any]] = []
-    seen_keys: set[str] = set()
+    seen_keys: set[tuple[str, str]] = set()
     base_path = urlparse(base_url).path
-    for link in soup.find_all("a", href=True):
-        if _is_ticket_link(link):
+    links = index.links()
+    ticket_links = [link for link in links if _index_is_ticket_link(index, link)]
+    ticket_positions = set(ticket_links)
+    cards: dict[int, tuple[str | None, str | None, Schedule | None]] = {}
+    for link in links:
+        if link in ticket_positions:
             continue
-        href = link["href"]
-        detail_url = urljoin(base_url, href)
+        detail_url = urljoin(base_url, index.elements[link].get("href"))
         parsed = urlparse(detail_url)
         if "/veranstaltungen/" not in parsed.path:
             continue
         if parsed.path == base_path:
             continue
-        card = _find_listing_card(link)
-        address = None
-        listing_text = None
-        if card:
-            addr_el = card.find(class_="address") or card.find(class_="location")
-            if addr_el and addr_el.get_text(strip=True):
-                address = addr_el.get_text(strip=True)
-            text = card.get_text(" ", strip=True)
-            if text:
-                listing_text = text
-        dedupe_key = f"{detail_url}|{listing_text or ''}"
+        card = index.card_for(link)
+        if card not in cards:
+            cards[card] = _index_card_details(index, card)
+        address, listing_text, schedule = cards[card]
+        # A tuple, not a joined string: card texts can be most of the page.
+        dedupe_key = (detail_url, listing_text or "")
         if dedupe_key in seen_keys:
             continue
         event: dict[str, Any] = {"detail_url": detail_url, "address": address}
-        title = link.get_text(" ", strip=True)
+        title = index.text(link)
         if title:
             event["title"] = title
         if listing_text:
             event["listing_text"] = listing_text
-            schedule = _extract_schedule(listing_text)
             if schedule:
-                event["raw_schedule"] = schedule
-                start_time, end_time = _parse_schedule(schedule)
-                if start_time:
-                    event["start_time"] = start_time
-                if end_time:
-                    event["end_time"] = end_time
-        ticket_url = _extract_ticket_url(card, base_url, detail_url) if card else None
+                event["raw_schedule"] = schedule.raw
+                event["start_time"] = schedule.start.isoformat()
+                if schedule.end:
+                    event["end_time"] = schedule.end.isoformat()
+        ticket_url = _index_ticket_url(index, ticket_links, card, base_url, detail_url)
         if ticket_url:
             event["ticket_url"] = ticket_url
         if address:
@@ -140,31 +478,47 @@ def _parse_generic_listing(soup: BeautifulSoup, base_url: str) -> list[dict[str,
     return events
 
 
-def _extract_schedule(listing_text: str) -> str | None:
-    match = _SCHEDULE_RE.search(listing_text)
-    if not match:
-        return None
-    return match.group(1)
+def _index_card_details(
+    index: _DocumentIndex, card: int
+) -> tuple[str | None, str | None, Schedule | None]:
+    """Address, listing text and schedule of ``card``, computed once per card."""
+    address_el = index.first_address[card]
+    if address_el is None:
+        address_el = index.first_location[card]
+    address = None
+    if address_el is not None:
+        address = index.text(address_el, "") or None
+    listing_text = index.text(card) or None
+    schedule = find_schedule(listing_text) if listing_text else None
+    return address, listing_text, schedule
+
+
+def _index_is_ticket_link(index: _DocumentIndex, link: int) -> bool:
+    element = index.elements[link]
+    return _looks_like_ticket(
+        [
+            " ".join(index.classes[link]),
+            element.get("title", ""),
+            element.get("aria-label", ""),
+            index.text(link),
+        ]
+    )
 
 
-def _parse_schedule(schedule: str) -> tuple[str | None, str | None]:
-    match = re.search(
-        r"(?:Mo|Di|Mi|Do|Fr|Sa|So)\.\s+(\d{2})\.(\d{2})\.(\d{4})\s+(\d{2}):(\d{2})(?:\s*-\s*(\d{2}):(\d{2}))?\s*Uhr",
-        schedule,
-    )
-    if not match:
-        return None, None
-    day, month, year, start_h, start_m, end_h, end_m = match.groups()
-    tz = ZoneInfo("Europe/Berlin")
-    start_dt = datetime(
-        int(year), int(month), int(day), int(start_h), int(start_m), tzinfo=tz
-    )
-    end_dt = None
-    if end_h and end_m:
-        end_dt = datetime(
-            int(year), int(month), int(day), int(end_h), int(end_m), tzinfo=tz
-        )
-    return start_dt.isoformat(), end_dt.isoformat() if end_dt else None
+def _index_ticket_url(
+    index: _DocumentIndex,
+    ticket_links: list[int],
+    card: int,
+    base_url: str,
+    detail_url: str,
+) -> str | None:
+    position = bisect_left(ticket_links, card + 1)
+    while position < len(ticket_links) and ticket_links[position] <= index.subtree_end[card]:
+        candidate_url = urljoin(base_url, index.elements[ticket_links[position]].get("href"))
+        if candidate_url != detail_url:
+            return candidate_url
+        position += 1
+    return None
 
 
 def _extract_ticket_url(card, base_url: str, detail_url: str) -> str | None:
@@ -178,34 +532,19 @@ def _extract_ticket_url(card, base_url: str, detail_url: str) -> str | None:
 
 
 def _is_ticket_link(link) -> bool:
-    attrs = [
-        " ".join(link.get("class", [])),
-        link.get("title", ""),
-        link.get("aria-label", ""),
-        link.get_text(" ", strip=True),
-    ]
-    haystack = " ".join(part.lower() for part in attrs if part)
-    return "ticket" in haystack or "karten" in haystack
+    return _looks_like_ticket(
+        [
+            " ".join(link.get("class", [])),
+            link.get("title", ""),
+            link.get("aria-label", ""),
+            link.get_text(" ", strip=True),
+        ]
+    )
 
 
-def _find_listing_card(link):
-    current = link.parent
-    fallback = current
-    scheduled_candidate = None
-    while current is not None:
-        classes = current.get("class", [])
-        if isinstance(classes, list) and "card" in classes:
-            return current
-        text = current.get_text(" ", strip=True)
-        if text and _extract_schedule(text):
-            scheduled_candidate = current
-        elif text and (
-            current.find(class_="address") is not None
-            or current.find(class_="location") is not None
-        ):
-            scheduled_candidate = current
-        current = current.parent
-    return scheduled_candidate or fallback
+def _looks_like_ticket(attrs: Iterable[str]) -> bool:
+    haystack = " ".join(part.lower() for part in attrs if part)
+    return "ticket" in haystack or "karten" in haystack
 
 
 def _find_calendar_detail_block(item):
@@ -227,30 +566,25 @@ def _parse_detail_times(detail_block) -> tuple[str | None, str | None]:
 
 
 def _parse_display_datetime(value: str | None) -> str | None:
-    if not value:
-        return None
-    try:
-        parsed = datetime.strptime(value.strip(), "%d.%m.%Y - %H:%M:%S")
-    except ValueError:
-        return None
-    return parsed.replace(tzinfo=ZoneInfo("Europe/Berlin")).isoformat()
+    parsed = parse_display_datetime(value)
+    return parsed.isoformat() if parsed else None
 
 
 def _normalize_schedule_text(detail_block) -> str | None:
-    text = " ".join(detail_block.stripped_strings)
-    if not text:
-        return None
-    text = re.sub(r"\s+", " ", text).strip()
-    text = text.replace(" - ", " - ")
-    if text.endswith("Uhr") or "Uhr" in text:
-        return text
-    if re.search(r"\d{2}:\d{2}$", text):
-        return f"{text} Uhr"
-    return text
+    return _normalize_schedule_strings(detail_block.stripped_strings)
+
+
+def _normalize_schedule_strings(strings: Iterable[str]) -> str | None:
+    return normalize_schedule_text(" ".join(strings))
 
 
 def _extract_date_range(item) -> tuple[date | None, date | None]:
-    time_tags = item.select(".m-date-range time.m-date-range__item[datetime]")
+    return _date_range_from_tags(
+        item.select(".m-date-range time.m-date-range__item[datetime]")
+    )
+
+
+def _date_range_from_tags(time_tags: list) -> tuple[date | None, date | None]:
     if not time_tags:
         return None, None
     start_date = _parse_range_date(time_tags[0].get("datetime"))
@@ -267,3 +601,153 @@ def _parse_range_date(value: str | None) -> date | None:
         return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
     except ValueError:
         return None
+
+
+# -- lxml backend ----------------------------------------------------------
+#
+# Mirrors the BeautifulSoup functions above step for step. Text is collected
+# like bs4's get_text(strip=True): every text run stripped, empty runs
+# dropped, comments skipped (build_tree already emptied script/style).
+
+
+def _lxml_strings(node) -> list[str]:
+    return [text for text in (run.strip() for run in node.itertext()) if text]
+
+
+def _lxml_text(node, separator: str = " ") -> str:
+    return separator.join(_lxml_strings(node))
+
+
+def _lxml_classes(node) -> list[str]:
+    return (node.get("class") or "").split()
+
+
+def _lxml_descendants_with_class(node, class_name: str):
+    for element in node.iterdescendants(_lxml_etree.Element):
+        if class_name in _lxml_classes(element):
+            yield element
+
+
+def _lxml_find_class(node, class_name: str):
+    return next(_lxml_descendants_with_class(node, class_name), None)
+
+
+def _lxml_links(node):
+    return [link for link in node.iterdescendants("a") if link.get("href") is not None]
+
+
+def _lxml_muenchen_event_items(root, base_url: str) -> list[dict[str, Any]]:
+    events: list[dict[str, Any]] = []
+    seen_keys: set[str] = set()
+    for item in _lxml_descendants_with_class(root, _EVENT_ITEM_CLASS):
+        headline = _lxml_find_class(item, "m-event-list-item__headline")
+        if headline is None:
+            continue
+        title = _lxml_text(headline)
+        if not title:
+            continue
+
+        headline_links = _lxml_links(headline)
+        detail_url = None
+        if headline_links:
+            detail_url = urljoin(base_url, headline_links[0].get("href"))
+
+        details = list(_lxml_descendants_with_class(item, "m-event-list-item__detail"))
+        location = None
+        location_el = next(
+            (detail for detail in details if detail.get("itemprop") == "location"), None
+        )
+        if location_el is not None:
+            location = _lxml_text(location_el) or None
+
+        detail_block = next(
+            (detail for detail in details if next(detail.iterdescendants("time"), None) is not None),
+            None,
+        )
+        raw_schedule = None
+        start_time = None
+        end_time = None
+        if detail_block is not None:
+            raw_schedule = _normalize_schedule_strings(_lxml_strings(detail_block))
+            start_time, end_time = _lxml_detail_times(detail_block)
+
+        ticket_url = _lxml_ticket_url(item, base_url, detail_url)
+        range_start, range_end = _lxml_date_range(item)
+
+        dedupe_key = "|".join(
+            [
+                detail_url or ticket_url or title,
+                start_time or "",
+                ticket_url or "",
+            ]
+        )
+        if dedupe_key in seen_keys:
+            continue
+
+        event: dict[str, Any] = {
+            "title": title,
+            "address": location,
+            "location": location,
+            "listing_text": _lxml_text(item),
+        }
+        if detail_url:
+            event["detail_url"] = detail_url
+        if raw_schedule:
+            event["raw_schedule"] = raw_schedule
+        if start_time:
+            event["start_time"] = start_time
+        if end_time:
+            event["end_time"] = end_time
+        if ticket_url:
+            event["ticket_url"] = ticket_url
+        if range_start:
+            event["range_start_date"] = range_start.isoformat()
+        if range_end:
+            event["range_end_date"] = range_end.isoformat()
+        seen_keys.add(dedupe_key)
+        events.append(event)
+    return events
+
+
+def _lxml_ticket_url(card, base_url: str, detail_url: str | None) -> str | None:
+    for link in _lxml_links(card):
+        candidate_url = urljoin(base_url, link.get("href"))
+        if detail_url and candidate_url == detail_url:
+            continue
+        if _lxml_is_ticket_link(link):
+            return candidate_url
+    return None
+
+
+def _lxml_is_ticket_link(link) -> bool:
+    return _looks_like_ticket(
+        [
+            " ".join(_lxml_classes(link)),
+            link.get("title", ""),
+            link.get("aria-label", ""),
+            _lxml_text(link),
+        ]
+    )
+
+
+def _lxml_detail_times(detail_block) -> tuple[str | None, str | None]:
+    time_tags = list(detail_block.iterdescendants("time"))
+    if not time_tags:
+        return None, None
+    start_time = _parse_display_datetime(time_tags[0].get("datetime"))
+    end_time = None
+    if len(time_tags) > 1:
+        end_time = _parse_display_datetime(time_tags[1].get("datetime"))
+    return start_time, end_time
+
+
+def _lxml_date_range(item) -> tuple[date | None, date | None]:
+    return _date_range_from_tags(
+        [
+            tag
+            for tag in item.iterdescendants("time")
+            if tag.get("datetime") is not None
+            and "m-date-range__item" in _lxml_classes(tag)
+            and any("m-date-range" in _lxml_classes(a) for a in tag.iterancestors())
+        ]
+    )
@@ -1,6 +1,22 @@
+"""Series-level enrichment of listing events.
+
+Events of one series (same detail page) share a single summary. Enrichment
+runs in three steps:
+
+1. Look up every distinct series key and find the pages still to be
+   summarized: new series, and stored series missing a field.
+2. Fetch and summarize those pages concurrently, at most
+   ``max_workers`` at a time (``PLANZ_ENRICH_CONCURRENCY``, default 4).
+3. Write the ``EventSeries`` rows from the calling thread's session, in
+   event order.
+
+The session is only touched from the calling thread.
+"""
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import os
 from typing import Any, Callable
 
 from sqlalchemy import select
@@ -9,7 +25,13 @@ from sqlalchemy.orm import Session
 from app.core.urls import extract_domain
 from app.db.models.event_series import EventSeries
 from app.services.extract.html_to_text import HtmlToText
-from app.services.llm.summarizer import EventPageSummary, summarize_event_page
+from app.services.llm.summarizer import (
+    MAX_INPUT_CHARS,
+    EventPageSummary,
+    summarize_event_page,
+)
+
+DEFAULT_ENRICH_CONCURRENCY = 4
 
 
 def _series_key(item: dict[str, Any]) -> str:
@@ -22,58 +44,93 @@ def _series_key(item: dict[str, Any]) -> str:
     return f"{domain}:{title}:{location}"
 
 
+def _resolve_max_workers(max_workers: int | None) -> int:
+    if max_workers is None:
+        max_workers = int(
+            os.getenv("PLANZ_ENRICH_CONCURRENCY", str(DEFAULT_ENRICH_CONCURRENCY))
+        )
+    return max(max_workers, 1)
+
+
+def _needs_fill(series: EventSeries) -> bool:
+    return series.description is None or series.venue_address is None or series.category is None
+
+
 def enrich_with_series_cache(
     session: Session,
     events: list[dict[str, Any]],
     detail_fetcher: Callable[[str], str],
     now: datetime,
     summarizer: Callable[[str], EventPageSummary | None] = summarize_event_page,
+    max_workers: int | None = None,
 ) -> list[dict[str, Any]]:
-    enriched: list[dict[str, Any]] = []
-    cache: dict[str, EventSeries] = {}
-    html_to_text = HtmlToText()
+    html_to_text = HtmlToText(max_chars=MAX_INPUT_CHARS)
 
+    # 1. Distinct keys in event order, their stored rows and the pages to summarize.
+    first_items: dict[str, dict[str, Any]] = {}
+    stored: dict[str, EventSeries | None] = {}
+    fetch_urls: dict[str, str] = {}
     for item in events:
         key = _series_key(item)
-        if key in cache:
-            series = cache[key]
+        if key in first_items:
+            continue
+        first_items[key] = item
+        series = session.scalar(select(EventSeries).where(EventSeries.series_key == key))
+        stored[key] = series
+        if series is None:
+            fetch_url = item.get("detail_url") or item.get("source_url")
+        elif _needs_fill(series):
+            # Existing series missing summary, address, or category — fill in now
+            fetch_url = series.detail_url or item.get("source_url")
         else:
-            series = session.scalar(select(EventSeries).where(EventSeries.series_key == key))
-            if series is None:
-                result: EventPageSummary | None = None
-                fetch_url = item.get("detail_url") or item.get("source_url")
-                if fetch_url:
-                    page_text = html_to_text.extract(detail_fetcher(fetch_url))
-                    result = summarizer(page_text) if page_text else None
-                series = EventSeries(
-                    series_key=key,
-                    detail_url=item.get("detail_url"),
-                    title=item.get("title"),
-                    venue=item.get("location"),
-                    description=result.summary if result else None,
-                    venue_address=result.address if result else None,
-                    is_paid=result.is_paid if result else False,
-                    category=result.category if result else None,
-                    updated_at=now,
-                )
-                session.add(series)
-                session.flush()
-            elif series.description is None or series.venue_address is None or series.category is None:
-                # Existing series missing summary, address, or category — fill in now
-                fetch_url = series.detail_url or item.get("source_url")
-                if fetch_url:
-                    page_text = html_to_text.extract(detail_fetcher(fetch_url))
-                    if page_text:
-                        result = summarizer(page_text)
-                        if result:
-                            if result.summary:
-                                series.description = result.summary
-                            series.venue_address = result.address
-                            series.is_paid = result.is_paid
-                            series.category = result.category
-                            session.flush()
-            cache[key] = series
+            fetch_url = None
+        if fetch_url:
+            fetch_urls[key] = fetch_url
+
+    # 2. Fetch and summarize each distinct page once, concurrently.
+    def summarize_url(url: str) -> EventPageSummary | None:
+        page_text = html_to_text.extract(detail_fetcher(url))
+        return summarizer(page_text) if page_text else None
+
+    urls = list(dict.fromkeys(fetch_urls.values()))
+    workers = min(_resolve_max_workers(max_workers), len(urls)) if urls else 1
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            summaries = dict(zip(urls, executor.map(summarize_url, urls)))
+    else:
+        summaries = {url: summarize_url(url) for url in urls}
 
+    # 3. Write series rows in event order.
+    cache: dict[str, EventSeries] = {}
+    for key, item in first_items.items():
+        series = stored[key]
+        result = summaries.get(fetch_urls[key]) if key in fetch_urls else None
+        if series is None:
+            series = EventSeries(
+                series_key=key,
+                detail_url=item.get("detail_url"),
+                title=item.get("title"),
+                venue=item.get("location"),
+                description=result.summary if result else None,
+                venue_address=result.address if result else None,
+                is_paid=result.is_paid if result else False,
+                category=result.category if result else None,
+                updated_at=now,
+            )
+            session.add(series)
+            session.flush()
+        elif result:
+            if result.summary:
+                series.description = result.summary
+            series.venue_address = result.address
+            series.is_paid = result.is_paid
+            series.category = result.category
+            session.flush()
+        cache[key] = series
+
+    enriched: list[dict[str, Any]] = []
+    for item in events:
+        series = cache[_series_key(item)]
         new_item = dict(item)
         if series.description:
             new_item["description"] = series.description
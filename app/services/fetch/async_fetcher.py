@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import logging
+import os
+from time import monotonic
+from typing import Callable, Sequence
+
+import httpx
+
+from app.services.fetch.circuit_breaker import CIRCUIT_OPEN_ERROR, CircuitBreaker
+from app.services.fetch.http_client import build_async_http_client
+from app.services.fetch.http_fetcher import (
+    conditional_headers,
+    max_bytes_for,
+    result_from_async_response,
+)
+from app.services.fetch.politeness import PolitenessScheduler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_PER_DOMAIN = 2
+
+
+@dataclass
+class FetchJob:
+    url: str
+    domain: str
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+@dataclass
+class FetchOutcome:
+    url: str
+    text: str | None
+    error: str | None
+    status: int | None
+    elapsed_s: float = 0.0
+    etag: str | None = None
+    last_modified: str | None = None
+    not_modified: bool = False
+    bytes_read: int = 0
+    content_hash: str | None = None
+    truncated: str | None = None
+
+
+def resolve_concurrency() -> tuple[int, int]:
+    """Return (global, per-domain) concurrency limits from the environment."""
+    total = int(os.getenv("PLANZ_FETCH_CONCURRENCY", str(DEFAULT_CONCURRENCY)))
+    per_domain = int(os.getenv("PLANZ_FETCH_PER_DOMAIN", str(DEFAULT_PER_DOMAIN)))
+    return max(total, 1), max(per_domain, 1)
+
+
+async def _fetch_one(
+    client: httpx.AsyncClient,
+    job: FetchJob,
+    global_limit: asyncio.Semaphore,
+    domain_limit: asyncio.Semaphore,
+    timeout: float,
+    scheduler: PolitenessScheduler | None = None,
+    breaker: CircuitBreaker | None = None,
+) -> FetchOutcome:
+    # Wait for the domain's politeness token before taking a global slot, so a
+    # throttled domain never holds slots other domains could be using.
+    async with domain_limit:
+        if breaker is not None and not breaker.allow(job.url):
+            return FetchOutcome(url=job.url, text=None, error=CIRCUIT_OPEN_ERROR, status=None)
+        try:
+            if scheduler is not None:
+                await scheduler.wait_async(job.url)
+            async with global_limit:
+                outcome = await _get(client, job, timeout)
+        except BaseException:
+            if breaker is not None:
+                breaker.abandon(job.url)
+            raise
+        if breaker is not None:
+            breaker.record(job.url, outcome.error, outcome.status)
+        return outcome
+
+
+async def _get(client: httpx.AsyncClient, job: FetchJob, timeout: float) -> FetchOutcome:
+    started = monotonic()
+    try:
+        async with client.stream(
+            "GET",
+            job.url,
+            headers=conditional_headers(job.etag, job.last_modified),
+            timeout=timeout,
+        ) as response:
+            result = await result_from_async_response(
+                response,
+                etag=job.etag,
+                last_modified=job.last_modified,
+                max_bytes=max_bytes_for(job.url),
+            )
+        return FetchOutcome(
+            url=job.url,
+            text=result.text,
+            error=result.error,
+            status=result.status,
+            elapsed_s=monotonic() - started,
+            etag=result.etag,
+            last_modified=result.last_modified,
+            not_modified=result.not_modified,
+            bytes_read=result.bytes_read,
+            content_hash=result.content_hash,
+            truncated=result.truncated,
+        )
+    except httpx.HTTPStatusError as exc:
+        resp = exc.response
+        return FetchOutcome(
+            url=job.url,
+            text=None,
+            error=str(exc),
+            status=resp.status_code if resp else None,
+            elapsed_s=monotonic() - started,
+        )
+    except Exception as exc:  # noqa: BLE001
+        return FetchOutcome(
+            url=job.url,
+            text=None,
+            error=str(exc) or exc.__class__.__name__,
+            status=None,
+            elapsed_s=monotonic() - started,
+        )
+
+
+async def fetch_all(
+    jobs: Sequence[FetchJob],
+    on_result: Callable[[int, FetchOutcome], None],
+    *,
+    max_concurrency: int = DEFAULT_CONCURRENCY,
+    per_domain: int = DEFAULT_PER_DOMAIN,
+    timeout: float = 10.0,
+    client: httpx.AsyncClient | None = None,
+    scheduler: PolitenessScheduler | None = None,
+    breaker: CircuitBreaker | None = None,
+) -> None:
+    """Fetch all jobs concurrently and hand results to ``on_result`` in job order.
+
+    ``on_result`` is only ever called from the awaiting coroutine, one result at a
+    time, so callers can use it as the single DB writer. With a ``scheduler``
+    each request also waits for its domain's politeness token; with a
+    ``breaker`` jobs for a domain whose circuit is open come back with
+    ``error="circuit_open"`` without touching the network.
+    """
+    global_limit = asyncio.Semaphore(max_concurrency)
+    domain_limits: dict[str, asyncio.Semaphore] = {}
+    for job in jobs:
+        domain_limits.setdefault(job.domain, asyncio.Semaphore(per_domain))
+
+    if scheduler is not None:
+        await asyncio.to_thread(scheduler.prime, domain_limits)
+
+    owns_client = client is None
+    if client is None:
+        client = build_async_http_client(max_connections=max_concurrency)
+    try:
+        tasks = [
+            asyncio.create_task(
+                _fetch_one(
+                    client,
+                    job,
+                    global_limit,
+                    domain_limits[job.domain],
+                    timeout,
+                    scheduler,
+                    breaker,
+                )
+            )
+            for job in jobs
+        ]
+        try:
+            for index, task in enumerate(tasks):
+                on_result(index, await task)
+        finally:
+            for task in tasks:
+                task.cancel()
+    finally:
+        if owns_client:
+            await client.aclose()
+
+
+def fetch_urls_concurrently(
+    jobs: Sequence[FetchJob],
+    on_result: Callable[[int, FetchOutcome], None],
+    *,
+    max_concurrency: int | None = None,
+    per_domain: int | None = None,
+    timeout: float = 10.0,
+    client: httpx.AsyncClient | None = None,
+    scheduler: PolitenessScheduler | None = None,
+    breaker: CircuitBreaker | None = None,
+) -> None:
+    default_total, default_per_domain = resolve_concurrency()
+    asyncio.run(
+        fetch_all(
+            jobs,
+            on_result,
+            max_concurrency=max_concurrency or default_total,
+            per_domain=per_domain or default_per_domain,
+            timeout=timeout,
+            client=client,
+            scheduler=scheduler,
+            breaker=breaker,
+        )
+    )
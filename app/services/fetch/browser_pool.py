@@ -0,0 +1,226 @@
+"""Long-lived Playwright browser pool.
+
+The pool owns a private event loop on a daemon thread so synchronous
+callers can render pages without paying for ``asyncio.run`` and a fresh
+Chromium launch per URL. Each render gets its own browser context (no
+shared cookies or storage), concurrency is bounded by ``max_pages`` and
+each browser is replaced after ``recycle_after`` pages to cap memory.
+"""
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+import logging
+import threading
+from typing import Any, Callable, Optional, Sequence
+
+from app.services.fetch.render_profiles import (
+    FULL,
+    RenderMetrics,
+    RenderProfile,
+    apply_profile,
+    wait_until_ready,
+)
+
+logger = logging.getLogger(__name__)
+
+RenderResult = tuple[Optional[str], Optional[str], Optional[int]]
+
+
+@dataclass
+class _BrowserSlot:
+    browser: Any
+    served: int = 0
+    active: int = 0
+    retired: bool = False
+
+
+@dataclass
+class BrowserPoolStats:
+    pages: int = 0
+    launches: int = 0
+    recycles: int = 0
+    errors: int = 0
+
+    def summary_line(self) -> str:
+        return (
+            f"browser pages={self.pages} launches={self.launches} "
+            f"recycles={self.recycles} errors={self.errors}"
+        )
+
+
+@dataclass
+class BrowserPool:
+    playwright_factory: Callable[[], Any]
+    size: int = 1
+    max_pages: int = 4
+    recycle_after: int = 50
+    headless: bool = True
+    stats: BrowserPoolStats = field(default_factory=BrowserPoolStats)
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._playwright_cm: Any = None
+        self._playwright: Any = None
+        self._slots: list[_BrowserSlot] = []
+        self._next_slot = 0
+        self._page_limit: asyncio.Semaphore | None = None
+        self._slot_lock: asyncio.Lock | None = None
+
+    # -- synchronous API -------------------------------------------------
+
+    def fetch(
+        self,
+        url: str,
+        timeout: float = 10.0,
+        profile: RenderProfile = FULL,
+        metrics: RenderMetrics | None = None,
+    ) -> RenderResult:
+        return self._submit(self.render(url, timeout, profile, metrics)).result()
+
+    def fetch_many(
+        self,
+        urls: Sequence[str],
+        timeout: float = 10.0,
+        profiles: Sequence[RenderProfile] | None = None,
+    ) -> list[RenderResult]:
+        """Render several URLs concurrently; results keep the input order."""
+        chosen = list(profiles) if profiles is not None else [FULL] * len(urls)
+
+        async def _all() -> list[RenderResult]:
+            return list(
+                await asyncio.gather(
+                    *(self.render(url, timeout, profile) for url, profile in zip(urls, chosen))
+                )
+            )
+
+        return self._submit(_all()).result()
+
+    def close(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join()
+        loop.close()
+        logger.debug("Closed browser pool (%s)", self.stats.summary_line())
+
+    # -- async API (runs on the pool loop) -------------------------------
+
+    async def render(
+        self,
+        url: str,
+        timeout: float = 10.0,
+        profile: RenderProfile = FULL,
+        metrics: RenderMetrics | None = None,
+    ) -> RenderResult:
+        async with self._page_limit:
+            try:
+                slot = await self._acquire_slot()
+            except Exception as exc:  # noqa: BLE001
+                self.stats.errors += 1
+                return None, str(exc), None
+            context = None
+            try:
+                context = await slot.browser.new_context()
+                page = await context.new_page()
+                await apply_profile(page, profile, url, metrics)
+                if metrics is not None:
+                    metrics.start()
+                response = await page.goto(
+                    url, wait_until=profile.wait_until, timeout=timeout * 1000
+                )
+                await wait_until_ready(page, profile, timeout)
+                content = await page.content()
+                if metrics is not None:
+                    metrics.stop()
+                self.stats.pages += 1
+                return content, None, response.status if response else None
+            except Exception as exc:  # noqa: BLE001
+                self.stats.errors += 1
+                return None, str(exc), None
+            finally:
+                if context is not None:
+                    try:
+                        await context.close()
+                    except Exception:  # noqa: BLE001
+                        logger.debug("Ignoring error while closing browser context", exc_info=True)
+                await self._release_slot(slot)
+
+    async def _acquire_slot(self) -> _BrowserSlot:
+        async with self._slot_lock:
+            if self._playwright is None:
+                self._playwright_cm = self.playwright_factory()
+                self._playwright = await self._playwright_cm.__aenter__()
+            while len(self._slots) < self.size:
+                self._slots.append(_BrowserSlot(browser=await self._launch()))
+            index = self._next_slot % len(self._slots)
+            self._next_slot += 1
+            slot = self._slots[index]
+            if slot.served >= self.recycle_after:
+                slot.retired = True
+                if slot.active == 0:
+                    await self._close_browser(slot)
+                self.stats.recycles += 1
+                slot = _BrowserSlot(browser=await self._launch())
+                self._slots[index] = slot
+            slot.served += 1
+            slot.active += 1
+            return slot
+
+    async def _release_slot(self, slot: _BrowserSlot) -> None:
+        slot.active -= 1
+        if slot.retired and slot.active == 0:
+            await self._close_browser(slot)
+
+    async def _launch(self) -> Any:
+        self.stats.launches += 1
+        return await self._playwright.chromium.launch(headless=self.headless)
+
+    async def _close_browser(self, slot: _BrowserSlot) -> None:
+        try:
+            await slot.browser.close()
+        except Exception:  # noqa: BLE001
+            logger.debug("Ignoring error while closing browser", exc_info=True)
+
+    async def _shutdown(self) -> None:
+        for slot in self._slots:
+            await self._close_browser(slot)
+        self._slots = []
+        if self._playwright_cm is not None:
+            await self._playwright_cm.__aexit__(None, None, None)
+        self._playwright_cm = None
+        self._playwright = None
+
+    # -- loop management -------------------------------------------------
+
+    def _submit(self, coro) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def _run() -> None:
+                    asyncio.set_event_loop(loop)
+                    self._page_limit = asyncio.Semaphore(self.max_pages)
+                    self._slot_lock = asyncio.Lock()
+                    ready.set()
+                    loop.run_forever()
+
+                thread = threading.Thread(target=_run, name="browser-pool", daemon=True)
+                thread.start()
+                ready.wait()
+                self._loop = loop
+                self._thread = thread
+            return self._loop
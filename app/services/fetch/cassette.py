@@ -0,0 +1,285 @@
+"""Record/replay cassette for HTTP traffic.
+
+The cassette plugs in as an httpx transport, so it sits under every client
+built by ``http_client`` (page fetches) and under the LLM gateway's OpenAI
+clients (LLM calls). Rendered Playwright pages are captured as plain
+entries keyed by URL.
+
+``record`` performs real requests and appends each response to a gzip'd
+JSON-lines archive. ``replay`` serves responses from the archive without
+touching the network, optionally sleeping for the recorded latency scaled
+by ``latency_scale``; a request missing from the archive fails like a
+connection error. Requests are matched on method, URL and a hash of the
+request body, and repeated requests replay their recordings in order.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+from collections import defaultdict
+from dataclasses import dataclass
+import gzip
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_MODES = ("off", "record", "replay")
+DEFAULT_CASSETTE_PATH = "./data/cassettes/default.jsonl.gz"
+_KEPT_HEADERS = ("content-type", "etag", "last-modified", "location")
+
+
+@dataclass
+class CassetteEntry:
+    key: str
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    elapsed_s: float
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "key": self.key,
+                "status": self.status,
+                "headers": self.headers,
+                "body": base64.b64encode(self.body).decode("ascii"),
+                "elapsed_s": round(self.elapsed_s, 4),
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, line: str) -> "CassetteEntry":
+        data = json.loads(line)
+        return cls(
+            key=data["key"],
+            status=data["status"],
+            headers=data["headers"],
+            body=base64.b64decode(data["body"]),
+            elapsed_s=data["elapsed_s"],
+        )
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            self.status, headers=self.headers, content=self.body, request=request
+        )
+
+
+def request_key(method: str, url: str, body: bytes = b"") -> str:
+    digest = hashlib.sha256(body).hexdigest()[:16] if body else "-"
+    return f"{method.upper()} {url} {digest}"
+
+
+class CassetteMiss(httpx.ConnectError):
+    pass
+
+
+class Cassette:
+    def __init__(self, path: str | Path, mode: str, latency_scale: float = 0.0) -> None:
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        self._lock = threading.Lock()
+        self._entries: dict[str, list[CassetteEntry]] = defaultdict(list)
+        self._cursor: dict[str, int] = defaultdict(int)
+        if mode == "replay":
+            self._load()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_bytes(b"")
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            logger.warning("Cassette %s does not exist; every request will miss", self.path)
+            return
+        with gzip.open(self.path, "rt", encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    entry = CassetteEntry.from_json(line)
+                    self._entries[entry.key].append(entry)
+
+    def lookup(self, key: str) -> CassetteEntry | None:
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.misses += 1
+                return None
+            index = min(self._cursor[key], len(entries) - 1)
+            self._cursor[key] += 1
+            self.hits += 1
+            return entries[index]
+
+    def record(self, entry: CassetteEntry) -> None:
+        with self._lock:
+            self._entries[entry.key].append(entry)
+            # Each append is its own gzip member; gzip readers concatenate them.
+            with gzip.open(self.path, "at", encoding="utf-8") as handle:
+                handle.write(entry.to_json() + "\n")
+            self.recorded += 1
+
+    def replay_delay(self, entry: CassetteEntry) -> float:
+        return entry.elapsed_s * self.latency_scale
+
+    def summary_line(self) -> str:
+        return (
+            f"cassette mode={self.mode} hits={self.hits} misses={self.misses} "
+            f"recorded={self.recorded} path={self.path}"
+        )
+
+
+def _entry_from_response(
+    key: str, response: httpx.Response, body: bytes, elapsed_s: float
+) -> CassetteEntry:
+    headers = {
+        name: response.headers[name] for name in _KEPT_HEADERS if name in response.headers
+    }
+    return CassetteEntry(
+        key=key, status=response.status_code, headers=headers, body=body, elapsed_s=elapsed_s
+    )
+
+
+class CassetteTransport(httpx.BaseTransport):
+    def __init__(self, cassette: Cassette, inner: httpx.BaseTransport | None = None) -> None:
+        self.cassette = cassette
+        self.inner = inner or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = request_key(request.method, str(request.url), request.read())
+        if self.cassette.mode == "replay":
+            entry = self.cassette.lookup(key)
+            if entry is None:
+                raise CassetteMiss(f"cassette miss: {key}", request=request)
+            delay = self.cassette.replay_delay(entry)
+            if delay > 0:
+                time.sleep(delay)
+            return entry.to_response(request)
+        started = time.monotonic()
+        response = self.inner.handle_request(request)
+        try:
+            body = response.read()
+        finally:
+            response.close()
+        entry = _entry_from_response(key, response, body, time.monotonic() - started)
+        self.cassette.record(entry)
+        return entry.to_response(request)
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class AsyncCassetteTransport(httpx.AsyncBaseTransport):
+    def __init__(
+        self, cassette: Cassette, inner: httpx.AsyncBaseTransport | None = None
+    ) -> None:
+        self.cassette = cassette
+        self.inner = inner or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = request_key(request.method, str(request.url), await request.aread())
+        if self.cassette.mode == "replay":
+            entry = self.cassette.lookup(key)
+            if entry is None:
+                raise CassetteMiss(f"cassette miss: {key}", request=request)
+            delay = self.cassette.replay_delay(entry)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            return entry.to_response(request)
+        started = time.monotonic()
+        response = await self.inner.handle_async_request(request)
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+        entry = _entry_from_response(key, response, body, time.monotonic() - started)
+        self.cassette.record(entry)
+        return entry.to_response(request)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+_active: Cassette | None = None
+_active_lock = threading.Lock()
+
+
+def configure_cassette(
+    mode: str | None = None,
+    path: str | None = None,
+    latency_scale: float | None = None,
+) -> Cassette | None:
+    """Activate (or with ``off`` deactivate) the process-wide cassette.
+
+    Unset arguments fall back to PLANZ_CASSETTE, PLANZ_CASSETTE_PATH and
+    PLANZ_CASSETTE_LATENCY. Call before the first request: clients built
+    earlier keep their transport.
+    """
+    global _active
+    mode = mode or os.getenv("PLANZ_CASSETTE", "off").strip().lower() or "off"
+    if mode not in CASSETTE_MODES:
+        raise ValueError(f"Unknown cassette mode: {mode}")
+    with _active_lock:
+        if mode == "off":
+            _active = None
+            return None
+        _active = Cassette(
+            path or os.getenv("PLANZ_CASSETTE_PATH", DEFAULT_CASSETTE_PATH),
+            mode,
+            latency_scale
+            if latency_scale is not None
+            else float(os.getenv("PLANZ_CASSETTE_LATENCY", "0")),
+        )
+        logger.info("Cassette %s active at %s", mode, _active.path)
+        return _active
+
+
+def active_cassette() -> Cassette | None:
+    return _active
+
+
+def wrap_transport(inner: httpx.BaseTransport) -> httpx.BaseTransport:
+    cassette = active_cassette()
+    return CassetteTransport(cassette, inner) if cassette else inner
+
+
+def wrap_async_transport(inner: httpx.AsyncBaseTransport) -> httpx.AsyncBaseTransport:
+    cassette = active_cassette()
+    return AsyncCassetteTransport(cassette, inner) if cassette else inner
+
+
+def lookup_rendered(url: str) -> CassetteEntry | None:
+    """Replay a recorded Playwright render of ``url`` (sleeping for its latency)."""
+    cassette = active_cassette()
+    if cassette is None or cassette.mode != "replay":
+        return None
+    entry = cassette.lookup(request_key("RENDER", url))
+    if entry is not None and cassette.replay_delay(entry) > 0:
+        time.sleep(cassette.replay_delay(entry))
+    return entry
+
+
+def record_rendered(url: str, text: str | None, status: int | None, elapsed_s: float) -> None:
+    cassette = active_cassette()
+    if cassette is None or cassette.mode != "record" or text is None:
+        return
+    cassette.record(
+        CassetteEntry(
+            key=request_key("RENDER", url),
+            status=status or 200,
+            headers={"content-type": "text/html; charset=utf-8"},
+            body=text.encode("utf-8"),
+            elapsed_s=elapsed_s,
+        )
+    )
@@ -0,0 +1,241 @@
+"""Per-domain circuit breaker for fetches.
+
+After ``failure_threshold`` consecutive network failures, timeouts or 5xx
+responses a domain's circuit opens and its remaining requests are skipped
+until ``cooldown_s`` has passed. The next request after the cool-down is a
+probe: success closes the circuit, failure opens it again. While the probe
+is in flight the domain's other requests are still skipped. State is loaded
+from and saved to the ``domain_circuits`` table so a dead domain stays
+skipped on the next run instead of costing the first timeouts again.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+import logging
+import os
+import threading
+from typing import Any, Callable, TypeVar
+
+from sqlalchemy import select
+
+from app.core.urls import bare_domain
+from app.db.models.domain_circuit import DomainCircuit
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+CIRCUIT_OPEN_ERROR = "circuit_open"
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_COOLDOWN_S = 30 * 60.0
+
+F = TypeVar("F", bound=Callable)
+
+
+def is_domain_failure(error: str | None, status: int | None) -> bool:
+    """True when a fetch result says the domain (not just the page) is unhealthy."""
+    if status is not None:
+        return status >= 500 or status == 429
+    return bool(error) and error != CIRCUIT_OPEN_ERROR
+
+
+@dataclass
+class BreakerTransition:
+    domain: str
+    from_state: str
+    to_state: str
+    reason: str | None = None
+
+    def describe(self) -> str:
+        suffix = f" ({self.reason})" if self.reason else ""
+        return f"{self.domain}: {self.from_state} -> {self.to_state}{suffix}"
+
+
+@dataclass
+class _DomainState:
+    state: str = CLOSED
+    consecutive_failures: int = 0
+    opened_at: datetime | None = None
+    open_until: datetime | None = None
+    last_error: str | None = None
+
+
+@dataclass
+class CircuitBreaker:
+    failure_threshold: int = DEFAULT_FAILURE_THRESHOLD
+    cooldown_s: float = DEFAULT_COOLDOWN_S
+    now_fn: Callable[[], datetime] = lambda: datetime.now(tz=timezone.utc)
+    transitions: list[BreakerTransition] = field(default_factory=list)
+    skipped: dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+        self._states: dict[str, _DomainState] = {}
+        self._dirty: set[str] = set()
+        # Half-open domains whose single probe request is in flight.
+        self._probing: set[str] = set()
+
+    @classmethod
+    def from_env(cls) -> "CircuitBreaker":
+        return cls(
+            failure_threshold=int(
+                os.getenv("PLANZ_BREAKER_FAILURES", str(DEFAULT_FAILURE_THRESHOLD))
+            ),
+            cooldown_s=float(os.getenv("PLANZ_BREAKER_COOLDOWN_S", str(DEFAULT_COOLDOWN_S))),
+        )
+
+    # -- request gating ----------------------------------------------------
+
+    def allow(self, url_or_domain: str) -> bool:
+        domain = bare_domain(url_or_domain)
+        with self._lock:
+            state = self._states.get(domain)
+            if state is None or state.state == CLOSED:
+                return True
+            if state.state == OPEN:
+                if state.open_until is None or self.now_fn() < state.open_until:
+                    self.skipped[domain] = self.skipped.get(domain, 0) + 1
+                    return False
+                self._transition(domain, state, HALF_OPEN, "cool-down elapsed")
+            if domain in self._probing:
+                self.skipped[domain] = self.skipped.get(domain, 0) + 1
+                return False
+            self._probing.add(domain)
+            return True
+
+    def abandon(self, url_or_domain: str) -> None:
+        """Give up an allowed request without a verdict; a half-open domain may probe again."""
+        with self._lock:
+            self._probing.discard(bare_domain(url_or_domain))
+
+    def record(self, url_or_domain: str, error: str | None, status: int | None) -> None:
+        if error == CIRCUIT_OPEN_ERROR:
+            return
+        if is_domain_failure(error, status):
+            self.record_failure(url_or_domain, error or f"HTTP {status}")
+        else:
+            self.record_success(url_or_domain)
+
+    def record_success(self, url_or_domain: str) -> None:
+        domain = bare_domain(url_or_domain)
+        with self._lock:
+            self._probing.discard(domain)
+            state = self._states.get(domain)
+            if state is None:
+                return
+            if state.state != CLOSED:
+                self._transition(domain, state, CLOSED, "request succeeded")
+            if state.consecutive_failures:
+                state.consecutive_failures = 0
+                state.opened_at = None
+                state.open_until = None
+                self._dirty.add(domain)
+
+    def record_failure(self, url_or_domain: str, error: str) -> None:
+        domain = bare_domain(url_or_domain)
+        with self._lock:
+            self._probing.discard(domain)
+            state = self._states.setdefault(domain, _DomainState())
+            state.consecutive_failures += 1
+            state.last_error = error
+            self._dirty.add(domain)
+            if state.state == HALF_OPEN or (
+                state.state == CLOSED and state.consecutive_failures >= self.failure_threshold
+            ):
+                now = self.now_fn()
+                state.opened_at = now
+                state.open_until = now + timedelta(seconds=self.cooldown_s)
+                self._transition(
+                    domain,
+                    state,
+                    OPEN,
+                    f"{state.consecutive_failures} consecutive failures, last: {error}",
+                )
+
+    def state_of(self, url_or_domain: str) -> str:
+        with self._lock:
+            state = self._states.get(bare_domain(url_or_domain))
+            return state.state if state else CLOSED
+
+    def _transition(
+        self, domain: str, state: _DomainState, to_state: str, reason: str
+    ) -> None:
+        transition = BreakerTransition(domain, state.state, to_state, reason)
+        state.state = to_state
+        self._dirty.add(domain)
+        self.transitions.append(transition)
+        logger.warning("Circuit %s", transition.describe())
+
+    # -- persistence -------------------------------------------------------
+
+    def load(self, session) -> "CircuitBreaker":
+        rows = session.scalars(select(DomainCircuit)).all()
+        with self._lock:
+            for row in rows:
+                self._states[row.domain] = _DomainState(
+                    state=row.state,
+                    consecutive_failures=row.consecutive_failures,
+                    opened_at=row.opened_at,
+                    open_until=row.open_until,
+                    last_error=row.last_error,
+                )
+        return self
+
+    def save(self, session) -> None:
+        """Write changed domain states; the caller owns the commit."""
+        now = self.now_fn()
+        with self._lock:
+            dirty = {domain: self._states[domain] for domain in self._dirty}
+            self._dirty.clear()
+        for domain, state in dirty.items():
+            row = session.scalar(select(DomainCircuit).where(DomainCircuit.domain == domain))
+            if row is None:
+                row = DomainCircuit(domain=domain)
+                session.add(row)
+            row.state = state.state
+            row.consecutive_failures = state.consecutive_failures
+            row.opened_at = state.opened_at
+            row.open_until = state.open_until
+            row.last_error = state.last_error
+            row.updated_at = now
+
+    # -- reporting ---------------------------------------------------------
+
+    def summary_lines(self) -> list[str]:
+        lines = [f"Circuit {transition.describe()}" for transition in self.transitions]
+        for domain, count in sorted(self.skipped.items()):
+            lines.append(f"Circuit open, skipped {count} request(s) for {domain}")
+        return lines
+
+
+def guarded(
+    fetch: F,
+    breaker: CircuitBreaker,
+    blocked: Callable[[], Any] = lambda: (None, CIRCUIT_OPEN_ERROR, None),
+) -> F:
+    """Wrap a URL-first fetch callable with ``breaker``.
+
+    Works for fetchers returning ``(text, error, status)`` tuples and for
+    result objects with ``error``/``status`` attributes; ``blocked`` builds
+    the result returned while the circuit is open.
+    """
+
+    def _guarded_fetch(url: str, *args, **kwargs):
+        if not breaker.allow(url):
+            return blocked()
+        try:
+            result = fetch(url, *args, **kwargs)
+        except BaseException:
+            breaker.abandon(url)
+            raise
+        if isinstance(result, tuple):
+            _text, error, status = result
+        else:
+            error, status = result.error, result.status
+        breaker.record(url, error, status)
+        return result
+
+    return _guarded_fetch  # type: ignore[return-value]
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import threading
+from typing import Callable
+
+from app.services.fetch.http_fetcher import ConditionalFetchResult, fetch_url_conditional
+from app.services.fetch.page_cache import PageCache
+
+DEFAULT_MAX_REMEMBERED_PAGES = 128
+
+
+@dataclass
+class ValidatedPage:
+    text: str
+    etag: str | None
+    last_modified: str | None
+
+
+@dataclass
+class ConditionalStats:
+    requests: int = 0
+    not_modified: int = 0
+    cache_hits: int = 0
+    bytes_read: int = 0
+    bytes_saved: int = 0
+
+    def summary_line(self) -> str:
+        return (
+            f"conditional requests={self.requests} not_modified={self.not_modified} "
+            f"cache_hits={self.cache_hits} bytes_read={self.bytes_read} "
+            f"bytes_saved={self.bytes_saved}"
+        )
+
+
+@dataclass
+class ConditionalFetcher:
+    """Fetcher that revalidates pages it has already seen with If-None-Match/If-Modified-Since.
+
+    Call signature matches fetch_url_text, so it can be handed to
+    iter_listing_pages or wrapped as a detail fetcher. On a 304 the
+    remembered body is returned, so callers only see the saving in ``stats``.
+
+    Without a cache the last ``max_pages`` bodies are remembered in memory.
+    With a ``cache`` the remembered bodies live only there and persist across
+    runs: ``use`` serves fresh entries without touching the network and
+    revalidates stale ones, ``refresh`` always downloads and overwrites,
+    ``off`` ignores the cache and falls back to memory. Bodies cut short by
+    the byte cap are never remembered.
+    """
+
+    fetch: Callable[..., ConditionalFetchResult] = fetch_url_conditional
+    pages: OrderedDict[str, ValidatedPage] = field(default_factory=OrderedDict)
+    max_pages: int = DEFAULT_MAX_REMEMBERED_PAGES
+    stats: ConditionalStats = field(default_factory=ConditionalStats)
+    cache: PageCache | None = None
+    cache_mode: str = "use"
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def __call__(
+        self, url: str, timeout: float = 10.0
+    ) -> tuple[str | None, str | None, int | None]:
+        known = self._lookup(url)
+        if isinstance(known, str):
+            return known, None, 200
+        result = self.fetch(
+            url,
+            etag=known.etag if known else None,
+            last_modified=known.last_modified if known else None,
+            timeout=timeout,
+        )
+        with self._lock:
+            self.stats.requests += 1
+            if result.not_modified and known is not None:
+                self.stats.not_modified += 1
+                self.stats.bytes_saved += len(known.text.encode("utf-8"))
+                if self._cache_enabled:
+                    self.cache.touch(url)
+                return known.text, None, result.status
+            if result.text is None:
+                return None, result.error or "not_modified_without_cached_body", result.status
+            self.stats.bytes_read += result.bytes_read
+            if result.truncated:
+                return result.text, None, result.status
+            if not self._cache_enabled and (result.etag or result.last_modified):
+                self._remember(url, result)
+        if self._cache_enabled:
+            self.cache.put(url, result.text, etag=result.etag, last_modified=result.last_modified)
+        return result.text, None, result.status
+
+    def _remember(self, url: str, result: ConditionalFetchResult) -> None:
+        self.pages[url] = ValidatedPage(
+            text=result.text, etag=result.etag, last_modified=result.last_modified
+        )
+        self.pages.move_to_end(url)
+        while len(self.pages) > self.max_pages:
+            self.pages.popitem(last=False)
+
+    @property
+    def _cache_enabled(self) -> bool:
+        return self.cache is not None and self.cache_mode != "off"
+
+    def _lookup(self, url: str) -> ValidatedPage | str | None:
+        """Return a fresh cached body, validators to revalidate with, or None."""
+        with self._lock:
+            known = self.pages.get(url)
+            if known is not None:
+                self.pages.move_to_end(url)
+        if known is not None or not self._cache_enabled or self.cache_mode == "refresh":
+            return known
+        cached = self.cache.get(url)
+        if cached is None:
+            return None
+        if cached.fresh:
+            with self._lock:
+                self.stats.cache_hits += 1
+                self.stats.bytes_saved += len(cached.text.encode("utf-8"))
+            return cached.text
+        return ValidatedPage(
+            text=cached.text, etag=cached.etag, last_modified=cached.last_modified
+        )
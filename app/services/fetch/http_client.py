@@ -0,0 +1,168 @@
+"""Process-wide pooled HTTP clients shared by every fetcher."""
+from __future__ import annotations
+
+import atexit
+from dataclasses import dataclass
+import importlib.util
+import logging
+import os
+import threading
+from typing import Any
+
+import httpx
+
+from app.services.fetch.cassette import active_cassette, wrap_async_transport, wrap_transport
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {"User-Agent": "PLAZN/0.1"}
+
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+_stats_lock = threading.Lock()
+
+
+@dataclass
+class PoolStats:
+    requests: int = 0
+    connections_opened: int = 0
+
+    @property
+    def pool_hits(self) -> int:
+        return max(self.requests - self.connections_opened, 0)
+
+    def summary_line(self) -> str:
+        return (
+            f"http requests={self.requests} connections={self.connections_opened} "
+            f"pool_hits={self.pool_hits}"
+        )
+
+
+_stats = PoolStats()
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in {"true", "1", "yes"}
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def resolve_client_config() -> dict[str, Any]:
+    """Return pool limits and timeouts from the environment."""
+    http2 = _env_flag("PLANZ_HTTP2")
+    if http2 and not http2_available():
+        logger.warning("PLANZ_HTTP2 set but the h2 package is not installed; using HTTP/1.1")
+        http2 = False
+    return {
+        "timeout": float(os.getenv("PLANZ_HTTP_TIMEOUT", "10")),
+        "max_connections": int(os.getenv("PLANZ_HTTP_MAX_CONNECTIONS", "20")),
+        "max_keepalive_connections": int(os.getenv("PLANZ_HTTP_MAX_KEEPALIVE", "10")),
+        "keepalive_expiry": float(os.getenv("PLANZ_HTTP_KEEPALIVE_EXPIRY", "30")),
+        "http2": http2,
+    }
+
+
+def _client_kwargs(overrides: dict[str, Any]) -> dict[str, Any]:
+    config = resolve_client_config()
+    config.update({key: value for key, value in overrides.items() if value is not None})
+    kwargs: dict[str, Any] = {
+        "headers": DEFAULT_HEADERS,
+        "follow_redirects": True,
+        "timeout": config["timeout"],
+        "http2": config["http2"],
+        "limits": httpx.Limits(
+            max_connections=config["max_connections"],
+            max_keepalive_connections=config["max_keepalive_connections"],
+            keepalive_expiry=config["keepalive_expiry"],
+        ),
+    }
+    if "transport" in overrides:
+        kwargs["transport"] = overrides["transport"]
+    return kwargs
+
+
+def _record_connection(event_name: str) -> None:
+    if event_name == "connection.connect_tcp.started":
+        with _stats_lock:
+            _stats.connections_opened += 1
+
+
+def _trace(event_name: str, info: dict) -> None:
+    _record_connection(event_name)
+
+
+async def _atrace(event_name: str, info: dict) -> None:
+    _record_connection(event_name)
+
+
+def _on_request(request: httpx.Request) -> None:
+    with _stats_lock:
+        _stats.requests += 1
+    request.extensions["trace"] = _trace
+
+
+async def _on_async_request(request: httpx.Request) -> None:
+    with _stats_lock:
+        _stats.requests += 1
+    request.extensions["trace"] = _atrace
+
+
+def build_http_client(**overrides: Any) -> httpx.Client:
+    kwargs = _client_kwargs(overrides)
+    if "transport" not in kwargs and active_cassette() is not None:
+        kwargs["transport"] = wrap_transport(
+            httpx.HTTPTransport(http2=kwargs["http2"], limits=kwargs["limits"])
+        )
+    return httpx.Client(event_hooks={"request": [_on_request]}, **kwargs)
+
+
+def build_async_http_client(**overrides: Any) -> httpx.AsyncClient:
+    """Build an AsyncClient with the shared pool config.
+
+    Async clients are bound to the event loop that uses them, so callers own
+    the returned client and close it when their loop finishes.
+    """
+    kwargs = _client_kwargs(overrides)
+    if "transport" not in kwargs and active_cassette() is not None:
+        kwargs["transport"] = wrap_async_transport(
+            httpx.AsyncHTTPTransport(http2=kwargs["http2"], limits=kwargs["limits"])
+        )
+    return httpx.AsyncClient(event_hooks={"request": [_on_async_request]}, **kwargs)
+
+
+def get_http_client() -> httpx.Client:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = build_http_client()
+    return _client
+
+
+def pool_stats() -> PoolStats:
+    with _stats_lock:
+        return PoolStats(
+            requests=_stats.requests,
+            connections_opened=_stats.connections_opened,
+        )
+
+
+def reset_pool_stats() -> None:
+    with _stats_lock:
+        _stats.requests = 0
+        _stats.connections_opened = 0
+
+
+def close_http_clients() -> None:
+    """Close the shared client; the next get_http_client() builds a fresh pool."""
+    global _client
+    with _client_lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
+        logger.debug("Closed shared HTTP client (%s)", pool_stats().summary_line())
+
+
+atexit.register(close_http_clients)
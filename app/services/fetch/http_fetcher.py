@@ -1,17 +1,191 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import hashlib
+import os
+
 import httpx
 
+from app.core.env import parse_domain_values
+from app.core.urls import bare_domain
+from app.services.fetch.http_client import get_http_client
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+ACCEPTED_CONTENT_TYPES = frozenset({"text/html", "application/xhtml+xml", "text/plain"})
+TRUNCATED_MAX_BYTES = "max_bytes"
+
+
+@dataclass
+class ConditionalFetchResult:
+    text: str | None
+    error: str | None
+    status: int | None
+    etag: str | None = None
+    last_modified: str | None = None
+    not_modified: bool = False
+    bytes_read: int = 0
+    content_hash: str | None = None
+    truncated: str | None = None
+
+
+def max_bytes_for(url: str) -> int:
+    """Byte cap for one response body: PLANZ_FETCH_MAX_BYTES_BY_DOMAIN, else PLANZ_FETCH_MAX_BYTES."""
+    caps = parse_domain_values(os.getenv("PLANZ_FETCH_MAX_BYTES_BY_DOMAIN", ""))
+    domain = bare_domain(url)
+    if domain in caps:
+        return int(caps[domain])
+    return int(os.getenv("PLANZ_FETCH_MAX_BYTES", str(DEFAULT_MAX_BYTES)))
+
+
+def content_type_error(response: httpx.Response) -> str | None:
+    """Reject bodies we cannot extract events from before reading them."""
+    mime = response.headers.get("content-type", "").split(";")[0].strip().lower()
+    if not mime or mime in ACCEPTED_CONTENT_TYPES:
+        return None
+    return f"unsupported_content_type: {mime}"
+
+
+@dataclass
+class StreamedBody:
+    """Accumulates a streamed body up to ``max_bytes``, hashing as it goes."""
+
+    max_bytes: int
+    size: int = 0
+    truncated: str | None = None
+    _chunks: list[bytes] = field(default_factory=list, repr=False)
+    _hasher: "hashlib._Hash" = field(default_factory=hashlib.sha256, repr=False)
+
+    def feed(self, chunk: bytes) -> bool:
+        """Take a chunk; return False once the cap is reached and reading should stop."""
+        room = self.max_bytes - self.size
+        if len(chunk) > room:
+            chunk = chunk[:room]
+            self.truncated = TRUNCATED_MAX_BYTES
+        self._chunks.append(chunk)
+        self._hasher.update(chunk)
+        self.size += len(chunk)
+        return self.truncated is None
+
+    @property
+    def content_hash(self) -> str:
+        return self._hasher.hexdigest()
 
-def fetch_url_text(url: str, timeout: float = 10.0) -> tuple[str | None, str | None, int | None]:
-    headers = {"User-Agent": "PLAZN/0.1"}
+    def text(self, encoding: str | None) -> str:
+        return b"".join(self._chunks).decode(encoding or "utf-8", errors="replace")
 
+
+def conditional_headers(etag: str | None, last_modified: str | None) -> dict[str, str]:
+    headers: dict[str, str] = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def check_response(
+    response: httpx.Response,
+    etag: str | None = None,
+    last_modified: str | None = None,
+) -> ConditionalFetchResult | None:
+    """Handle everything decidable from the headers alone.
+
+    Returns the final result for a 304 or a rejected content type, raises for
+    error statuses, and returns None when the body should be read.
+    """
+    if response.status_code == 304:
+        return ConditionalFetchResult(
+            text=None,
+            error=None,
+            status=304,
+            etag=response.headers.get("etag") or etag,
+            last_modified=response.headers.get("last-modified") or last_modified,
+            not_modified=True,
+        )
+    response.raise_for_status()
+    rejected = content_type_error(response)
+    if rejected:
+        return ConditionalFetchResult(text=None, error=rejected, status=response.status_code)
+    return None
+
+
+def body_result(response: httpx.Response, body: StreamedBody) -> ConditionalFetchResult:
+    return ConditionalFetchResult(
+        text=body.text(response.encoding),
+        error=None,
+        status=response.status_code,
+        etag=response.headers.get("etag"),
+        last_modified=response.headers.get("last-modified"),
+        bytes_read=body.size,
+        content_hash=body.content_hash,
+        truncated=body.truncated,
+    )
+
+
+def result_from_response(
+    response: httpx.Response,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> ConditionalFetchResult:
+    """Map a streamed response to a fetch result; 304 keeps the validators that were sent."""
+    early = check_response(response, etag=etag, last_modified=last_modified)
+    if early is not None:
+        return early
+    body = StreamedBody(max_bytes=max_bytes)
+    for chunk in response.iter_bytes():
+        if not body.feed(chunk):
+            break
+    return body_result(response, body)
+
+
+async def result_from_async_response(
+    response: httpx.Response,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> ConditionalFetchResult:
+    early = check_response(response, etag=etag, last_modified=last_modified)
+    if early is not None:
+        return early
+    body = StreamedBody(max_bytes=max_bytes)
+    async for chunk in response.aiter_bytes():
+        if not body.feed(chunk):
+            break
+    return body_result(response, body)
+
+
+def fetch_url_conditional(
+    url: str,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    timeout: float = 10.0,
+    max_bytes: int | None = None,
+) -> ConditionalFetchResult:
+    """Stream ``url``; the body stops at ``max_bytes`` (default: ``max_bytes_for(url)``)."""
     try:
-        with httpx.Client(headers=headers, timeout=timeout, follow_redirects=True) as client:
-            response = client.get(url)
-            response.raise_for_status()
-            return response.text, None, response.status_code
+        with get_http_client().stream(
+            "GET",
+            url,
+            headers=conditional_headers(etag, last_modified),
+            timeout=timeout,
+        ) as response:
+            return result_from_response(
+                response,
+                etag=etag,
+                last_modified=last_modified,
+                max_bytes=max_bytes or max_bytes_for(url),
+            )
     except httpx.HTTPStatusError as exc:
         resp = exc.response
         status = resp.status_code if resp else None
-        return None, str(exc), status
+        return ConditionalFetchResult(text=None, error=str(exc), status=status)
     except Exception as exc:  # noqa: BLE001
-        return None, str(exc), None
+        return ConditionalFetchResult(text=None, error=str(exc), status=None)
+
+
+def fetch_url_text(
+    url: str, timeout: float = 10.0, max_bytes: int | None = None
+) -> tuple[str | None, str | None, int | None]:
+    result = fetch_url_conditional(url, timeout=timeout, max_bytes=max_bytes)
+    return result.text, result.error, result.status
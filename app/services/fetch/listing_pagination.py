@@ -1,24 +1,232 @@
 from __future__ import annotations
 
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 import hashlib
 import logging
 import os
 from typing import Callable, Iterator
-from urllib.parse import urljoin
-
-from bs4 import BeautifulSoup
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
 
 from app.core.urls import canonicalize_url
+from app.services.extract.muenchen_listing_parser import (
+    ListingTree,
+    build_tree,
+    next_link_href,
+    scan_next_link_href,
+)
+from app.utils.timing import Timer
 
 logger = logging.getLogger(__name__)
 
+Fetcher = Callable[[str, float], tuple[str | None, str | None, int | None]]
+
+
+@dataclass
+class ListingPage:
+    """A listing page fetched and parsed once, ready for item extraction."""
+
+    url: str
+    html: str | None
+    soup: ListingTree | None
+    fetch_s: float
+    error: str | None = None
+    truncated: bool = False
+
+
+def _resolve_max_pages(max_pages: int | None) -> int:
+    return max_pages or int(os.getenv("PLANZ_MAX_LISTING_PAGES", "10"))
+
+
+def _resolve_prefetch(prefetch: int | None) -> int:
+    if prefetch is not None:
+        return max(prefetch, 0)
+    return max(int(os.getenv("PLANZ_LISTING_PREFETCH", "4")), 0)
+
+
+@dataclass(frozen=True)
+class PagePattern:
+    """Numbered listing URLs: ``build(n)`` returns the URL of page ``n``."""
+
+    build: Callable[[int], str]
+    next_number: int
+
+
+def numbered_page_pattern(current: str, next_url: str) -> PagePattern | None:
+    """Detect a page number that ``next_url`` increments relative to ``current``.
+
+    Matches when the two URLs differ only by one numeric query parameter
+    (``?page=2`` -> ``?page=3``, or a first page without the parameter) or one
+    numeric path segment (``/seite/2`` -> ``/seite/3``).
+    """
+    cur, nxt = urlparse(current), urlparse(next_url)
+    if (cur.scheme, cur.netloc) != (nxt.scheme, nxt.netloc):
+        return None
+    if cur.path == nxt.path:
+        return _query_pattern(cur.query, nxt)
+    if cur.query == nxt.query:
+        return _path_pattern(cur.path, nxt)
+    return None
+
+
+def _query_pattern(current_query: str, nxt) -> PagePattern | None:
+    cur_params = dict(parse_qsl(current_query, keep_blank_values=True))
+    nxt_params = parse_qsl(nxt.query, keep_blank_values=True)
+    changed = [key for key, value in nxt_params if cur_params.get(key) != value]
+    dropped = set(cur_params) - {key for key, _ in nxt_params}
+    if len(changed) != 1 or dropped:
+        return None
+    key = changed[0]
+    value = dict(nxt_params)[key]
+    if not value.isdigit():
+        return None
+    previous = cur_params.get(key)
+    if previous is None:
+        if int(value) not in (1, 2):
+            return None
+    elif not previous.isdigit() or int(previous) + 1 != int(value):
+        return None
+
+    def build(number: int) -> str:
+        params = [(k, str(number) if k == key else v) for k, v in nxt_params]
+        return urlunparse(nxt._replace(query=urlencode(params)))
+
+    return PagePattern(build=build, next_number=int(value))
+
+
+def _path_pattern(current_path: str, nxt) -> PagePattern | None:
+    cur_parts, nxt_parts = current_path.split("/"), nxt.path.split("/")
+    if len(cur_parts) != len(nxt_parts):
+        return None
+    diffs = [i for i, (a, b) in enumerate(zip(cur_parts, nxt_parts)) if a != b]
+    if len(diffs) != 1:
+        return None
+    index = diffs[0]
+    a, b = cur_parts[index], nxt_parts[index]
+    if not (a.isdigit() and b.isdigit() and int(a) + 1 == int(b)):
+        return None
+
+    def build(number: int) -> str:
+        parts = list(nxt_parts)
+        parts[index] = str(number)
+        return urlunparse(nxt._replace(path="/".join(parts)))
+
+    return PagePattern(build=build, next_number=int(b))
+
+
+def _timed_fetch(fetcher: Fetcher, url: str) -> tuple[str | None, str | None, float]:
+    with Timer("fetch") as t_fetch:
+        text, error, _status = fetcher(url, 10.0)
+    return text, error, t_fetch.elapsed
+
+
+def _next_page_url(soup: ListingTree | None, current: str, html: str = "") -> str | None:
+    href = next_link_href(soup) if soup is not None else scan_next_link_href(html)
+    if not href:
+        return None
+    next_url = canonicalize_url(urljoin(current, href))
+    if not next_url or next_url == current:
+        return None
+    return next_url
+
+
+def iter_listing_pages(
+    start_url: str,
+    fetcher: Fetcher,
+    max_pages: int | None = None,
+    prefetch: int | None = None,
+    build_trees: bool = True,
+) -> Iterator[ListingPage]:
+    """Follow rel=next from ``start_url``, yielding each page with its HTML and parse tree.
+
+    With ``build_trees=False`` pages are yielded without a tree (``soup`` is
+    None) and rel=next is found by scanning the raw tags, for callers that
+    parse the HTML elsewhere.
+
+    A page whose fetch fails is yielded with ``error`` set and ends the walk; a
+    page whose body repeats the previous one is not yielded. When ``max_pages``
+    ends the walk while the last page still links to a next one, that page is
+    yielded with ``truncated`` set.
+
+    When rel=next links follow a numbered pattern, the next ``prefetch`` pages
+    (``PLANZ_LISTING_PREFETCH``, default 4) are fetched concurrently ahead of
+    the walk. Every page is still reached through its predecessor's rel=next
+    link, so speculation never changes which pages are yielded; pages fetched
+    past the end are discarded. ``prefetch=0`` walks strictly serially.
+    """
+    max_pages = _resolve_max_pages(max_pages)
+    prefetch = _resolve_prefetch(prefetch)
+    executor = ThreadPoolExecutor(max_workers=prefetch) if prefetch else None
+    inflight: dict[str, Future] = {}
+    seen = set()
+    current: str | None = start_url
+    previous_hash = None
+    try:
+        while current is not None and len(seen) < max_pages:
+            if current in seen:
+                break
+            seen.add(current)
+            future = inflight.pop(current, None)
+            if future is not None:
+                text, error, fetch_s = future.result()
+            else:
+                text, error, fetch_s = _timed_fetch(fetcher, current)
+            if error or text is None or not text.strip():
+                yield ListingPage(
+                    url=current,
+                    html=None,
+                    soup=None,
+                    fetch_s=fetch_s,
+                    error=error or "empty_response",
+                )
+                break
+            content_hash = hashlib.sha256(text.encode()).hexdigest()
+            if previous_hash is not None and previous_hash == content_hash:
+                break
+            previous_hash = content_hash
+            soup = build_tree(text) if build_trees else None
+            next_url = _next_page_url(soup, current, text)
+            truncated = next_url is not None and next_url not in seen and len(seen) >= max_pages
+            yield ListingPage(
+                url=current, html=text, soup=soup, fetch_s=fetch_s, truncated=truncated
+            )
+            if executor is not None and next_url is not None:
+                budget = min(prefetch, max_pages - len(seen))
+                _schedule_prefetch(executor, fetcher, current, next_url, budget, seen, inflight)
+            current = next_url
+    finally:
+        for pending in inflight.values():
+            pending.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _schedule_prefetch(
+    executor: ThreadPoolExecutor,
+    fetcher: Fetcher,
+    current: str,
+    next_url: str,
+    budget: int,
+    seen: set[str],
+    inflight: dict[str, Future],
+) -> None:
+    pattern = numbered_page_pattern(current, next_url)
+    if pattern is None:
+        return
+    for offset in range(budget):
+        url = canonicalize_url(pattern.build(pattern.next_number + offset))
+        if url in seen or url in inflight:
+            continue
+        inflight[url] = executor.submit(_timed_fetch, fetcher, url)
+    logger.debug("Prefetching listing pages: %s", ", ".join(inflight))
+
 
 def enumerate_listing_pages(
     start_url: str,
-    fetcher: Callable[[str, float], tuple[str | None, str | None, int | None]],
+    fetcher: Fetcher,
     max_pages: int | None = None,
 ) -> Iterator[str]:
-    max_pages = max_pages or int(os.getenv("PLANZ_MAX_LISTING_PAGES", "10"))
+    max_pages = _resolve_max_pages(max_pages)
     seen = set()
     current = start_url
     previous_hash = None
@@ -36,14 +244,8 @@ def enumerate_listing_pages(
         if previous_hash is not None and previous_hash == content_hash:
             break
         previous_hash = content_hash
-        soup = BeautifulSoup(text, "html.parser")
-        next_link = soup.find("a", rel="next")
-        if not next_link or not next_link.get("href"):
-            break
-        resolved = urljoin(current, next_link["href"])
-        next_url = canonicalize_url(resolved)
-        if not next_url:
-            break
-        if next_url == current:
+        soup = build_tree(text)
+        next_url = _next_page_url(soup, current)
+        if next_url is None:
             break
         current = next_url
@@ -0,0 +1,209 @@
+"""Persistent on-disk page cache for detail-page fetches.
+
+Entries are keyed by canonical URL and point at gzip-compressed,
+content-addressed blobs, so pages with identical bodies share one file.
+A small SQLite index tracks freshness, validators and last access for
+LRU eviction once the blob store exceeds its byte budget.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import gzip
+import hashlib
+import logging
+import os
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Callable
+
+from app.core.env import parse_domain_values
+from app.core.urls import canonicalize_url, extract_domain
+
+logger = logging.getLogger(__name__)
+
+CACHE_MODES = ("use", "refresh", "off")
+DEFAULT_CACHE_DIR = "./data/page_cache"
+DEFAULT_TTL_S = 24 * 3600.0
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class CachedPage:
+    text: str
+    etag: str | None
+    last_modified: str | None
+    fresh: bool
+
+
+def parse_domain_ttls(raw: str) -> dict[str, float]:
+    """Parse ``"muenchen.de=21600,example.com=3600"`` into a domain -> seconds map."""
+    return parse_domain_values(raw)
+
+
+class PageCache:
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        default_ttl_s: float = DEFAULT_TTL_S,
+        domain_ttls: dict[str, float] | None = None,
+        time_fn: Callable[[], float] = time.time,
+    ) -> None:
+        self.root = Path(root)
+        self.blob_dir = self.root / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.default_ttl_s = default_ttl_s
+        self.domain_ttls = domain_ttls or {}
+        self._time = time_fn
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.root / "index.sqlite", check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "url TEXT PRIMARY KEY, digest TEXT NOT NULL, fetched_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL, etag TEXT, last_modified TEXT)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blobs (digest TEXT PRIMARY KEY, size INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_entries_accessed_at ON entries(accessed_at)"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def from_env(cls) -> "PageCache":
+        return cls(
+            os.getenv("PLANZ_PAGE_CACHE_DIR", DEFAULT_CACHE_DIR),
+            max_bytes=int(os.getenv("PLANZ_PAGE_CACHE_MAX_BYTES", str(DEFAULT_MAX_BYTES))),
+            default_ttl_s=float(os.getenv("PLANZ_PAGE_CACHE_TTL_S", str(DEFAULT_TTL_S))),
+            domain_ttls=parse_domain_ttls(os.getenv("PLANZ_PAGE_CACHE_TTLS", "")),
+        )
+
+    def ttl_for(self, url: str) -> float:
+        domain = extract_domain(url)
+        if domain in self.domain_ttls:
+            return self.domain_ttls[domain]
+        bare = domain[4:] if domain.startswith("www.") else domain
+        return self.domain_ttls.get(bare, self.default_ttl_s)
+
+    def get(self, url: str) -> CachedPage | None:
+        key = canonicalize_url(url)
+        now = self._time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest, fetched_at, etag, last_modified FROM entries WHERE url = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            digest, fetched_at, etag, last_modified = row
+            try:
+                text = gzip.decompress(self._blob_path(digest).read_bytes()).decode("utf-8")
+            except (OSError, EOFError):
+                logger.warning("Dropping page cache entry with unreadable blob url=%s", key)
+                self._delete_entry(key, digest)
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE url = ?", (now, key))
+            self._conn.commit()
+        return CachedPage(
+            text=text,
+            etag=etag,
+            last_modified=last_modified,
+            fresh=now - fetched_at < self.ttl_for(key),
+        )
+
+    def put(
+        self,
+        url: str,
+        text: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        key = canonicalize_url(url)
+        body = text.encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        now = self._time()
+        with self._lock:
+            path = self._blob_path(digest)
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                compressed = gzip.compress(body, mtime=0)
+                tmp_path = path.with_suffix(".tmp")
+                tmp_path.write_bytes(compressed)
+                tmp_path.replace(path)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO blobs (digest, size) VALUES (?, ?)",
+                    (digest, len(compressed)),
+                )
+            previous = self._conn.execute(
+                "SELECT digest FROM entries WHERE url = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(url, digest, fetched_at, accessed_at, etag, last_modified) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, digest, now, now, etag, last_modified),
+            )
+            if previous and previous[0] != digest:
+                self._drop_blob_if_orphaned(previous[0])
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, url: str) -> None:
+        """Mark an entry as freshly validated (e.g. after a 304)."""
+        key = canonicalize_url(url)
+        now = self._time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, key),
+            )
+            self._conn.commit()
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._total_bytes()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _total_bytes(self) -> int:
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()
+        return int(row[0])
+
+    def _evict(self) -> None:
+        total = self._total_bytes()
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT url, digest FROM entries ORDER BY accessed_at ASC"
+        ).fetchall()
+        for url, digest in rows:
+            if total <= self.max_bytes:
+                break
+            total -= self._delete_entry(url, digest)
+            logger.debug("Evicted page cache entry url=%s", url)
+
+    def _delete_entry(self, url: str, digest: str) -> int:
+        self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+        return self._drop_blob_if_orphaned(digest)
+
+    def _drop_blob_if_orphaned(self, digest: str) -> int:
+        in_use = self._conn.execute(
+            "SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)
+        ).fetchone()
+        if in_use:
+            return 0
+        row = self._conn.execute("SELECT size FROM blobs WHERE digest = ?", (digest,)).fetchone()
+        self._conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+        self._blob_path(digest).unlink(missing_ok=True)
+        return int(row[0]) if row else 0
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / f"{digest}.gz"
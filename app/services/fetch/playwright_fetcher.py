@@ -1,14 +1,24 @@
 from __future__ import annotations
 
-import asyncio
+import atexit
 import os
-from typing import Optional
+import threading
+from time import monotonic
+from typing import Optional, Sequence
+
+from app.core.urls import extract_domain
+from app.services.fetch.browser_pool import BrowserPool
+from app.services.fetch.cassette import lookup_rendered, record_rendered
+from app.services.fetch.render_profiles import RenderProfile, profile_for_url
 
 try:
     from playwright.async_api import async_playwright as _async_playwright
 except ImportError:  # pragma: no cover - optional dependency
     _async_playwright = None
 
+_pool: BrowserPool | None = None
+_pool_lock = threading.Lock()
+
 
 def is_allowlisted(domain: str) -> bool:
     allowlist = os.getenv("PLANZ_PLAYWRIGHT_ALLOWLIST", "www.muenchen.de,muenchen.de")
@@ -16,25 +26,59 @@ def is_allowlisted(domain: str) -> bool:
     return domain.lower() in domains
 
 
+def get_browser_pool() -> BrowserPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(
+                playwright_factory=_async_playwright,
+                size=int(os.getenv("PLANZ_BROWSER_POOL_SIZE", "1")),
+                max_pages=int(os.getenv("PLANZ_BROWSER_MAX_PAGES", "4")),
+                recycle_after=int(os.getenv("PLANZ_BROWSER_RECYCLE_AFTER", "50")),
+            )
+        return _pool
+
+
+def close_browser_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+
+atexit.register(close_browser_pool)
+
+
 def fetch_url_playwright(
-    url: str, timeout: float = 10.0
+    url: str,
+    timeout: float = 10.0,
+    profile: RenderProfile | None = None,
 ) -> tuple[str | None, str | None, Optional[int]]:
-    async def _run() -> tuple[str | None, str | None, Optional[int]]:
-        if _async_playwright is None:
-            return None, "playwright_not_installed", None
-
-        try:
-            async with _async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page()
-                response = await page.goto(
-                    url, wait_until="networkidle", timeout=timeout * 1000
-                )
-                content = await page.content()
-                status = response.status if response else None
-                await browser.close()
-                return content, None, status
-        except Exception as exc:  # noqa: BLE001
-            return None, str(exc), None
-
-    return asyncio.run(_run())
+    replayed = lookup_rendered(url)
+    if replayed is not None:
+        return replayed.body.decode("utf-8"), None, replayed.status
+    if _async_playwright is None:
+        return None, "playwright_not_installed", None
+    started = monotonic()
+    text, error, status = get_browser_pool().fetch(url, timeout, profile or profile_for_url(url))
+    record_rendered(url, text, status, monotonic() - started)
+    return text, error, status
+
+
+def fetch_urls_playwright(
+    urls: Sequence[str], timeout: float = 10.0
+) -> list[tuple[str | None, str | None, Optional[int]]]:
+    """Render allowlisted URLs concurrently through the shared pool, in input order."""
+    if _async_playwright is None:
+        return [(None, "playwright_not_installed", None) for _ in urls]
+    allowed = [url for url in urls if is_allowlisted(extract_domain(url))]
+    rendered = iter(
+        get_browser_pool().fetch_many(
+            allowed, timeout, profiles=[profile_for_url(url) for url in allowed]
+        )
+    )
+    return [
+        next(rendered) if is_allowlisted(extract_domain(url)) else (None, "not_allowlisted", None)
+        for url in urls
+    ]
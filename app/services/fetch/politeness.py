@@ -0,0 +1,220 @@
+"""Per-domain politeness scheduling.
+
+Every domain gets its own token bucket, so a request to one site never
+waits behind another site's backlog. The refill rate is the configured
+per-domain rate, slowed down to the robots.txt ``Crawl-delay`` when the
+site asks for one. robots.txt is fetched once per domain and cached.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import logging
+import os
+import threading
+import time
+from typing import Callable, Iterable, TypeVar
+from urllib.robotparser import RobotFileParser
+
+from app.core.urls import bare_domain
+from app.services.fetch.http_client import DEFAULT_HEADERS, get_http_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE_PER_S = 2.0
+DEFAULT_BURST = 4
+DEFAULT_MAX_CRAWL_DELAY_S = 30.0
+DEFAULT_ROBOTS_TTL_S = 24 * 3600.0
+
+F = TypeVar("F", bound=Callable)
+
+
+def parse_crawl_delay(
+    robots_txt: str, user_agent: str = DEFAULT_HEADERS["User-Agent"]
+) -> float | None:
+    parser = RobotFileParser()
+    parser.parse(robots_txt.splitlines())
+    delay = parser.crawl_delay(user_agent)
+    return float(delay) if delay is not None else None
+
+
+def fetch_robots_txt(domain: str, timeout: float = 5.0) -> str | None:
+    try:
+        response = get_http_client().get(f"https://{domain}/robots.txt", timeout=timeout)
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("robots.txt fetch failed domain=%s error=%s", domain, exc)
+        return None
+    if response.status_code != 200:
+        return None
+    return response.text
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations instead of rejecting.
+
+    ``reserve`` always takes a token and returns how long the caller has to
+    wait before using it; tokens may go negative, which queues callers in
+    arrival order at the refill rate.
+    """
+
+    def __init__(
+        self,
+        rate_per_s: float,
+        burst: int,
+        time_fn: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate_per_s = rate_per_s
+        self.burst = burst
+        self._time = time_fn
+        self._tokens = float(burst)
+        self._updated = time_fn()
+
+    def reserve(self) -> float:
+        now = self._time()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate_per_s)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate_per_s
+
+
+@dataclass
+class PolitenessStats:
+    requests: int = 0
+    delayed: int = 0
+    waited_s: float = 0.0
+    crawl_delays: dict[str, float] = field(default_factory=dict)
+
+    def summary_line(self) -> str:
+        return (
+            f"politeness requests={self.requests} delayed={self.delayed} "
+            f"waited_s={self.waited_s:.2f} crawl_delay_domains={len(self.crawl_delays)}"
+        )
+
+
+class PolitenessScheduler:
+    def __init__(
+        self,
+        *,
+        rate_per_s: float = DEFAULT_RATE_PER_S,
+        burst: int = DEFAULT_BURST,
+        max_crawl_delay_s: float = DEFAULT_MAX_CRAWL_DELAY_S,
+        robots_ttl_s: float = DEFAULT_ROBOTS_TTL_S,
+        robots_fetcher: Callable[[str], str | None] | None = fetch_robots_txt,
+        time_fn: Callable[[], float] = time.monotonic,
+        sleep_fn: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate_per_s = rate_per_s
+        self.burst = burst
+        self.max_crawl_delay_s = max_crawl_delay_s
+        self.robots_ttl_s = robots_ttl_s
+        self.robots_fetcher = robots_fetcher
+        self.stats = PolitenessStats()
+        self._time = time_fn
+        self._sleep = sleep_fn
+        self._lock = threading.Lock()
+        self._buckets: dict[str, TokenBucket] = {}
+        self._robots: dict[str, tuple[float | None, float]] = {}
+        self._robots_locks: dict[str, threading.Lock] = {}
+
+    @classmethod
+    def from_env(cls) -> "PolitenessScheduler":
+        return cls(
+            rate_per_s=float(os.getenv("PLANZ_DOMAIN_RATE", str(DEFAULT_RATE_PER_S))),
+            burst=int(os.getenv("PLANZ_DOMAIN_BURST", str(DEFAULT_BURST))),
+            max_crawl_delay_s=float(
+                os.getenv("PLANZ_MAX_CRAWL_DELAY_S", str(DEFAULT_MAX_CRAWL_DELAY_S))
+            ),
+        )
+
+    def crawl_delay(self, domain: str) -> float | None:
+        """Return the (capped) robots.txt Crawl-delay for ``domain``, fetching it if needed."""
+        domain = bare_domain(domain)
+        with self._lock:
+            cached = self._robots.get(domain)
+            if cached is not None and self._time() - cached[1] < self.robots_ttl_s:
+                return cached[0]
+            domain_lock = self._robots_locks.setdefault(domain, threading.Lock())
+        with domain_lock:
+            with self._lock:
+                cached = self._robots.get(domain)
+                if cached is not None and self._time() - cached[1] < self.robots_ttl_s:
+                    return cached[0]
+            delay = None
+            robots_txt = self.robots_fetcher(domain) if self.robots_fetcher else None
+            if robots_txt:
+                delay = parse_crawl_delay(robots_txt)
+            if delay is not None and delay > self.max_crawl_delay_s:
+                logger.warning(
+                    "Capping robots.txt Crawl-delay domain=%s delay=%.1fs cap=%.1fs",
+                    domain,
+                    delay,
+                    self.max_crawl_delay_s,
+                )
+                delay = self.max_crawl_delay_s
+            with self._lock:
+                self._robots[domain] = (delay, self._time())
+                self._buckets.pop(domain, None)
+                if delay:
+                    self.stats.crawl_delays[domain] = delay
+            return delay
+
+    def prime(self, domains: Iterable[str]) -> None:
+        """Resolve robots.txt for ``domains`` up front, e.g. before an async batch."""
+        for domain in {bare_domain(domain) for domain in domains if domain}:
+            self.crawl_delay(domain)
+
+    def reserve(self, url_or_domain: str) -> float:
+        """Take a token for the URL's domain; return the seconds to wait before fetching."""
+        domain = bare_domain(url_or_domain)
+        delay = self.crawl_delay(domain)
+        with self._lock:
+            bucket = self._buckets.get(domain)
+            if bucket is None:
+                bucket = self._bucket_for(delay)
+                self._buckets[domain] = bucket
+            wait_s = bucket.reserve()
+            self.stats.requests += 1
+            if wait_s > 0:
+                self.stats.delayed += 1
+                self.stats.waited_s += wait_s
+        return wait_s
+
+    def wait(self, url_or_domain: str) -> None:
+        wait_s = self.reserve(url_or_domain)
+        if wait_s > 0:
+            self._sleep(wait_s)
+
+    async def wait_async(self, url_or_domain: str) -> None:
+        wait_s = self.reserve(url_or_domain)
+        if wait_s > 0:
+            await asyncio.sleep(wait_s)
+
+    def _bucket_for(self, crawl_delay: float | None) -> TokenBucket:
+        if crawl_delay:
+            # Crawl-delay means one request per interval, so no burst either.
+            return TokenBucket(min(self.rate_per_s, 1.0 / crawl_delay), 1, self._time)
+        return TokenBucket(self.rate_per_s, self.burst, self._time)
+
+
+_scheduler: PolitenessScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> PolitenessScheduler:
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = PolitenessScheduler.from_env()
+        return _scheduler
+
+
+def polite(fetch: F, scheduler: PolitenessScheduler | None = None) -> F:
+    """Wrap a URL-first fetch callable so each call waits for its domain's token."""
+
+    def _polite_fetch(url: str, *args, **kwargs):
+        (scheduler or get_scheduler()).wait(url)
+        return fetch(url, *args, **kwargs)
+
+    return _polite_fetch  # type: ignore[return-value]
@@ -0,0 +1,208 @@
+"""Render profiles for the Playwright fetcher.
+
+A profile decides which requests a page may make while rendering and when
+the DOM counts as ready. We only read ``page.content()``, so images, fonts,
+stylesheets and tracking scripts are pure overhead for most sources.
+Profiles are picked per URL: listing paths first, then the host.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import logging
+import os
+import re
+from time import monotonic
+from typing import Any
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+HEAVY_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+TRACKING_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "hotjar.com",
+    "etracker.com",
+    "etracker.de",
+    "usercentrics.eu",
+    "cookiebot.com",
+)
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    name: str
+    blocked_resource_types: frozenset[str] = frozenset()
+    blocked_hosts: tuple[str, ...] = ()
+    block_third_party: bool = False
+    wait_until: str = "networkidle"
+    wait_for_selector: str | None = None
+    # Cap on the selector wait, so a page without the selector costs this
+    # much extra rather than a second full fetch timeout.
+    selector_timeout_s: float = 5.0
+
+    @property
+    def intercepts(self) -> bool:
+        return bool(self.blocked_resource_types or self.blocked_hosts or self.block_third_party)
+
+
+@dataclass
+class RenderMetrics:
+    profile: str = ""
+    render_s: float = 0.0
+    requests: int = 0
+    blocked: int = 0
+    bytes_transferred: int = 0
+    _started: float = field(default=0.0, repr=False)
+
+    def start(self) -> None:
+        self._started = monotonic()
+
+    def stop(self) -> None:
+        self.render_s = monotonic() - self._started
+
+
+FULL = RenderProfile(name="full")
+LIGHT = RenderProfile(
+    name="light",
+    blocked_resource_types=HEAVY_RESOURCE_TYPES,
+    blocked_hosts=TRACKING_HOSTS,
+    wait_until="domcontentloaded",
+)
+MUENCHEN_LISTING = RenderProfile(
+    name="muenchen",
+    blocked_resource_types=HEAVY_RESOURCE_TYPES,
+    blocked_hosts=TRACKING_HOSTS,
+    block_third_party=True,
+    wait_until="domcontentloaded",
+    wait_for_selector=".m-event-list-item",
+)
+MUENCHEN_PAGE = RenderProfile(
+    name="muenchen_page",
+    blocked_resource_types=HEAVY_RESOURCE_TYPES,
+    blocked_hosts=TRACKING_HOSTS,
+    block_third_party=True,
+    wait_until="domcontentloaded",
+)
+
+PROFILES: dict[str, RenderProfile] = {
+    profile.name: profile for profile in (FULL, LIGHT, MUENCHEN_LISTING, MUENCHEN_PAGE)
+}
+DOMAIN_PROFILES: dict[str, str] = {
+    "muenchen.de": MUENCHEN_PAGE.name,
+    "www.muenchen.de": MUENCHEN_PAGE.name,
+}
+# Listing pages (``/veranstaltungen/event/kinder``, not ``.../event/456``
+# detail pages) are the only ones that render list items to wait for.
+_MUENCHEN_LISTING_PATH_RE = re.compile(r"^/veranstaltungen/event/[a-z-]+/?$")
+LISTING_PATH_PROFILES: dict[str, tuple[re.Pattern[str], str]] = {
+    host: (_MUENCHEN_LISTING_PATH_RE, MUENCHEN_LISTING.name)
+    for host in ("muenchen.de", "www.muenchen.de")
+}
+
+
+def get_profile(name: str) -> RenderProfile:
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown render profile: {name}") from None
+
+
+def profile_for_url(url: str) -> RenderProfile:
+    override = os.getenv("PLANZ_RENDER_PROFILE", "").strip()
+    if override:
+        return get_profile(override)
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    listing = LISTING_PATH_PROFILES.get(host)
+    if listing is not None and listing[0].match(parsed.path or "/"):
+        return PROFILES[listing[1]]
+    return PROFILES[DOMAIN_PROFILES.get(host, FULL.name)]
+
+
+def _host_matches(host: str, suffixes: tuple[str, ...]) -> bool:
+    return any(host == suffix or host.endswith(f".{suffix}") for suffix in suffixes)
+
+
+def _site_of(host: str) -> str:
+    parts = host.split(".")
+    return ".".join(parts[-2:]) if len(parts) >= 2 else host
+
+
+def should_block(
+    profile: RenderProfile,
+    resource_type: str,
+    request_url: str,
+    page_url: str,
+) -> bool:
+    if resource_type == "document":
+        return False
+    if resource_type in profile.blocked_resource_types:
+        return True
+    host = (urlparse(request_url).hostname or "").lower()
+    if _host_matches(host, profile.blocked_hosts):
+        return True
+    if profile.block_third_party:
+        page_host = (urlparse(page_url).hostname or "").lower()
+        return _site_of(host) != _site_of(page_host)
+    return False
+
+
+async def apply_profile(
+    page: Any,
+    profile: RenderProfile,
+    page_url: str,
+    metrics: RenderMetrics | None = None,
+) -> None:
+    """Install request interception and transfer accounting for ``profile`` on ``page``."""
+    if metrics is not None:
+        metrics.profile = profile.name
+
+        def _on_response(response: Any) -> None:
+            metrics.requests += 1
+
+        async def _on_request_finished(request: Any) -> None:
+            # Content-Length is absent on chunked responses; sizes() reports
+            # the (encoded) bytes actually received.
+            try:
+                sizes = await request.sizes()
+            except Exception:  # noqa: BLE001
+                return  # the page closed before the sizes were read
+            metrics.bytes_transferred += max(sizes.get("responseBodySize", 0), 0) + max(
+                sizes.get("responseHeadersSize", 0), 0
+            )
+
+        page.on("response", _on_response)
+        page.on("requestfinished", _on_request_finished)
+
+    if not profile.intercepts:
+        return
+
+    async def _route(route: Any) -> None:
+        request = route.request
+        if should_block(profile, request.resource_type, request.url, page_url):
+            if metrics is not None:
+                metrics.blocked += 1
+            await route.abort()
+            return
+        await route.continue_()
+
+    await page.route("**/*", _route)
+
+
+async def wait_until_ready(page: Any, profile: RenderProfile, timeout: float) -> None:
+    if not profile.wait_for_selector:
+        return
+    wait_s = min(timeout, profile.selector_timeout_s)
+    try:
+        await page.wait_for_selector(profile.wait_for_selector, timeout=wait_s * 1000)
+    except Exception:  # noqa: BLE001
+        # Empty listings never show the selector; the loaded DOM is still usable.
+        logger.debug(
+            "Selector %s not found within %.1fs; using DOM as loaded",
+            profile.wait_for_selector,
+            wait_s,
+        )
@@ -0,0 +1,100 @@
+"""Adaptive revisit planning for source URLs.
+
+Each fetch of a source is an observation: did the content change since the
+previous fetch? From the number of checks, the number of detected changes
+and the time covered we estimate the source's change rate (Poisson model,
+using the bias-reduced estimator of Cho & Garcia-Molina, which accounts
+for several changes between two fetches looking like one) and schedule the
+next fetch after the expected time to the next change, clamped to
+``[min_interval_s, max_interval_s]``.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import math
+import os
+
+from app.db.models.source_url import SourceUrl
+
+DEFAULT_MIN_INTERVAL_S = 6 * 3600.0
+DEFAULT_MAX_INTERVAL_S = 14 * 24 * 3600.0
+DEFAULT_INTERVAL_S = 24 * 3600.0
+MIN_OBSERVATIONS = 3
+
+
+@dataclass(frozen=True)
+class RevisitPolicy:
+    min_interval_s: float = DEFAULT_MIN_INTERVAL_S
+    max_interval_s: float = DEFAULT_MAX_INTERVAL_S
+    default_interval_s: float = DEFAULT_INTERVAL_S
+
+    @classmethod
+    def from_env(cls) -> "RevisitPolicy":
+        return cls(
+            min_interval_s=float(
+                os.getenv("PLANZ_REVISIT_MIN_S", str(DEFAULT_MIN_INTERVAL_S))
+            ),
+            max_interval_s=float(
+                os.getenv("PLANZ_REVISIT_MAX_S", str(DEFAULT_MAX_INTERVAL_S))
+            ),
+            default_interval_s=float(
+                os.getenv("PLANZ_REVISIT_DEFAULT_S", str(DEFAULT_INTERVAL_S))
+            ),
+        )
+
+    def interval_for(self, source_url: SourceUrl) -> float:
+        checks = source_url.revisit_checks or 0
+        if checks < MIN_OBSERVATIONS:
+            interval = self.default_interval_s
+        else:
+            rate = estimate_change_rate(
+                checks, source_url.revisit_changes or 0, source_url.revisit_observed_s or 0.0
+            )
+            interval = self.max_interval_s if not rate else 1.0 / rate
+        return min(max(interval, self.min_interval_s), self.max_interval_s)
+
+
+def estimate_change_rate(checks: int, changes: int, observed_s: float) -> float | None:
+    """Estimated changes per second, or None without usable observations."""
+    if checks <= 0 or observed_s <= 0:
+        return None
+    changes = min(changes, checks)
+    mean_interval = observed_s / checks
+    return -math.log((checks - changes + 0.5) / (checks + 0.5)) / mean_interval
+
+
+def _aware(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def is_due(source_url: SourceUrl, now: datetime) -> bool:
+    if source_url.next_fetch_at is None or source_url.fetch_status != "ok":
+        return True
+    return _aware(source_url.next_fetch_at) <= now
+
+
+def record_observation(
+    source_url: SourceUrl,
+    *,
+    changed: bool,
+    now: datetime,
+    policy: RevisitPolicy,
+) -> None:
+    """Fold one successful fetch into the change history and reschedule.
+
+    Must run before ``last_fetched_at`` is moved to ``now``. The first fetch
+    of a source only sets a baseline: there is nothing to compare it with.
+    """
+    previous = source_url.last_fetched_at
+    has_baseline = previous is not None and source_url.content_hash is not None
+    if has_baseline:
+        elapsed = (now - _aware(previous)).total_seconds()
+        if elapsed > 0:
+            source_url.revisit_checks = (source_url.revisit_checks or 0) + 1
+            source_url.revisit_observed_s = (source_url.revisit_observed_s or 0.0) + elapsed
+            if changed:
+                source_url.revisit_changes = (source_url.revisit_changes or 0) + 1
+    if changed and has_baseline:
+        source_url.last_changed_at = now
+    source_url.next_fetch_at = now + timedelta(seconds=policy.interval_for(source_url))
@@ -4,6 +4,14 @@ import hashlib
 from datetime import datetime
 
 from app.db.models.source_url import SourceUrl
+from app.services.extract.chunked_extractor import max_text_chars
+from app.services.extract.html_to_text import HtmlToText
+from app.services.fetch.revisit import RevisitPolicy, record_observation
+
+
+def _source_text(text: str) -> str:
+    """Cleaned page text, one block per line, as much as the chunked extractor reads."""
+    return HtmlToText(max_chars=max_text_chars(), blocks=True).extract(text)
 
 
 def store_fetch_result(
@@ -12,12 +20,54 @@ def store_fetch_result(
     text: str | None,
     error: str | None,
     now: datetime,
+    *,
+    not_modified: bool = False,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    revisit: RevisitPolicy | None = None,
+    content_hash: str | None = None,
+    bytes_read: int | None = None,
+    truncated: str | None = None,
 ) -> None:
+    """Record a fetch outcome on ``source_url``.
+
+    Streaming fetchers pass the ``content_hash`` they computed over the raw
+    body along with ``bytes_read`` and the ``truncated`` reason, if any.
+    Those describe the stored body, so a 304 or an error keeps them. The
+    cleaned ``content_text`` is only rebuilt when the content hash changed.
+    """
+    if not_modified:
+        if revisit is not None:
+            record_observation(source_url, changed=False, now=now, policy=revisit)
+        # 304: the stored body and content_hash are still current.
+        source_url.fetch_status = "ok"
+        source_url.last_fetched_at = now
+        source_url.error_message = None
+        if etag:
+            source_url.etag = etag
+        if last_modified:
+            source_url.last_modified = last_modified
+        session.add(source_url)
+        return
+
     if text is not None:
+        encoded = text.encode("utf-8")
+        if content_hash is None:
+            content_hash = hashlib.sha256(encoded).hexdigest()
+        changed = content_hash != source_url.content_hash
+        if revisit is not None:
+            record_observation(source_url, changed=changed, now=now, policy=revisit)
+        if changed or source_url.content_text is None:
+            source_url.content_text = _source_text(text)
         source_url.fetch_status = "ok"
         source_url.last_fetched_at = now
-        source_url.content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        source_url.bytes_read = bytes_read
+        source_url.truncated_reason = truncated
+        source_url.content_hash = content_hash
         source_url.content_excerpt = text[:2000]
+        source_url.content_length = bytes_read if bytes_read is not None else len(encoded)
+        source_url.etag = etag
+        source_url.last_modified = last_modified
         source_url.error_message = None
         session.add(source_url)
         return
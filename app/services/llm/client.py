@@ -3,18 +3,17 @@ import logging
 import os
 from typing import Any
 
-from openai import OpenAI
+from app.services.llm.gateway import complete_text
+from app.services.llm.response_cache import is_json_object
 
 logger = logging.getLogger(__name__)
 
 MODEL_NAME = "gpt-4o-mini"
 
 
-def _get_client() -> OpenAI:
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
+def _require_api_key() -> None:
+    if not os.getenv("OPENAI_API_KEY"):
         raise EnvironmentError("OPENAI_API_KEY is not set")
-    return OpenAI(api_key=api_key)
 
 
 def _parse_json(content: str) -> dict[str, Any] | None:
@@ -25,7 +24,7 @@ def _parse_json(content: str) -> dict[str, Any] | None:
 
 
 def generate_kids_events_munich() -> list[dict[str, Any]]:
-    client = _get_client()
+    _require_api_key()
     prompt = (
         "Return STRICT JSON only. Output a JSON object with a single key `events` "
         "containing 3 to 6 realistic kids/family events in Munich within the next 14 days. "
@@ -34,7 +33,10 @@ def generate_kids_events_munich() -> list[dict[str, Any]]:
         "Use ISO 8601 with timezone Europe/Berlin for start_time and end_time."
     )
 
-    response = client.chat.completions.create(
+    content = complete_text(
+        "generate_kids_events_munich",
+        accept=is_json_object,
+        cache=False,  # constant prompt: a cached answer would go stale
         model=MODEL_NAME,
         messages=[
             {"role": "system", "content": "You return JSON only."},
@@ -43,9 +45,7 @@ def generate_kids_events_munich() -> list[dict[str, Any]]:
         response_format={"type": "json_object"},
         temperature=0.4,
     )
-
-    content = response.choices[0].message.content or "{}"
-    data = _parse_json(content)
+    data = _parse_json(content or "{}")
     if data is None:
         logger.error("LLM returned invalid JSON")
         return []
@@ -58,7 +58,7 @@ def generate_kids_events_munich() -> list[dict[str, Any]]:
 
 
 def discover_munich_kids_event_sources() -> list[dict[str, Any]]:
-    client = _get_client()
+    _require_api_key()
     prompt = (
         "Return STRICT JSON only. Output a JSON object with a single key `sources` "
         "containing 15 to 25 candidate source URLs for kids/family events in Munich. "
@@ -70,7 +70,10 @@ def discover_munich_kids_event_sources() -> list[dict[str, Any]]:
         "JSON only, no markdown."
     )
 
-    response = client.chat.completions.create(
+    content = complete_text(
+        "discover_munich_kids_event_sources",
+        accept=is_json_object,
+        cache=False,  # constant prompt: a cached answer would go stale
         model=MODEL_NAME,
         messages=[
             {"role": "system", "content": "You return JSON only."},
@@ -79,15 +82,16 @@ def discover_munich_kids_event_sources() -> list[dict[str, Any]]:
         response_format={"type": "json_object"},
         temperature=0.4,
     )
-
-    content = response.choices[0].message.content or "{}"
-    data = _parse_json(content)
+    data = _parse_json(content or "{}")
     if data is None:
         repair_prompt = (
             "Return valid JSON only. Fix this into a JSON object with a `sources` list:\n"
             f"{content}"
         )
-        repair_response = client.chat.completions.create(
+        repaired = complete_text(
+            "discover_munich_kids_event_sources",
+            accept=is_json_object,
+            cache=False,
             model=MODEL_NAME,
             messages=[
                 {"role": "system", "content": "You return JSON only."},
@@ -96,8 +100,7 @@ def discover_munich_kids_event_sources() -> list[dict[str, Any]]:
             response_format={"type": "json_object"},
             temperature=0.0,
         )
-        repaired = repair_response.choices[0].message.content or "{}"
-        data = _parse_json(repaired)
+        data = _parse_json(repaired or "{}")
 
     if data is None:
         logger.error("LLM returned invalid JSON for sources")
@@ -0,0 +1,531 @@
+"""Single entry point for OpenAI chat completions.
+
+Every LLM call site goes through the process-wide gateway, which provides:
+
+- one pooled ``OpenAI`` client (and one ``AsyncOpenAI`` per event loop),
+  whose HTTP transport goes through the active cassette;
+- retries with full-jitter exponential backoff on 429, 5xx and connection
+  errors, honouring ``Retry-After``;
+- an AIMD concurrency limit: it grows by about one slot per window of
+  successful calls and halves on a 429, between ``PLANZ_LLM_MIN_CONCURRENCY``
+  and ``PLANZ_LLM_MAX_CONCURRENCY``;
+- per-call-site counters for calls, errors, retries, tokens, estimated
+  cost and latency, rolled up into pipeline stages by ``stage_stats``.
+
+``complete_text`` and ``acomplete_text`` also consult the LLM response
+cache, see ``app.services.llm.response_cache``.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import logging
+import math
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Iterator
+import weakref
+
+import httpx
+import openai
+from openai import AsyncOpenAI, OpenAI
+
+from app.services.fetch.cassette import (
+    CassetteMiss,
+    active_cassette,
+    wrap_async_transport,
+    wrap_transport,
+)
+from app.services.llm.response_cache import cache_lookup, cache_store
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BACKOFF_BASE_S = 0.5
+DEFAULT_BACKOFF_MAX_S = 30.0
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_MIN_CONCURRENCY = 1
+_DECREASE_COOLDOWN_S = 1.0
+_CLIENT_TIMEOUT_S = 600.0
+
+# Pipeline stage each call site's usage is attributed to; others count as "other".
+CALL_SITE_STAGES = {
+    "extract_events_from_text": "listing_extraction",
+    "summarize_event_page": "detail_summarization",
+    "summarize_event_detail": "detail_summarization",
+    "backfill_categories": "categorization",
+    "discover_munich_kids_event_sources": "discovery",
+    "generate_kids_events_munich": "discovery",
+}
+# USD per million (prompt, completion) tokens at list price; unknown models cost 0.
+MODEL_PRICES_PER_M = {
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-5.1": (1.25, 10.00),
+}
+
+
+@dataclass(frozen=True)
+class GatewayConfig:
+    max_retries: int = DEFAULT_MAX_RETRIES
+    backoff_base_s: float = DEFAULT_BACKOFF_BASE_S
+    backoff_max_s: float = DEFAULT_BACKOFF_MAX_S
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    min_concurrency: int = DEFAULT_MIN_CONCURRENCY
+
+    @classmethod
+    def from_env(cls) -> "GatewayConfig":
+        return cls(
+            max_retries=int(os.getenv("PLANZ_LLM_MAX_RETRIES", str(DEFAULT_MAX_RETRIES))),
+            backoff_base_s=float(
+                os.getenv("PLANZ_LLM_BACKOFF_BASE_S", str(DEFAULT_BACKOFF_BASE_S))
+            ),
+            backoff_max_s=float(os.getenv("PLANZ_LLM_BACKOFF_MAX_S", str(DEFAULT_BACKOFF_MAX_S))),
+            max_concurrency=int(
+                os.getenv("PLANZ_LLM_MAX_CONCURRENCY", str(DEFAULT_MAX_CONCURRENCY))
+            ),
+            min_concurrency=int(
+                os.getenv("PLANZ_LLM_MIN_CONCURRENCY", str(DEFAULT_MIN_CONCURRENCY))
+            ),
+        )
+
+
+@dataclass
+class CallSiteStats:
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+    latencies_s: list[float] = field(default_factory=list)
+
+    def merge(self, other: "CallSiteStats") -> None:
+        self.calls += other.calls
+        self.errors += other.errors
+        self.retries += other.retries
+        self.rate_limited += other.rate_limited
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.cost_usd += other.cost_usd
+        self.latencies_s.extend(other.latencies_s)
+
+    def latency_percentile(self, percentile: float) -> float:
+        """Nearest-rank percentile of successful call latencies, 0.0 without calls."""
+        if not self.latencies_s:
+            return 0.0
+        ordered = sorted(self.latencies_s)
+        rank = max(math.ceil(percentile / 100 * len(ordered)), 1)
+        return ordered[rank - 1]
+
+    def summary_line(self, call_site: str) -> str:
+        return (
+            f"llm {call_site} calls={self.calls} errors={self.errors} retries={self.retries} "
+            f"rate_limited={self.rate_limited} prompt_tokens={self.prompt_tokens} "
+            f"completion_tokens={self.completion_tokens} cost=${self.cost_usd:.4f} "
+            f"p50={self.latency_percentile(50):.2f}s p95={self.latency_percentile(95):.2f}s"
+        )
+
+
+class AimdLimiter:
+    """Concurrency limit with additive increase and multiplicative decrease."""
+
+    def __init__(self, max_limit: int, min_limit: int = 1, time_fn=time.monotonic) -> None:
+        self.max_limit = max(max_limit, 1)
+        self.min_limit = max(min(min_limit, self.max_limit), 1)
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self._time = time_fn
+        self._last_decrease = -math.inf
+        self._cond = threading.Condition()
+        # Coroutines waiting for a slot, woken on their own loop by release().
+        self._async_waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def try_acquire(self) -> bool:
+        with self._cond:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return True
+            return False
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    async def acquire_async(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await waiter
+            finally:
+                with self._cond:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+
+    def release(self, *, throttled: bool = False) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                # One 429 burst from many concurrent calls counts as one signal.
+                now = self._time()
+                if now - self._last_decrease >= _DECREASE_COOLDOWN_S:
+                    self.limit = max(self.limit / 2, float(self.min_limit))
+                    self._last_decrease = now
+            else:
+                self.limit = min(self.limit + 1 / self.limit, float(self.max_limit))
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, waiter in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_wake, waiter)
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+def _is_rate_limit(exc: BaseException) -> bool:
+    return isinstance(exc, openai.APIStatusError) and exc.status_code == 429
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code == 429 or exc.status_code >= 500
+    if isinstance(exc, openai.APIConnectionError):
+        # A replay cassette miss will miss again.
+        return not isinstance(exc.__cause__, CassetteMiss)
+    return False
+
+
+def _retry_after_s(exc: BaseException) -> float | None:
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    value = response.headers.get("retry-after")
+    try:
+        return max(float(value), 0.0) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _usage_tokens(response: Any) -> tuple[int, int]:
+    usage = getattr(response, "usage", None)
+    prompt = getattr(usage, "prompt_tokens", 0)
+    completion = getattr(usage, "completion_tokens", 0)
+    return (
+        prompt if isinstance(prompt, int) else 0,
+        completion if isinstance(completion, int) else 0,
+    )
+
+
+def stage_of(call_site: str) -> str:
+    return CALL_SITE_STAGES.get(call_site, "other")
+
+
+def estimate_cost_usd(model: str | None, prompt_tokens: int, completion_tokens: int) -> float:
+    prompt_price, completion_price = MODEL_PRICES_PER_M.get(model or "", (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+def _response_content(response: Any) -> str:
+    return response.choices[0].message.content or ""
+
+
+class LlmGateway:
+    def __init__(
+        self,
+        config: GatewayConfig | None = None,
+        *,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.config = config or GatewayConfig.from_env()
+        self.limiter = AimdLimiter(self.config.max_concurrency, self.config.min_concurrency)
+        self.stats: dict[str, CallSiteStats] = defaultdict(CallSiteStats)
+        self._sleep = sleep
+        self._lock = threading.RLock()
+        self._client: OpenAI | None = None
+        self._client_cassette: Any = None
+        # Calls in flight per sync client; a replaced client is closed by its last call.
+        self._leases: dict[Any, int] = {}
+        self._retired: set[Any] = set()
+        self._async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    # Clients
+
+    def client(self) -> OpenAI:
+        """The pooled sync client, rebuilt when the active cassette changes."""
+        cassette = active_cassette()
+        with self._lock:
+            if self._client is None or self._client_cassette is not cassette:
+                if self._client is not None:
+                    self._retire(self._client)
+                self._client = OpenAI(
+                    api_key=os.getenv("OPENAI_API_KEY"),
+                    max_retries=0,
+                    http_client=httpx.Client(
+                        transport=wrap_transport(httpx.HTTPTransport()),
+                        timeout=_CLIENT_TIMEOUT_S,
+                    ),
+                )
+                self._client_cassette = cassette
+            return self._client
+
+    @contextmanager
+    def _client_lease(self) -> Iterator[OpenAI]:
+        """The pooled sync client, kept open until the caller is done with it."""
+        with self._lock:
+            client = self.client()
+            self._leases[client] = self._leases.get(client, 0) + 1
+        try:
+            yield client
+        finally:
+            self._release_client(client)
+
+    def _release_client(self, client: OpenAI) -> None:
+        with self._lock:
+            self._leases[client] -= 1
+            if self._leases[client]:
+                return
+            del self._leases[client]
+            if client not in self._retired:
+                return
+            self._retired.discard(client)
+        client.close()
+
+    def _retire(self, client: OpenAI) -> None:
+        """Close ``client`` now, or once its calls in flight finish; caller holds the lock."""
+        if self._leases.get(client):
+            self._retired.add(client)
+        else:
+            client.close()
+
+    def async_client(self) -> AsyncOpenAI:
+        """The pooled async client of the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = AsyncOpenAI(
+                    api_key=os.getenv("OPENAI_API_KEY"),
+                    max_retries=0,
+                    http_client=httpx.AsyncClient(
+                        transport=wrap_async_transport(httpx.AsyncHTTPTransport()),
+                        timeout=_CLIENT_TIMEOUT_S,
+                    ),
+                )
+                self._async_clients[loop] = client
+            return client
+
+    def close(self) -> None:
+        """Close the pooled clients; async ones only if their loop still exists.
+
+        The sync client is closed once the calls using it finish.
+        """
+        with self._lock:
+            client, self._client = self._client, None
+            if client is not None:
+                self._retire(client)
+            async_clients = list(self._async_clients.items())
+            self._async_clients = weakref.WeakKeyDictionary()
+        for loop, async_client in async_clients:
+            if loop.is_closed():
+                continue  # its connections went with the loop
+            if loop.is_running():
+                asyncio.run_coroutine_threadsafe(async_client.close(), loop)
+            else:
+                loop.run_until_complete(async_client.close())
+
+    # Calls
+
+    def complete(self, call_site: str, **kwargs: Any) -> Any:
+        """``chat.completions.create(**kwargs)`` with retries and the concurrency limit."""
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            started = time.monotonic()
+            try:
+                with self._client_lease() as client:
+                    response = client.chat.completions.create(**kwargs)
+            except Exception as exc:
+                delay = self._on_error(call_site, exc, attempt)
+                if delay is None:
+                    raise
+            else:
+                elapsed_s = time.monotonic() - started
+                self._on_success(call_site, kwargs.get("model"), response, elapsed_s)
+                return response
+            attempt += 1
+            self._sleep(delay)
+
+    async def acomplete(self, call_site: str, **kwargs: Any) -> Any:
+        attempt = 0
+        while True:
+            await self.limiter.acquire_async()
+            started = time.monotonic()
+            try:
+                response = await self.async_client().chat.completions.create(**kwargs)
+            except Exception as exc:
+                delay = self._on_error(call_site, exc, attempt)
+                if delay is None:
+                    raise
+            else:
+                elapsed_s = time.monotonic() - started
+                self._on_success(call_site, kwargs.get("model"), response, elapsed_s)
+                return response
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def complete_text(
+        self,
+        call_site: str,
+        *,
+        accept: Callable[[str], bool] | None = None,
+        cache: bool = True,
+        **kwargs: Any,
+    ) -> str:
+        """Response content, served from the LLM response cache when possible.
+
+        Prompts without input (``cache=False``) must be answered afresh
+        every run; a cached answer would replay stale events.
+        """
+        content = cache_lookup(call_site, kwargs) if cache else None
+        if content is None:
+            content = _response_content(self.complete(call_site, **kwargs))
+            if cache:
+                cache_store(call_site, kwargs, content, accept)
+        return content
+
+    async def acomplete_text(
+        self,
+        call_site: str,
+        *,
+        accept: Callable[[str], bool] | None = None,
+        cache: bool = True,
+        **kwargs: Any,
+    ) -> str:
+        content = cache_lookup(call_site, kwargs) if cache else None
+        if content is None:
+            content = _response_content(await self.acomplete(call_site, **kwargs))
+            if cache:
+                cache_store(call_site, kwargs, content, accept)
+        return content
+
+    def summary_lines(self) -> list[str]:
+        with self._lock:
+            return [
+                stats.summary_line(call_site) for call_site, stats in sorted(self.stats.items())
+            ]
+
+    def stage_stats(self) -> dict[str, CallSiteStats]:
+        """Call-site counters summed per pipeline stage (``CALL_SITE_STAGES``)."""
+        stages: dict[str, CallSiteStats] = defaultdict(CallSiteStats)
+        with self._lock:
+            for call_site, stats in self.stats.items():
+                stages[stage_of(call_site)].merge(stats)
+        return dict(sorted(stages.items()))
+
+    def totals(self) -> CallSiteStats:
+        total = CallSiteStats()
+        for stats in self.stage_stats().values():
+            total.merge(stats)
+        return total
+
+    def _on_success(
+        self, call_site: str, model: str | None, response: Any, elapsed_s: float
+    ) -> None:
+        self.limiter.release()
+        prompt_tokens, completion_tokens = _usage_tokens(response)
+        with self._lock:
+            stats = self.stats[call_site]
+            stats.calls += 1
+            stats.prompt_tokens += prompt_tokens
+            stats.completion_tokens += completion_tokens
+            stats.cost_usd += estimate_cost_usd(model, prompt_tokens, completion_tokens)
+            stats.latencies_s.append(elapsed_s)
+
+    def _on_error(self, call_site: str, exc: BaseException, attempt: int) -> float | None:
+        """Release the slot and count the error; the backoff delay, or None to give up."""
+        rate_limited = _is_rate_limit(exc)
+        self.limiter.release(throttled=rate_limited)
+        retry = _is_retryable(exc) and attempt < self.config.max_retries
+        with self._lock:
+            stats = self.stats[call_site]
+            stats.rate_limited += int(rate_limited)
+            if retry:
+                stats.retries += 1
+            else:
+                stats.calls += 1
+                stats.errors += 1
+        if not retry:
+            return None
+        ceiling = min(self.config.backoff_max_s, self.config.backoff_base_s * 2**attempt)
+        delay = _retry_after_s(exc)
+        if delay is None:
+            delay = random.uniform(0, ceiling)
+        else:
+            # A bogus Retry-After must not park a worker indefinitely.
+            delay = min(delay, self.config.backoff_max_s)
+        logger.warning(
+            "LLM call %s failed (%s); retry %s/%s in %.1fs",
+            call_site,
+            type(exc).__name__,
+            attempt + 1,
+            self.config.max_retries,
+            delay,
+        )
+        return delay
+
+
+_gateway: LlmGateway | None = None
+_gateway_lock = threading.Lock()
+
+
+def llm_gateway() -> LlmGateway:
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LlmGateway()
+        return _gateway
+
+
+def reset_llm_gateway() -> None:
+    """Close and drop the process-wide gateway, its clients and counters."""
+    global _gateway
+    with _gateway_lock:
+        gateway, _gateway = _gateway, None
+    if gateway is not None:
+        gateway.close()
+
+
+def complete_text(
+    call_site: str,
+    *,
+    accept: Callable[[str], bool] | None = None,
+    cache: bool = True,
+    **kwargs: Any,
+) -> str:
+    return llm_gateway().complete_text(call_site, accept=accept, cache=cache, **kwargs)
+
+
+async def acomplete_text(
+    call_site: str,
+    *,
+    accept: Callable[[str], bool] | None = None,
+    cache: bool = True,
+    **kwargs: Any,
+) -> str:
+    return await llm_gateway().acomplete_text(call_site, accept=accept, cache=cache, **kwargs)
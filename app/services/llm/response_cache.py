@@ -0,0 +1,218 @@
+"""Persistent cache for LLM chat completions.
+
+A completion is keyed by a hash of everything that determines it: the
+model, the messages (system and user prompts including the input text)
+and the sampling parameters. Only the response content is stored, in a
+single SQLite file, together with the call site that produced it. Entries
+older than the TTL are misses. Once the stored content exceeds its byte
+budget, the least recently used entries are evicted.
+
+``use`` reads and writes the cache. ``refresh`` skips reads but stores new
+responses. ``off`` bypasses it. Scripts activate the process-wide cache
+with ``configure_llm_cache``; without it every call goes to the API. The
+LLM gateway consults it for every call.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_MODES = ("use", "refresh", "off")
+DEFAULT_LLM_CACHE_PATH = "./data/llm_cache.sqlite"
+DEFAULT_TTL_S = 30 * 24 * 3600.0
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def completion_key(kwargs: dict[str, Any]) -> str:
+    """Hash of the ``chat.completions.create`` arguments."""
+    canonical = json.dumps(kwargs, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CallSiteStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+
+
+class LlmResponseCache:
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        mode: str = "use",
+        ttl_s: float = DEFAULT_TTL_S,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        time_fn: Callable[[], float] = time.time,
+    ) -> None:
+        if mode not in ("use", "refresh"):
+            raise ValueError(f"Unknown LLM cache mode: {mode}")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.mode = mode
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.stats: dict[str, CallSiteStats] = defaultdict(CallSiteStats)
+        self._time = time_fn
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, call_site TEXT NOT NULL, content TEXT NOT NULL, "
+            "size INTEGER NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_responses_accessed_at ON responses(accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, call_site: str, key: str) -> str | None:
+        now = self._time()
+        with self._lock:
+            stats = self.stats[call_site]
+            if self.mode == "refresh":
+                stats.misses += 1
+                return None
+            row = self._conn.execute(
+                "SELECT content, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] >= self.ttl_s:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                stats.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            stats.hits += 1
+            return row[0]
+
+    def put(self, call_site: str, key: str, content: str) -> None:
+        now = self._time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, call_site, content, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, call_site, content, len(content.encode("utf-8")), now, now),
+            )
+            self.stats[call_site].stores += 1
+            self._evict()
+            self._conn.commit()
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._total_bytes()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def summary_line(self) -> str:
+        with self._lock:
+            sites = " ".join(
+                f"{site}={stats.hits}/{stats.hits + stats.misses}"
+                for site, stats in sorted(self.stats.items())
+            )
+            hits = sum(stats.hits for stats in self.stats.values())
+            misses = sum(stats.misses for stats in self.stats.values())
+        return (
+            f"llm_cache mode={self.mode} hits={hits} misses={misses}"
+            + (f" by_site(hits/calls) {sites}" if sites else "")
+        )
+
+    def _total_bytes(self) -> int:
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return int(row[0])
+
+    def _evict(self) -> None:
+        total = self._total_bytes()
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            logger.debug("Evicted LLM cache entry key=%s", key)
+
+
+_active: LlmResponseCache | None = None
+_active_lock = threading.Lock()
+
+
+def configure_llm_cache(mode: str | None = None, path: str | None = None) -> LlmResponseCache | None:
+    """Activate (or with ``off`` deactivate) the process-wide LLM response cache.
+
+    Unset arguments fall back to PLANZ_LLM_CACHE (default ``use``),
+    PLANZ_LLM_CACHE_PATH, PLANZ_LLM_CACHE_TTL_S and PLANZ_LLM_CACHE_MAX_BYTES.
+    """
+    global _active
+    mode = mode or os.getenv("PLANZ_LLM_CACHE", "use").strip().lower() or "use"
+    if mode not in LLM_CACHE_MODES:
+        raise ValueError(f"Unknown LLM cache mode: {mode}")
+    with _active_lock:
+        if _active is not None:
+            _active.close()
+            _active = None
+        if mode == "off":
+            return None
+        _active = LlmResponseCache(
+            path or os.getenv("PLANZ_LLM_CACHE_PATH", DEFAULT_LLM_CACHE_PATH),
+            mode=mode,
+            ttl_s=float(os.getenv("PLANZ_LLM_CACHE_TTL_S", str(DEFAULT_TTL_S))),
+            max_bytes=int(os.getenv("PLANZ_LLM_CACHE_MAX_BYTES", str(DEFAULT_MAX_BYTES))),
+        )
+        logger.info("LLM response cache %s at %s", mode, _active.path)
+        return _active
+
+
+def active_llm_cache() -> LlmResponseCache | None:
+    return _active
+
+
+def cache_lookup(call_site: str, kwargs: dict[str, Any]) -> str | None:
+    """Cached content for these ``chat.completions.create`` arguments, if any."""
+    cache = active_llm_cache()
+    if cache is None:
+        return None
+    return cache.get(call_site, completion_key(kwargs))
+
+
+def cache_store(
+    call_site: str,
+    kwargs: dict[str, Any],
+    content: str,
+    accept: Callable[[str], bool] | None = None,
+) -> None:
+    """Store ``content`` if ``accept`` approves it (default: any non-empty content).
+
+    Rejecting malformed responses means they are retried on the next run
+    instead of replayed.
+    """
+    cache = active_llm_cache()
+    if cache is None or not content or (accept is not None and not accept(content)):
+        return
+    cache.put(call_site, completion_key(kwargs), content)
+
+
+def is_json_object(content: str) -> bool:
+    try:
+        return isinstance(json.loads(content), dict)
+    except json.JSONDecodeError:
+        return False
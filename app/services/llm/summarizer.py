@@ -2,15 +2,15 @@ from __future__ import annotations
 
 import json
 import logging
-import os
 from dataclasses import dataclass
 
-from openai import OpenAI
+from app.services.llm.gateway import complete_text
+from app.services.llm.response_cache import is_json_object
 
 logger = logging.getLogger(__name__)
 
 _MODEL = "gpt-4.1-nano"
-_MAX_INPUT_CHARS = 4000
+MAX_INPUT_CHARS = 4000
 _SYSTEM_PROMPT = (
     "You are a helpful assistant for parents in Munich. "
     "Return a JSON object with exactly four fields:\n"
@@ -47,12 +47,12 @@ def summarize_event_page(text: str) -> EventPageSummary | None:
     if not text:
         return None
 
-    truncated = text[:_MAX_INPUT_CHARS]
-    api_key = os.getenv("OPENAI_API_KEY")
-    client = OpenAI(api_key=api_key)
+    truncated = text[:MAX_INPUT_CHARS]
 
     try:
-        response = client.chat.completions.create(
+        raw = complete_text(
+            "summarize_event_page",
+            accept=is_json_object,
             model=_MODEL,
             messages=[
                 {"role": "system", "content": _SYSTEM_PROMPT},
@@ -62,7 +62,6 @@ def summarize_event_page(text: str) -> EventPageSummary | None:
             temperature=0.3,
             response_format={"type": "json_object"},
         )
-        raw = response.choices[0].message.content
         data = json.loads(raw)
         summary = data.get("summary")
         if not isinstance(summary, str) or not summary.strip():
@@ -0,0 +1,71 @@
+"""Per-run LLM usage, persisted per pipeline stage.
+
+The gateway counts calls, tokens, estimated cost and latency per call
+site. At the end of a run a script stores those counters rolled up into
+stages, one ``LlmStageUsage`` row per stage that made calls, so token
+spend can be compared across runs.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from uuid import UUID, uuid4
+
+from sqlalchemy.orm import Session
+
+from app.db.models.llm_stage_usage import LlmStageUsage
+from app.services.llm.gateway import LlmGateway, llm_gateway
+
+logger = logging.getLogger(__name__)
+
+
+def record_llm_usage(
+    session: Session,
+    script: str,
+    started_at: datetime,
+    *,
+    gateway: LlmGateway | None = None,
+    run_id: UUID | None = None,
+) -> list[LlmStageUsage]:
+    """Add one row per stage with calls to ``session``; the caller commits."""
+    run_id = run_id or uuid4()
+    rows = []
+    for stage, stats in (gateway or llm_gateway()).stage_stats().items():
+        if not stats.calls and not stats.retries:
+            continue
+        row = LlmStageUsage(
+            run_id=run_id,
+            script=script,
+            stage=stage,
+            calls=stats.calls,
+            errors=stats.errors,
+            retries=stats.retries,
+            prompt_tokens=stats.prompt_tokens,
+            completion_tokens=stats.completion_tokens,
+            cost_usd=stats.cost_usd,
+            latency_p50_s=stats.latency_percentile(50),
+            latency_p95_s=stats.latency_percentile(95),
+            started_at=started_at,
+        )
+        session.add(row)
+        rows.append(row)
+    return rows
+
+
+def save_llm_usage(
+    session: Session,
+    script: str,
+    started_at: datetime,
+    *,
+    gateway: LlmGateway | None = None,
+) -> None:
+    """Log the per-stage usage and commit it; a failure is logged, not raised."""
+    gateway = gateway or llm_gateway()
+    for stage, stats in gateway.stage_stats().items():
+        logger.info(stats.summary_line(f"stage:{stage}"))
+    try:
+        record_llm_usage(session, script, started_at, gateway=gateway)
+        session.commit()
+    except Exception:  # noqa: BLE001
+        session.rollback()
+        logger.exception("Failed to persist LLM usage")
@@ -0,0 +1,11 @@
+import pytest
+
+from app.services.llm.gateway import reset_llm_gateway
+
+
+@pytest.fixture(autouse=True)
+def _fresh_llm_gateway():
+    """Each test builds its own pooled OpenAI client (tests patch the class)."""
+    reset_llm_gateway()
+    yield
+    reset_llm_gateway()
@@ -0,0 +1,107 @@
+import asyncio
+
+import httpx
+
+from app.services.fetch.async_fetcher import FetchJob, fetch_all
+
+
+def _run(jobs, handler, **kwargs):
+    results: list[tuple[int, object]] = []
+
+    async def _main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await fetch_all(
+                jobs,
+                lambda idx, outcome: results.append((idx, outcome)),
+                client=client,
+                **kwargs,
+            )
+
+    asyncio.run(_main())
+    return results
+
+
+def test_fetch_all_reports_results_in_job_order() -> None:
+    delays = {"/a": 0.03, "/b": 0.0, "/c": 0.01}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(delays[request.url.path])
+        return httpx.Response(200, text=f"body{request.url.path}")
+
+    jobs = [
+        FetchJob(url="https://one.example/a", domain="one.example"),
+        FetchJob(url="https://two.example/b", domain="two.example"),
+        FetchJob(url="https://three.example/c", domain="three.example"),
+    ]
+
+    results = _run(jobs, handler)
+
+    assert [idx for idx, _ in results] == [0, 1, 2]
+    assert [outcome.text for _, outcome in results] == ["body/a", "body/b", "body/c"]
+    assert all(outcome.error is None for _, outcome in results)
+
+
+def test_fetch_all_caps_requests_per_domain() -> None:
+    in_flight: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        in_flight[host] = in_flight.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), in_flight[host])
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+        return httpx.Response(200, text="ok")
+
+    jobs = [FetchJob(url=f"https://slow.example/{i}", domain="slow.example") for i in range(6)]
+    jobs += [FetchJob(url=f"https://fast.example/{i}", domain="fast.example") for i in range(6)]
+
+    _run(jobs, handler, max_concurrency=8, per_domain=2)
+
+    assert peak["slow.example"] == 2
+    assert peak["fast.example"] == 2
+
+
+def test_fetch_all_maps_http_errors_to_outcome() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/missing":
+            return httpx.Response(404, text="nope")
+        raise httpx.ConnectError("boom", request=request)
+
+    jobs = [
+        FetchJob(url="https://example.com/missing", domain="example.com"),
+        FetchJob(url="https://example.com/down", domain="example.com"),
+    ]
+
+    results = _run(jobs, handler)
+
+    missing, down = (outcome for _, outcome in results)
+    assert missing.text is None
+    assert missing.status == 404
+    assert missing.error is not None
+    assert down.text is None
+    assert down.status is None
+    assert "boom" in down.error
+
+
+def test_fetch_all_sends_validators_and_flags_not_modified() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("if-none-match") == '"abc"':
+            return httpx.Response(304)
+        return httpx.Response(200, text="fresh", headers={"ETag": '"new"'})
+
+    jobs = [
+        FetchJob(url="https://example.com/same", domain="example.com", etag='"abc"'),
+        FetchJob(url="https://example.com/changed", domain="example.com", etag='"old"'),
+    ]
+
+    results = _run(jobs, handler)
+
+    same, changed = (outcome for _, outcome in results)
+    assert same.not_modified is True
+    assert same.text is None
+    assert same.error is None
+    assert same.etag == '"abc"'
+    assert changed.not_modified is False
+    assert changed.text == "fresh"
+    assert changed.etag == '"new"'
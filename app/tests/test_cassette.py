@@ -0,0 +1,135 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.fetch import cassette as cassette_module
+from app.services.fetch import http_client
+from app.services.fetch.cassette import (
+    AsyncCassetteTransport,
+    Cassette,
+    CassetteTransport,
+    configure_cassette,
+)
+from app.services.fetch.http_fetcher import fetch_url_text
+
+
+@pytest.fixture(autouse=True)
+def cassette_off():
+    yield
+    configure_cassette("off")
+
+
+def _record(path, handler, requests):
+    recorder = Cassette(path, "record")
+    client = httpx.Client(transport=CassetteTransport(recorder, httpx.MockTransport(handler)))
+    responses = [client.request(method, url, content=body) for method, url, body in requests]
+    client.close()
+    return recorder, responses
+
+
+def test_record_then_replay_without_network(tmp_path) -> None:
+    path = tmp_path / "run.jsonl.gz"
+    calls = {"n": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["n"] += 1
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/html", "etag": '"v1"', "set-cookie": "a=b"},
+            text=f"page {request.url.path} #{calls['n']}",
+        )
+
+    recorder, recorded = _record(
+        path,
+        handler,
+        [("GET", "https://example.com/a", b""), ("GET", "https://example.com/a", b"")],
+    )
+    assert recorder.recorded == 2
+    assert [r.text for r in recorded] == ["page /a #1", "page /a #2"]
+
+    player = Cassette(path, "replay")
+    client = httpx.Client(transport=CassetteTransport(player, inner=None))
+    replayed = [client.get("https://example.com/a") for _ in range(3)]
+
+    assert [r.text for r in replayed] == ["page /a #1", "page /a #2", "page /a #2"]
+    assert replayed[0].headers["etag"] == '"v1"'
+    assert "set-cookie" not in replayed[0].headers
+    assert player.hits == 3
+    assert calls["n"] == 2
+
+
+def test_replay_matches_post_bodies(tmp_path) -> None:
+    path = tmp_path / "llm.jsonl.gz"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"echo": request.content.decode()})
+
+    _record(
+        path,
+        handler,
+        [
+            ("POST", "https://api.example/v1/chat", b'{"prompt": "a"}'),
+            ("POST", "https://api.example/v1/chat", b'{"prompt": "b"}'),
+        ],
+    )
+
+    client = httpx.Client(transport=CassetteTransport(Cassette(path, "replay")))
+    response = client.post("https://api.example/v1/chat", content=b'{"prompt": "b"}')
+
+    assert response.json() == {"echo": '{"prompt": "b"}'}
+    with pytest.raises(httpx.ConnectError):
+        client.post("https://api.example/v1/chat", content=b'{"prompt": "c"}')
+
+
+def test_async_replay_applies_scaled_latency(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "async.jsonl.gz"
+    recorder = Cassette(path, "record")
+    recorder.record(
+        cassette_module.CassetteEntry(
+            key=cassette_module.request_key("GET", "https://example.com/slow"),
+            status=200,
+            headers={"content-type": "text/html"},
+            body=b"slow page",
+            elapsed_s=2.0,
+        )
+    )
+    slept: list[float] = []
+
+    async def fake_sleep(seconds: float) -> None:
+        slept.append(seconds)
+
+    monkeypatch.setattr(cassette_module.asyncio, "sleep", fake_sleep)
+    player = Cassette(path, "replay", latency_scale=0.5)
+
+    async def _main():
+        async with httpx.AsyncClient(transport=AsyncCassetteTransport(player)) as client:
+            return await client.get("https://example.com/slow")
+
+    response = asyncio.run(_main())
+
+    assert response.text == "slow page"
+    assert slept == [1.0]
+
+
+def test_configured_cassette_sits_under_shared_fetchers(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "fetch.jsonl.gz"
+    recorder = configure_cassette("record", str(path))
+    recorder.record(
+        cassette_module.CassetteEntry(
+            key=cassette_module.request_key("GET", "https://example.com/listing"),
+            status=200,
+            headers={"content-type": "text/html"},
+            body=b"<html>listing</html>",
+            elapsed_s=0.1,
+        )
+    )
+
+    configure_cassette("replay", str(path))
+    monkeypatch.setattr(http_client, "_client", http_client.build_http_client())
+
+    assert fetch_url_text("https://example.com/listing") == ("<html>listing</html>", None, 200)
+    text, error, status = fetch_url_text("https://example.com/unknown")
+    assert text is None
+    assert "cassette miss" in error
+
@@ -0,0 +1,129 @@
+import threading
+import time
+
+import pytest
+
+from app.services.extract.chunked_extractor import (
+    event_identity,
+    extract_events_chunked,
+    merge_chunk_events,
+    split_into_chunks,
+)
+
+URL = "https://example.com/programm"
+
+
+def _calendar(count: int) -> str:
+    return "\n".join(
+        f"Termin {index}: Puppentheater für Kinder ab 4 Jahren im Gasteig"
+        for index in range(count)
+    )
+
+
+def test_split_into_chunks_respects_size_and_repeats_overlap() -> None:
+    text = _calendar(40)
+
+    chunks = split_into_chunks(text, max_chars=600, overlap_chars=150)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 600 for chunk in chunks)
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current.split("\n")[0] in previous.split("\n")
+    covered = {line for chunk in chunks for line in chunk.split("\n")}
+    assert covered == set(text.split("\n"))
+
+
+def test_split_into_chunks_breaks_long_lines_at_sentences() -> None:
+    text = " ".join(f"Satz {index} über das Kinderprogramm." for index in range(100))
+
+    chunks = split_into_chunks(text, max_chars=300, overlap_chars=0)
+
+    assert all(len(chunk) <= 300 for chunk in chunks)
+    assert all(chunk.endswith(".") for chunk in chunks)
+
+
+def test_event_identity_normalizes_title_start_and_location() -> None:
+    first = {
+        "title": "Puppentheater: Kasperl!",
+        "start_time": "2026-03-07T10:00:00+01:00",
+        "location": "Gasteig",
+    }
+    second = {
+        "title": "puppentheater  kasperl",
+        "start_time": "2026-03-07T09:00Z",
+        "location": " GASTEIG ",
+    }
+
+    assert event_identity(first) == event_identity(second)
+
+
+def test_merge_chunk_events_drops_overlap_duplicates_and_fills_fields() -> None:
+    shared = {"title": "Kasperl", "start_time": "2026-03-07T10:00:00+01:00", "location": "Gasteig"}
+    merged = merge_chunk_events(
+        [
+            [{"title": "Zirkus", "start_time": "2026-03-06T15:00:00+01:00"}, dict(shared)],
+            [{**shared, "title": "KASPERL", "end_time": "2026-03-07T11:00:00+01:00"}],
+        ]
+    )
+
+    assert [event["title"] for event in merged] == ["Zirkus", "Kasperl"]
+    assert merged[1]["end_time"] == "2026-03-07T11:00:00+01:00"
+
+
+def test_extract_events_chunked_passes_short_text_unchanged() -> None:
+    calls = []
+
+    def extractor(text: str, source_url: str):
+        calls.append(text)
+        return [{"title": "A"}]
+
+    assert extract_events_chunked("kurz", URL, extractor, max_chars=100) == [{"title": "A"}]
+    assert calls == ["kurz"]
+
+
+def test_extract_events_chunked_runs_chunks_concurrently_in_order() -> None:
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def extractor(text: str, source_url: str):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return [
+            {"title": line.split(":")[0], "start_time": "2026-03-07T10:00:00+01:00"}
+            for line in text.split("\n")
+        ]
+
+    events = extract_events_chunked(
+        _calendar(30), URL, extractor, max_chars=500, overlap_chars=150, max_workers=3
+    )
+
+    assert [event["title"] for event in events] == [f"Termin {index}" for index in range(30)]
+    assert peak > 1
+
+
+def test_extract_events_chunked_fails_the_page_when_a_chunk_fails() -> None:
+    def extractor(text: str, source_url: str):
+        if "Termin 29" in text:
+            raise RuntimeError("boom")
+        return []
+
+    with pytest.raises(RuntimeError):
+        extract_events_chunked(_calendar(30), URL, extractor, max_chars=500, max_workers=2)
+
+
+def test_extract_events_chunked_ignores_text_past_the_cap(monkeypatch) -> None:
+    monkeypatch.setenv("PLANZ_EXTRACT_MAX_CHARS", "10")
+    calls = []
+
+    def extractor(text: str, source_url: str):
+        calls.append(text)
+        return []
+
+    extract_events_chunked("erste Zeile\nzweite Zeile", URL, extractor, max_chars=100)
+    assert calls == ["erste Zeil"]
@@ -0,0 +1,188 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import threading
+
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.models.domain_circuit import DomainCircuit
+from app.services.fetch.async_fetcher import FetchJob, fetch_all
+from app.services.fetch.circuit_breaker import (
+    CIRCUIT_OPEN_ERROR,
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    guarded,
+)
+
+
+class FakeNow:
+    def __init__(self) -> None:
+        self.now = datetime(2026, 1, 10, 12, 0, tzinfo=timezone.utc)
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def _make_session():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, future=True)()
+
+
+def test_breaker_opens_after_consecutive_failures_and_skips() -> None:
+    breaker = CircuitBreaker(failure_threshold=2, cooldown_s=60, now_fn=FakeNow())
+
+    breaker.record("https://down.example/a", "timed out", None)
+    assert breaker.allow("https://down.example/b")
+    breaker.record("https://www.down.example/b", "timed out", None)
+
+    assert breaker.state_of("down.example") == OPEN
+    assert not breaker.allow("https://down.example/c")
+    assert breaker.allow("https://up.example/a")
+    assert breaker.skipped == {"down.example": 1}
+    assert [t.to_state for t in breaker.transitions] == [OPEN]
+
+
+def test_breaker_ignores_page_level_errors() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, now_fn=FakeNow())
+
+    breaker.record("https://example.com/missing", "404 Not Found", 404)
+
+    assert breaker.state_of("example.com") == CLOSED
+
+
+def test_breaker_half_open_probe_closes_or_reopens() -> None:
+    clock = FakeNow()
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_s=60, now_fn=clock)
+    breaker.record("https://a.example/", "503 Service Unavailable", 503)
+    breaker.record("https://b.example/", "timed out", None)
+
+    clock.now += timedelta(seconds=61)
+    assert breaker.allow("https://a.example/")
+    assert breaker.state_of("a.example") == HALF_OPEN
+    breaker.record("https://a.example/", None, 200)
+    assert breaker.state_of("a.example") == CLOSED
+
+    assert breaker.allow("https://b.example/")
+    breaker.record("https://b.example/", "timed out", None)
+    assert breaker.state_of("b.example") == OPEN
+    assert not breaker.allow("https://b.example/")
+
+
+def test_breaker_half_open_admits_a_single_probe_among_concurrent_callers() -> None:
+    clock = FakeNow()
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_s=60, now_fn=clock)
+    breaker.record("https://down.example/", "timed out", None)
+    clock.now += timedelta(seconds=61)
+    start = threading.Barrier(8)
+
+    def attempt(index: int) -> bool:
+        start.wait()
+        return breaker.allow(f"https://down.example/{index}")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        allowed = list(executor.map(attempt, range(8)))
+
+    assert allowed.count(True) == 1
+    assert breaker.skipped["down.example"] == 7
+    assert not breaker.allow("https://down.example/again")
+
+    breaker.record("https://down.example/probe", "timed out", None)
+    assert breaker.state_of("down.example") == OPEN
+    clock.now += timedelta(seconds=61)
+    assert breaker.allow("https://down.example/next-probe")
+    breaker.record("https://down.example/next-probe", None, 200)
+    assert breaker.allow("https://down.example/a") and breaker.allow("https://down.example/b")
+
+
+def test_guarded_releases_probe_when_fetch_raises() -> None:
+    clock = FakeNow()
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_s=60, now_fn=clock)
+    breaker.record("https://down.example/", "timed out", None)
+    clock.now += timedelta(seconds=61)
+
+    def fetch(url: str):
+        raise RuntimeError("bug")
+
+    with pytest.raises(RuntimeError):
+        guarded(fetch, breaker)("https://down.example/a")
+
+    assert breaker.state_of("down.example") == HALF_OPEN
+    assert breaker.allow("https://down.example/b")
+
+
+def test_breaker_state_persists_between_runs() -> None:
+    session = _make_session()
+    clock = FakeNow()
+    first = CircuitBreaker(failure_threshold=1, cooldown_s=600, now_fn=clock)
+    first.record("https://down.example/", "timed out", None)
+    first.save(session)
+    session.commit()
+
+    row = session.query(DomainCircuit).one()
+    assert row.domain == "down.example"
+    assert row.state == OPEN
+    assert row.last_error == "timed out"
+
+    second = CircuitBreaker(failure_threshold=1, cooldown_s=600, now_fn=clock).load(session)
+    assert not second.allow("https://down.example/other")
+
+    clock.now += timedelta(seconds=601)
+    assert second.allow("https://down.example/other")
+    second.record("https://down.example/other", None, 200)
+    second.save(session)
+    session.commit()
+    assert session.query(DomainCircuit).one().state == CLOSED
+
+
+def test_guarded_skips_network_while_open() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, now_fn=FakeNow())
+    calls: list[str] = []
+
+    def fetch(url: str, timeout: float = 10.0):
+        calls.append(url)
+        return None, "timed out", None
+
+    fetcher = guarded(fetch, breaker)
+
+    assert fetcher("https://down.example/a", 5.0) == (None, "timed out", None)
+    assert fetcher("https://down.example/b", 5.0) == (None, CIRCUIT_OPEN_ERROR, None)
+    assert calls == ["https://down.example/a"]
+
+
+def test_fetch_all_skips_jobs_for_open_circuit() -> None:
+    requested: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        if request.url.host == "down.example":
+            raise httpx.ConnectTimeout("timed out", request=request)
+        return httpx.Response(200, text="ok")
+
+    breaker = CircuitBreaker(failure_threshold=2, now_fn=FakeNow())
+    jobs = [FetchJob(url=f"https://down.example/{i}", domain="down.example") for i in range(5)]
+    jobs.append(FetchJob(url="https://up.example/", domain="up.example"))
+    results = []
+
+    async def _main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await fetch_all(
+                jobs,
+                lambda idx, outcome: results.append(outcome),
+                client=client,
+                per_domain=1,
+                breaker=breaker,
+            )
+
+    asyncio.run(_main())
+
+    errors = [outcome.error for outcome in results]
+    assert errors[2:5] == [CIRCUIT_OPEN_ERROR] * 3
+    assert results[-1].text == "ok"
+    assert len([url for url in requested if "down.example" in url]) == 2
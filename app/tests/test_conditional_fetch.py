@@ -0,0 +1,108 @@
+import httpx
+import pytest
+
+from app.services.fetch import http_client
+from app.services.fetch.conditional import ConditionalFetcher
+from app.services.fetch.http_fetcher import ConditionalFetchResult, fetch_url_conditional
+
+
+@pytest.fixture
+def install_transport(monkeypatch):
+    def _install(handler) -> None:
+        client = http_client.build_http_client(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(http_client, "_client", client)
+
+    return _install
+
+
+def _etag_handler(seen: list[dict]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(dict(request.headers))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(
+            200,
+            text="<html>listing</html>",
+            headers={"ETag": '"v1"', "Last-Modified": "Wed, 01 Oct 2025 10:00:00 GMT"},
+        )
+
+    return handler
+
+
+def test_fetch_url_conditional_sends_validators_and_detects_304(install_transport) -> None:
+    seen: list[dict] = []
+    install_transport(_etag_handler(seen))
+
+    result = fetch_url_conditional(
+        "https://example.com/page",
+        etag='"v1"',
+        last_modified="Wed, 01 Oct 2025 10:00:00 GMT",
+    )
+
+    assert result.not_modified is True
+    assert result.text is None
+    assert result.error is None
+    assert result.status == 304
+    assert seen[0]["if-none-match"] == '"v1"'
+    assert seen[0]["if-modified-since"] == "Wed, 01 Oct 2025 10:00:00 GMT"
+
+
+def test_fetch_url_conditional_returns_validators_on_full_response(install_transport) -> None:
+    install_transport(_etag_handler([]))
+
+    result = fetch_url_conditional("https://example.com/page")
+
+    assert result.text == "<html>listing</html>"
+    assert result.etag == '"v1"'
+    assert result.last_modified == "Wed, 01 Oct 2025 10:00:00 GMT"
+    assert result.bytes_read == len("<html>listing</html>")
+
+
+def test_conditional_fetcher_reuses_body_on_304(install_transport) -> None:
+    seen: list[dict] = []
+    install_transport(_etag_handler(seen))
+    fetcher = ConditionalFetcher()
+
+    first = fetcher("https://example.com/page")
+    second = fetcher("https://example.com/page", 10.0)
+
+    assert first[0] == second[0] == "<html>listing</html>"
+    assert second[1] is None
+    assert "if-none-match" not in seen[0]
+    assert seen[1]["if-none-match"] == '"v1"'
+    assert fetcher.stats.requests == 2
+    assert fetcher.stats.not_modified == 1
+    assert fetcher.stats.bytes_saved == len("<html>listing</html>")
+
+
+def test_conditional_fetcher_passes_errors_through(install_transport) -> None:
+    install_transport(lambda request: httpx.Response(500, text="boom"))
+    fetcher = ConditionalFetcher()
+
+    text, error, status = fetcher("https://example.com/page")
+
+    assert text is None
+    assert error is not None
+    assert status == 500
+
+
+def test_conditional_fetcher_remembers_a_bounded_number_of_pages(install_transport) -> None:
+    install_transport(_etag_handler([]))
+    fetcher = ConditionalFetcher(max_pages=2)
+
+    for name in ("a", "b", "a", "c"):
+        fetcher(f"https://example.com/{name}")
+
+    assert list(fetcher.pages) == ["https://example.com/a", "https://example.com/c"]
+
+
+def test_conditional_fetcher_does_not_remember_truncated_bodies() -> None:
+    def fetch(url, **kwargs):
+        return ConditionalFetchResult(
+            text="<html>cut", error=None, status=200, etag='"v1"', truncated="max_bytes"
+        )
+
+    fetcher = ConditionalFetcher(fetch=fetch)
+
+    assert fetcher("https://example.com/page")[0] == "<html>cut"
+    assert fetcher.pages == {}
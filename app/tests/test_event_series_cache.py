@@ -398,3 +398,42 @@ def test_enrich_fills_missing_venue_address_on_cached_series() -> None:
     assert enriched[0]["venue_address"] == "Maximilianstrasse 5, 80538 München"
     session.refresh(existing)
     assert existing.venue_address == "Maximilianstrasse 5, 80538 München"
+
+
+def test_enrich_with_series_cache_summarizes_series_concurrently_in_order() -> None:
+    import threading
+    import time
+
+    session = _make_session()
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+    fetched: list[str] = []
+
+    def fetch_detail(detail_url: str) -> str:
+        with lock:
+            fetched.append(detail_url)
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.02)
+        with lock:
+            active["now"] -= 1
+        return f"Summary of {detail_url.rsplit('/', 1)[-1]}"
+
+    start = datetime.now(tz=timezone.utc)
+    events = [
+        {"title": f"Show {index % 6}", "location": "Hall", "detail_url": f"https://example.com/{index % 6}", "start_time": start}
+        for index in range(12)
+    ]
+
+    enriched = enrich_with_series_cache(
+        session, events, fetch_detail, now=start,
+        summarizer=_identity_summarizer, max_workers=3,
+    )
+
+    assert [item["description"] for item in enriched] == [
+        f"Summary of {index % 6}" for index in range(12)
+    ]
+    assert sorted(fetched) == [f"https://example.com/{index}" for index in range(6)]
+    assert 1 < active["peak"] <= 3
+    keys = [series.series_key for series in session.scalars(select(EventSeries))]
+    assert sorted(keys) == sorted(f"https://example.com/{index}" for index in range(6))
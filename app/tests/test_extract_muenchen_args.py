@@ -1,3 +1,5 @@
+import pytest
+
 from app.scripts.extract_muenchen_kinder import build_parser
 
 
@@ -25,3 +27,33 @@ def test_extract_muenchen_parser_accepts_max_events() -> None:
     parser = build_parser()
     args = parser.parse_args(["--max-events", "3"])
     assert args.max_events == 3
+
+
+def test_extract_muenchen_parser_accepts_cache_mode() -> None:
+    parser = build_parser()
+    assert parser.parse_args([]).cache_mode == "use"
+    assert parser.parse_args(["--cache-mode", "refresh"]).cache_mode == "refresh"
+
+
+def test_extract_muenchen_parser_accepts_all_items() -> None:
+    parser = build_parser()
+    assert parser.parse_args([]).all_items is False
+    assert parser.parse_args(["--all-items"]).all_items is True
+
+
+def test_extract_muenchen_parser_accepts_workers() -> None:
+    parser = build_parser()
+    assert parser.parse_args([]).workers == 1
+    assert parser.parse_args(["--workers", "4"]).workers == 4
+
+
+@pytest.mark.parametrize("workers", ["0", "-2"])
+def test_extract_muenchen_parser_rejects_workers_below_one(workers: str) -> None:
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(["--workers", workers])
+
+
+def test_extract_muenchen_parser_accepts_llm_cache() -> None:
+    parser = build_parser()
+    assert parser.parse_args([]).llm_cache is None
+    assert parser.parse_args(["--llm-cache", "off"]).llm_cache == "off"
@@ -1,16 +1,27 @@
+from datetime import datetime, timezone
+
 from sqlalchemy import create_engine, select
 from sqlalchemy.orm import sessionmaker
 
 from app.db.base import Base
+from app.db.models.listing_item import ListingItem
 from app.db.models.source_domain import SourceDomain
 from app.db.models.source_url import SourceUrl
 from app.scripts.extract_muenchen_kinder import (
     _apply_paid_prefix,
+    _collect_events,
     _deduplicate_events,
+    _listing_complete,
+    _listing_pool,
+    _make_listing_tracker,
     _resolve_sync_limit,
+    build_parser,
+    expand_listing_page,
     extract_detail_events_from_listing,
     prepare_source_url,
 )
+from app.services.extract.listing_items import ListingItemTracker
+from app.services.fetch.listing_pagination import iter_listing_pages
 
 
 def _make_session():
@@ -314,6 +325,28 @@ def test_max_items_counts_listing_items_not_expanded_rows() -> None:
     assert titles[5] == "Single Event"
 
 
+def test_expand_listing_page_in_worker_process_matches_serial_extraction() -> None:
+    from app.scripts.benchmark_listing_parse import synthetic_listing_page
+
+    listing_url = "https://www.muenchen.de/veranstaltungen/event/kinder"
+    page = synthetic_listing_page(items=4, chrome_links=5)
+    pages = [page.replace("event-", f"p{number}-event-") for number in range(3)]
+
+    with _listing_pool(2) as executor:
+        assert executor._mp_context.get_start_method() in ("forkserver", "spawn")
+        expanded = list(executor.map(expand_listing_page, pages, [listing_url] * len(pages)))
+
+    merged = [event for page in expanded for event in _collect_events(page, None)]
+    serial = [
+        event
+        for html in pages
+        for event in extract_detail_events_from_listing(listing_html=html, listing_url=listing_url)
+    ]
+    assert merged == serial
+    assert len(merged) == 12
+    assert _deduplicate_events(merged) == _deduplicate_events(serial)
+
+
 def test_resolve_sync_limit_uses_max_events_for_debug_runs() -> None:
     assert _resolve_sync_limit(None) == 200
     assert _resolve_sync_limit(3) == 3
@@ -374,3 +407,63 @@ def test_deduplicate_events_preserves_first_occurrence() -> None:
     result = _deduplicate_events(events)
     assert len(result) == 1
     assert result[0]["source_url"] == "https://ticket.de/KEEP"
+
+
+def test_deduplicate_events_drops_duplicates_of_known_events() -> None:
+    known = [{"title": "Show", "start_time": "2026-03-21T15:00:00+01:00", "location": "Theater"}]
+    events = [
+        {"title": "Show", "start_time": "2026-03-21T15:00:00+01:00", "location": "Theater", "source_url": "https://ticket.de/2"},
+        {"title": "Show", "start_time": "2026-03-22T15:00:00+01:00", "location": "Theater", "source_url": "https://ticket.de/3"},
+    ]
+    result = _deduplicate_events(events, known=known)
+    assert [event["source_url"] for event in result] == ["https://ticket.de/3"]
+
+
+def test_listing_capped_by_max_pages_marks_no_items_gone() -> None:
+    session = _make_session()
+    listing_url = "https://www.muenchen.de/veranstaltungen/event/kinder"
+    html = {
+        f"{listing_url}?page=1": f'<a rel="next" href="{listing_url}?page=2">Weiter</a>',
+        f"{listing_url}?page=2": "<p>Ende</p>",
+    }
+    items = {
+        f"{listing_url}?page=1": {"title": "A", "detail_url": "https://www.muenchen.de/a"},
+        f"{listing_url}?page=2": {"title": "B", "detail_url": "https://www.muenchen.de/b"},
+    }
+
+    def crawl(max_pages: int, day: int):
+        pages = list(
+            iter_listing_pages(
+                f"{listing_url}?page=1",
+                fetcher=lambda url, timeout=10.0: (html[url], None, 200),
+                max_pages=max_pages,
+                prefetch=0,
+            )
+        )
+        tracker = ListingItemTracker(session, listing_url)
+        tracker.select([items[page.url] for page in pages])
+        tracker.commit(datetime(2026, 3, day, tzinfo=timezone.utc), complete=_listing_complete(pages))
+        session.commit()
+        return pages, tracker.diff
+
+    pages, _diff = crawl(max_pages=10, day=1)
+    assert _listing_complete(pages)
+
+    pages, diff = crawl(max_pages=1, day=2)
+    assert not _listing_complete(pages)
+    assert diff.gone == 0
+    assert all(row.gone_at is None for row in session.scalars(select(ListingItem)))
+
+
+def test_listing_tracker_only_for_persisted_enriched_full_runs() -> None:
+    session = _make_session()
+    listing_url = "https://www.muenchen.de/veranstaltungen/event/kinder"
+
+    def tracker(*argv: str):
+        return _make_listing_tracker(session, listing_url, build_parser().parse_args(argv))
+
+    assert tracker("--persist") is not None
+    assert tracker() is None
+    assert tracker("--persist", "--all-items") is None
+    assert tracker("--persist", "--max-events", "5") is None
+    assert tracker("--persist", "--no-llm") is None
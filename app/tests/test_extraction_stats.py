@@ -93,3 +93,19 @@ def test_extraction_sets_ok_and_count_on_success() -> None:
     assert refreshed.last_extraction_error is None
     assert len(events) == 2
     assert stats["events_created_total"] == 2
+
+
+def test_extraction_prefers_cleaned_text_over_excerpt() -> None:
+    session = _make_session()
+    source_url = _create_source(session, content_hash="hash4", last_hash="old")
+    source_url.content_text = "Kalender\nSa 07.03. Puppentheater"
+    session.commit()
+    seen = []
+
+    def extractor(text: str, source_url: str):
+        seen.append(text)
+        return []
+
+    extract_and_store_for_sources(session, extractor=extractor, now=datetime.now(tz=timezone.utc))
+
+    assert seen == ["Kalender\nSa 07.03. Puppentheater"]
@@ -39,9 +39,55 @@ def test_store_fetch_result_success_sets_fields() -> None:
     assert source_url.last_fetched_at == now
     assert source_url.content_hash == hashlib.sha256(text.encode("utf-8")).hexdigest()
     assert source_url.content_excerpt == text[:2000]
+    assert source_url.content_text == text
     assert source_url.error_message is None
 
 
+def test_store_fetch_result_keeps_cleaned_block_text() -> None:
+    session = _make_session()
+    source_url = _create_source_url(session)
+    paragraphs = "".join(f"<p>Termin {index}</p>" for index in range(300))
+    html = f"<html><script>var x;</script><main>{paragraphs}</main></html>"
+
+    now = datetime.now(tz=timezone.utc)
+
+    store_fetch_result(session, source_url, text=html, error=None, now=now)
+
+    lines = source_url.content_text.split("\n")
+    assert lines[0] == "Termin 0"
+    assert lines[-1] == "Termin 299"
+    assert len(source_url.content_excerpt) == 2000
+
+
+def test_store_fetch_result_rebuilds_text_only_when_content_changes(monkeypatch) -> None:
+    session = _make_session()
+    source_url = _create_source_url(session)
+    now = datetime.now(tz=timezone.utc)
+    calls: list[str] = []
+
+    def source_text(text: str) -> str:
+        calls.append(text)
+        return text
+
+    monkeypatch.setattr("app.services.fetch.store_fetch_result._source_text", source_text)
+    store_fetch_result(session, source_url, text="<p>A</p>", error=None, now=now)
+    store_fetch_result(session, source_url, text="<p>A</p>", error=None, now=now)
+    store_fetch_result(session, source_url, text="<p>B</p>", error=None, now=now)
+
+    assert calls == ["<p>A</p>", "<p>B</p>"]
+
+
+def test_store_fetch_result_caps_text_at_extraction_limit(monkeypatch) -> None:
+    monkeypatch.setenv("PLANZ_EXTRACT_MAX_CHARS", "50")
+    session = _make_session()
+    source_url = _create_source_url(session)
+    html = "".join(f"<p>Termin {index}</p>" for index in range(100))
+
+    store_fetch_result(session, source_url, text=html, error=None, now=datetime.now(tz=timezone.utc))
+
+    assert len(source_url.content_text) <= 50
+
+
 def test_store_fetch_result_error_does_not_overwrite_content() -> None:
     session = _make_session()
     source_url = _create_source_url(session)
@@ -57,3 +103,96 @@ def test_store_fetch_result_error_does_not_overwrite_content() -> None:
     assert source_url.error_message == "boom"
     assert source_url.content_hash == "existing"
     assert source_url.content_excerpt == "previous excerpt"
+
+
+def test_store_fetch_result_records_validators_and_length() -> None:
+    session = _make_session()
+    source_url = _create_source_url(session)
+    now = datetime.now(tz=timezone.utc)
+
+    store_fetch_result(
+        session,
+        source_url,
+        text="grüße",
+        error=None,
+        now=now,
+        etag='"v1"',
+        last_modified="Wed, 01 Oct 2025 10:00:00 GMT",
+    )
+
+    assert source_url.etag == '"v1"'
+    assert source_url.last_modified == "Wed, 01 Oct 2025 10:00:00 GMT"
+    assert source_url.content_length == len("grüße".encode("utf-8"))
+
+
+def test_store_fetch_result_not_modified_keeps_hash() -> None:
+    session = _make_session()
+    source_url = _create_source_url(session)
+    source_url.fetch_status = "error"
+    source_url.content_hash = "existing"
+    source_url.last_extracted_hash = "existing"
+    source_url.content_excerpt = "previous excerpt"
+    source_url.etag = '"v1"'
+    session.commit()
+
+    now = datetime.now(tz=timezone.utc)
+    store_fetch_result(
+        session, source_url, text=None, error=None, now=now, not_modified=True, etag='"v1"'
+    )
+
+    assert source_url.fetch_status == "ok"
+    assert source_url.last_fetched_at == now
+    assert source_url.content_hash == "existing"
+    assert source_url.content_hash == source_url.last_extracted_hash
+    assert source_url.content_excerpt == "previous excerpt"
+    assert source_url.etag == '"v1"'
+
+
+def test_store_fetch_result_records_streamed_hash_and_truncation() -> None:
+    session = _make_session()
+    source_url = _create_source_url(session)
+    now = datetime(2026, 1, 10, 12, 0, tzinfo=timezone.utc)
+
+    store_fetch_result(
+        session,
+        source_url,
+        text="<html>partial",
+        error=None,
+        now=now,
+        content_hash="f" * 64,
+        bytes_read=4096,
+        truncated="max_bytes",
+    )
+
+    assert source_url.content_hash == "f" * 64
+    assert source_url.bytes_read == 4096
+    assert source_url.content_length == 4096
+    assert source_url.truncated_reason == "max_bytes"
+
+    store_fetch_result(
+        session, source_url, text="<html>full</html>", error=None, now=now, bytes_read=17
+    )
+
+    assert source_url.truncated_reason is None
+    assert source_url.bytes_read == 17
+
+
+def test_store_fetch_result_error_and_304_keep_stored_body_metadata() -> None:
+    session = _make_session()
+    source_url = _create_source_url(session)
+    now = datetime(2026, 1, 10, 12, 0, tzinfo=timezone.utc)
+    store_fetch_result(
+        session,
+        source_url,
+        text="<html>partial",
+        error=None,
+        now=now,
+        bytes_read=4096,
+        truncated="max_bytes",
+    )
+
+    store_fetch_result(session, source_url, text=None, error=None, now=now, not_modified=True)
+    store_fetch_result(session, source_url, text=None, error="timed out", now=now)
+
+    assert source_url.bytes_read == 4096
+    assert source_url.truncated_reason == "max_bytes"
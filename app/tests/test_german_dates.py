@@ -0,0 +1,62 @@
+from datetime import date
+
+from app.services.extract.german_dates import (
+    contains_date_token,
+    find_date_range,
+    find_schedule,
+    normalize_schedule_text,
+    parse_display_datetime,
+    parse_month,
+)
+
+
+def test_find_schedule_parses_date_and_times_from_one_match() -> None:
+    schedule = find_schedule("Kinderkino Fr. 06.03.2026 09:00 - 11:00 Uhr Gasteig")
+
+    assert schedule is not None
+    assert schedule.raw == "Fr. 06.03.2026 09:00 - 11:00 Uhr"
+    assert schedule.start.isoformat() == "2026-03-06T09:00:00+01:00"
+    assert schedule.end.isoformat() == "2026-03-06T11:00:00+01:00"
+
+
+def test_find_schedule_without_end_time_and_invalid_dates() -> None:
+    schedule = find_schedule("So. 29.03.2026 14:00 Uhr")
+
+    assert schedule.end is None
+    assert schedule.start.isoformat() == "2026-03-29T14:00:00+02:00"
+    assert find_schedule("Sa. 31.02.2026 10:00 Uhr") is None
+    assert find_schedule("06.03.2026 09:00 Uhr") is None
+
+
+def test_find_date_range_handles_umlauts_abbreviations_and_year_rollover() -> None:
+    assert find_date_range("03 MÄRZ bis 05 MÄRZ", 2026) == (date(2026, 3, 3), date(2026, 3, 5))
+    assert find_date_range("12 Okt. bis 03 Nov", 2026) == (date(2026, 10, 12), date(2026, 11, 3))
+    assert find_date_range("20 Dez bis 06 Jan", 2026) == (date(2026, 12, 20), date(2027, 1, 6))
+    assert find_date_range("03 Foo bis 05 Bar", 2026) is None
+    assert parse_month("maerz") == 3
+
+
+def test_parse_display_datetime_matches_muenchen_time_attributes() -> None:
+    assert parse_display_datetime(" 06.03.2026 - 15:00:00 ").isoformat() == (
+        "2026-03-06T15:00:00+01:00"
+    )
+    assert parse_display_datetime("6.3.2026 - 9:05:00").isoformat() == (
+        "2026-03-06T09:05:00+01:00"
+    )
+    assert parse_display_datetime("06.03.2026 - 25:00:00") is None
+    assert parse_display_datetime("2026-03-06T15:00:00Z") is None
+    assert parse_display_datetime(None) is None
+
+
+def test_normalize_schedule_text_adds_uhr_to_bare_times() -> None:
+    assert normalize_schedule_text("Fr. 06.03.2026  15:00\n - 17:00") == (
+        "Fr. 06.03.2026 15:00 - 17:00 Uhr"
+    )
+    assert normalize_schedule_text("Fr. 06.03.2026 15:00 Uhr") == "Fr. 06.03.2026 15:00 Uhr"
+    assert normalize_schedule_text("   ") is None
+
+
+def test_contains_date_token_ignores_plain_text() -> None:
+    assert contains_date_token("so. geht das")
+    assert not contains_date_token("Kindertheater im Gasteig")
+    assert not contains_date_token("Version 1.2.34567")
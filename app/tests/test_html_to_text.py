@@ -0,0 +1,89 @@
+from app.services.extract import html_to_text as module
+from app.services.extract.html_to_text import HtmlToText
+
+PAGE = """
+<html><head><title>Kindertheater</title><style>body { color: red; }</style>
+<script>window.dataLayer = [];</script></head>
+<body>
+<header><a href="/">muenchen.de</a></header>
+<nav><ul><li>Rathaus</li><li>Veranstaltungen</li></ul></nav>
+<main>
+  <h1>Der kleine Prinz</h1>
+  <nav>Zurück zur Übersicht</nav>
+  <p>Ein Theaterstück für Kinder ab 5&nbsp;Jahren.<br/>Eintritt: 8 &euro;</p>
+  <script>track("detail");</script>
+</main>
+<footer>Impressum Datenschutz</footer>
+</body></html>
+"""
+
+
+def test_extract_keeps_main_region_and_drops_chrome() -> None:
+    text = HtmlToText().extract(PAGE)
+
+    assert text == (
+        "Der kleine Prinz Ein Theaterstück für Kinder ab 5 Jahren. Eintritt: 8 €"
+    )
+
+
+def test_extract_prefers_muenchen_detail_container() -> None:
+    html = (
+        "<body><div>Newsletter abonnieren</div>"
+        '<div class="m-event-detail"><div><h1>Puppenspiel</h1></div><p>Gasteig HP8</p></div>'
+        "<div>Weitere Veranstaltungen</div></body>"
+    )
+
+    assert HtmlToText().extract(html) == "Puppenspiel Gasteig HP8"
+
+
+def test_extract_falls_back_to_body_text_without_content_region() -> None:
+    html = "<html><body><h1>Show</h1><nav>Menu</nav><p>Family friendly fun.</p></body></html>"
+
+    assert HtmlToText().extract(html) == "Show Family friendly fun."
+    assert HtmlToText().extract("Detailed description") == "Detailed description"
+    assert HtmlToText().extract("") == ""
+
+
+def test_extract_keeps_header_inside_article() -> None:
+    html = "<header>Site</header><article><header>Titel</header><p>Text</p></article>"
+
+    assert HtmlToText().extract(html) == "Titel Text"
+
+
+def test_extract_stops_at_char_budget(monkeypatch) -> None:
+    monkeypatch.setattr(module, "_CHUNK_CHARS", 64)
+    fed: list[str] = []
+    original_feed = module._TextCollector.feed
+
+    def recording_feed(self, data: str) -> None:
+        fed.append(data)
+        original_feed(self, data)
+
+    monkeypatch.setattr(module._TextCollector, "feed", recording_feed)
+    paragraphs = "".join(f"<p>Absatz {index} mit Text</p>" for index in range(500))
+    html = f"<main>{paragraphs}</main>"
+
+    text = HtmlToText(max_chars=100).extract(html)
+
+    assert len(text) == 100
+    assert text.startswith("Absatz 0 mit Text Absatz 1 mit Text")
+    assert sum(len(chunk) for chunk in fed) < len(html) // 10
+
+
+def test_extract_chunking_does_not_split_words(monkeypatch) -> None:
+    monkeypatch.setattr(module, "_CHUNK_CHARS", 7)
+    html = "<p>Familienfreundliche Veranstaltung</p><p>im Olympiapark</p>"
+
+    assert HtmlToText().extract(html) == "Familienfreundliche Veranstaltung im Olympiapark"
+
+
+def test_extract_blocks_puts_each_block_on_its_own_line() -> None:
+    html = (
+        "<main><h2>März</h2><p>Sa 07.03. <b>Puppen</b>theater</p>"
+        "<ul><li>Gasteig</li><li>10 Uhr<br/>Eintritt frei</li></ul></main>"
+    )
+
+    assert HtmlToText(blocks=True).extract(html) == (
+        "März\nSa 07.03. Puppen theater\nGasteig\n10 Uhr\nEintritt frei"
+    )
+    assert "\n" not in HtmlToText().extract(html)
@@ -1,42 +1,28 @@
-import httpx
-
-from app.services.fetch.http_fetcher import fetch_url_text
-
-
-class _FakeResponse:
-    def __init__(self, text: str, status_code: int = 200) -> None:
-        self.text = text
-        self.status_code = status_code
-
-    def raise_for_status(self) -> None:
-        return None
-
+import hashlib
 
-class _FakeClient:
-    def __init__(self, text: str | None = None, raise_error: Exception | None = None) -> None:
-        self._text = text
-        self._raise_error = raise_error
-        self.headers = {}
-        self.timeout = None
-        self.follow_redirects = False
+import httpx
+import pytest
 
-    def __enter__(self):
-        return self
+from app.services.fetch import http_client
+from app.services.fetch.http_fetcher import (
+    fetch_url_conditional,
+    fetch_url_text,
+    max_bytes_for,
+)
 
-    def __exit__(self, exc_type, exc, tb):
-        return False
 
-    def get(self, url: str) -> _FakeResponse:
-        if self._raise_error is not None:
-            raise self._raise_error
-        return _FakeResponse(self._text or "")
+@pytest.fixture
+def install_transport(monkeypatch):
+    def _install(handler) -> httpx.Client:
+        client = http_client.build_http_client(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(http_client, "_client", client)
+        return client
 
+    return _install
 
-def test_fetch_url_text_success(monkeypatch) -> None:
-    def fake_client(*args, **kwargs):
-        return _FakeClient(text="ok")
 
-    monkeypatch.setattr(httpx, "Client", fake_client)
+def test_fetch_url_text_success(install_transport) -> None:
+    install_transport(lambda request: httpx.Response(200, text="ok"))
 
     text, error, status = fetch_url_text("https://example.com")
     assert text == "ok"
@@ -44,13 +30,130 @@ def test_fetch_url_text_success(monkeypatch) -> None:
     assert status == 200
 
 
-def test_fetch_url_text_error(monkeypatch) -> None:
-    def fake_client(*args, **kwargs):
-        return _FakeClient(raise_error=httpx.RequestError("boom", request=None))
+def test_fetch_url_text_error(install_transport) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.RequestError("boom", request=request)
 
-    monkeypatch.setattr(httpx, "Client", fake_client)
+    install_transport(handler)
 
     text, error, status = fetch_url_text("https://example.com")
     assert text is None
     assert error is not None
     assert status is None
+
+
+def test_fetch_url_text_reports_http_status_errors(install_transport) -> None:
+    install_transport(lambda request: httpx.Response(503, text="down"))
+
+    text, error, status = fetch_url_text("https://example.com")
+    assert text is None
+    assert error is not None
+    assert status == 503
+
+
+def test_fetch_url_text_reuses_shared_client_and_counts_requests(install_transport) -> None:
+    seen_agents: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_agents.append(request.headers["user-agent"])
+        return httpx.Response(200, text="ok")
+
+    client = install_transport(handler)
+    http_client.reset_pool_stats()
+
+    fetch_url_text("https://example.com/a")
+    fetch_url_text("https://example.com/b")
+
+    assert http_client.get_http_client() is client
+    assert seen_agents == ["PLAZN/0.1", "PLAZN/0.1"]
+    assert http_client.pool_stats().requests == 2
+
+
+def test_close_http_clients_builds_fresh_pool() -> None:
+    first = http_client.get_http_client()
+    http_client.close_http_clients()
+    second = http_client.get_http_client()
+
+    assert first.is_closed
+    assert second is not first
+    http_client.close_http_clients()
+
+
+def test_resolve_client_config_reads_env(monkeypatch) -> None:
+    monkeypatch.setenv("PLANZ_HTTP_MAX_CONNECTIONS", "5")
+    monkeypatch.setenv("PLANZ_HTTP_TIMEOUT", "3.5")
+    monkeypatch.setenv("PLANZ_HTTP2", "true")
+    monkeypatch.setattr(http_client, "http2_available", lambda: False)
+
+    config = http_client.resolve_client_config()
+
+    assert config["max_connections"] == 5
+    assert config["timeout"] == 3.5
+    assert config["http2"] is False
+
+
+class _ChunkStream(httpx.SyncByteStream):
+    def __init__(self, chunks: list[bytes]) -> None:
+        self.chunks = chunks
+        self.served = 0
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            self.served += 1
+            yield chunk
+
+
+def test_fetch_rejects_non_html_before_reading_body(install_transport) -> None:
+    stream = _ChunkStream([b"%PDF-1.7", b"x" * 1024])
+    install_transport(
+        lambda request: httpx.Response(
+            200, headers={"content-type": "application/pdf"}, stream=stream
+        )
+    )
+
+    result = fetch_url_conditional("https://example.com/brochure.pdf")
+
+    assert result.text is None
+    assert result.error == "unsupported_content_type: application/pdf"
+    assert result.status == 200
+    assert stream.served == 0
+
+
+def test_fetch_truncates_at_byte_cap_and_hashes_streamed_bytes(install_transport) -> None:
+    stream = _ChunkStream([b"<html>" + b"a" * 10, b"b" * 10, b"c" * 10])
+    install_transport(
+        lambda request: httpx.Response(
+            200, headers={"content-type": "text/html; charset=utf-8"}, stream=stream
+        )
+    )
+
+    result = fetch_url_conditional("https://example.com/huge", max_bytes=20)
+
+    expected = (b"<html>" + b"a" * 10 + b"b" * 10)[:20]
+    assert result.text == expected.decode()
+    assert result.bytes_read == 20
+    assert result.truncated == "max_bytes"
+    assert result.content_hash == hashlib.sha256(expected).hexdigest()
+    assert stream.served == 2
+
+
+def test_fetch_reads_small_body_without_truncation(install_transport) -> None:
+    install_transport(
+        lambda request: httpx.Response(
+            200, headers={"content-type": "text/html"}, content=b"<html>ok</html>"
+        )
+    )
+
+    result = fetch_url_conditional("https://example.com/")
+
+    assert result.text == "<html>ok</html>"
+    assert result.truncated is None
+    assert result.content_hash == hashlib.sha256(b"<html>ok</html>").hexdigest()
+
+
+def test_max_bytes_for_uses_domain_caps(monkeypatch) -> None:
+    monkeypatch.setenv("PLANZ_FETCH_MAX_BYTES", "1000")
+    monkeypatch.setenv("PLANZ_FETCH_MAX_BYTES_BY_DOMAIN", "muenchen.de=500")
+
+    assert max_bytes_for("https://www.muenchen.de/veranstaltungen") == 500
+    assert max_bytes_for("https://example.com/") == 1000
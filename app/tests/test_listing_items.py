@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.models.listing_item import ListingItem
+from app.services.extract.listing_items import ListingItemTracker, listing_item_key
+
+LISTING_URL = "https://www.muenchen.de/veranstaltungen/event/kinder"
+NOW = datetime(2026, 3, 1, 8, 0, tzinfo=timezone.utc)
+
+
+def _make_session():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, future=True)()
+
+
+def _item(index: int, location: str = "Gasteig") -> dict:
+    return {
+        "title": f"Event {index}",
+        "detail_url": f"https://www.muenchen.de/event-{index}",
+        "ticket_url": None,
+        "start_time": f"2026-03-0{index}T10:00:00+01:00",
+        "location": location,
+    }
+
+
+def _run(session, pages: list[list[dict]], now: datetime, complete: bool = True):
+    tracker = ListingItemTracker(session, LISTING_URL)
+    selected = [tracker.select(items) for items in pages]
+    tracker.commit(now, complete=complete)
+    session.commit()
+    return tracker.diff, selected
+
+
+def test_tracker_selects_only_new_and_changed_items() -> None:
+    session = _make_session()
+    diff, selected = _run(session, [[_item(1), _item(2)], [_item(3)]], NOW)
+    assert (diff.new, diff.changed, diff.unchanged, diff.gone) == (3, 0, 0, 0)
+    assert selected == [[_item(1), _item(2)], [_item(3)]]
+
+    later = NOW + timedelta(days=1)
+    diff, selected = _run(
+        session, [[_item(1), _item(2, location="HP8")], [_item(4)]], later
+    )
+
+    assert (diff.new, diff.changed, diff.unchanged, diff.gone) == (1, 1, 1, 1)
+    assert selected == [[_item(2, location="HP8")], [_item(4)]]
+    gone = session.scalar(
+        select(ListingItem).where(ListingItem.item_key == listing_item_key(_item(3)))
+    )
+    assert gone.gone_at is not None
+
+
+def test_tracker_keeps_items_of_incomplete_runs_and_revives_gone_items() -> None:
+    session = _make_session()
+    _run(session, [[_item(1), _item(2)]], NOW)
+
+    diff, _selected = _run(session, [[_item(1)]], NOW + timedelta(days=1), complete=False)
+    assert diff.gone == 0
+
+    _run(session, [[_item(1)]], NOW + timedelta(days=2))
+    diff, selected = _run(session, [[_item(1), _item(2)]], NOW + timedelta(days=3))
+
+    assert (diff.new, diff.unchanged) == (1, 1)
+    assert selected == [[_item(2)]]
+
+
+def test_tracker_follows_first_occurrence_of_repeated_item() -> None:
+    session = _make_session()
+    diff, selected = _run(session, [[_item(1)], [_item(1)]], NOW)
+
+    assert diff.new == 1
+    assert selected == [[_item(1)], [_item(1)]]
+    assert len(session.scalars(select(ListingItem)).all()) == 1
@@ -1,4 +1,12 @@
-from app.services.fetch.listing_pagination import enumerate_listing_pages
+import threading
+import time
+
+from app.services.extract.muenchen_listing_parser import next_link_href
+from app.services.fetch.listing_pagination import (
+    enumerate_listing_pages,
+    iter_listing_pages,
+    numbered_page_pattern,
+)
 
 
 PAGE1 = """
@@ -103,3 +111,252 @@ def test_enumerate_listing_pages_does_not_fetch_after_reaching_max_pages() -> No
 
     assert urls == ["https://example.com/page1"]
     assert fetch_calls == []
+
+
+def test_iter_listing_pages_fetches_each_page_once() -> None:
+    pages = {
+        "https://example.com/page1": PAGE1,
+        "https://example.com/page2": PAGE2,
+    }
+    fetch_calls: list[str] = []
+
+    def fetcher(url: str, timeout: float = 10.0):
+        fetch_calls.append(url)
+        return pages[url], None, 200
+
+    results = list(
+        iter_listing_pages(
+            start_url="https://example.com/page1",
+            fetcher=fetcher,
+            max_pages=5,
+        )
+    )
+
+    assert [page.url for page in results] == [
+        "https://example.com/page1",
+        "https://example.com/page2",
+    ]
+    assert fetch_calls == ["https://example.com/page1", "https://example.com/page2"]
+    assert results[0].html == PAGE1
+    assert next_link_href(results[0].soup) is not None
+    assert all(page.error is None for page in results)
+
+
+def test_iter_listing_pages_without_trees_follows_raw_next_links() -> None:
+    pages = {
+        "https://example.com/page1": PAGE1,
+        "https://example.com/page2": PAGE2,
+    }
+
+    def fetcher(url: str, timeout: float = 10.0):
+        return pages[url], None, 200
+
+    results = list(
+        iter_listing_pages(
+            start_url="https://example.com/page1",
+            fetcher=fetcher,
+            max_pages=5,
+            build_trees=False,
+        )
+    )
+
+    assert [page.url for page in results] == list(pages)
+    assert all(page.soup is None and page.html for page in results)
+
+
+def test_iter_listing_pages_yields_error_and_stops() -> None:
+    def fetcher(url: str, timeout: float = 10.0):
+        return None, "timeout", None
+
+    results = list(
+        iter_listing_pages(
+            start_url="https://example.com/page1",
+            fetcher=fetcher,
+            max_pages=5,
+        )
+    )
+
+    assert len(results) == 1
+    assert results[0].error == "timeout"
+    assert results[0].html is None
+    assert results[0].soup is None
+
+
+def test_iter_listing_pages_skips_duplicate_content() -> None:
+    html = """
+    <html><body><a rel="next" href="?page=2">Next</a></body></html>
+    """
+
+    def fetcher(url: str, timeout: float = 10.0):
+        return html, None, 200
+
+    results = list(
+        iter_listing_pages(
+            start_url="https://example.com/list",
+            fetcher=fetcher,
+            max_pages=5,
+        )
+    )
+
+    assert [page.url for page in results] == ["https://example.com/list"]
+
+
+def test_iter_listing_pages_respects_max_pages() -> None:
+    fetch_calls: list[str] = []
+    pages = {
+        "https://example.com/page1": PAGE1,
+        "https://example.com/page2": PAGE2,
+    }
+
+    def fetcher(url: str, timeout: float = 10.0):
+        fetch_calls.append(url)
+        return pages[url], None, 200
+
+    results = list(
+        iter_listing_pages(
+            start_url="https://example.com/page1",
+            fetcher=fetcher,
+            max_pages=1,
+        )
+    )
+
+    assert [page.url for page in results] == ["https://example.com/page1"]
+    assert fetch_calls == ["https://example.com/page1"]
+    assert results[0].truncated
+
+
+def test_iter_listing_pages_last_page_is_not_truncated() -> None:
+    pages = {
+        "https://example.com/page1": PAGE1,
+        "https://example.com/page2": PAGE2,
+    }
+
+    results = list(
+        iter_listing_pages(
+            start_url="https://example.com/page1",
+            fetcher=lambda url, timeout=10.0: (pages[url], None, 200),
+            max_pages=2,
+        )
+    )
+
+    assert [page.truncated for page in results] == [False, False]
+
+
+def _numbered_site(last_page: int):
+    base = "https://example.com/kinder"
+
+    def url_for(number: int) -> str:
+        return base if number == 1 else f"{base}?page={number}"
+
+    pages = {}
+    for number in range(1, last_page + 1):
+        link = f'<a rel="next" href="?page={number + 1}">Weiter</a>' if number < last_page else ""
+        pages[url_for(number)] = f"<html><body><p>Seite {number}</p>{link}</body></html>"
+    return url_for, pages
+
+
+def test_numbered_page_pattern_detects_query_parameter() -> None:
+    pattern = numbered_page_pattern(
+        "https://example.com/kinder?sort=date", "https://example.com/kinder?sort=date&page=2"
+    )
+
+    assert pattern is not None
+    assert pattern.next_number == 2
+    assert pattern.build(5) == "https://example.com/kinder?sort=date&page=5"
+
+
+def test_numbered_page_pattern_detects_path_segment() -> None:
+    pattern = numbered_page_pattern(
+        "https://example.com/events/seite/2", "https://example.com/events/seite/3"
+    )
+
+    assert pattern is not None
+    assert pattern.build(7) == "https://example.com/events/seite/7"
+
+
+def test_numbered_page_pattern_rejects_unrelated_urls() -> None:
+    assert numbered_page_pattern("https://example.com/page1", "https://example.com/next") is None
+    assert (
+        numbered_page_pattern("https://example.com/a?page=2", "https://example.com/a?page=5")
+        is None
+    )
+    assert numbered_page_pattern("https://example.com/a", "https://other.com/a?page=2") is None
+
+
+def test_iter_listing_pages_prefetches_numbered_pages_concurrently() -> None:
+    url_for, pages = _numbered_site(last_page=5)
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+    fetch_calls: list[str] = []
+
+    def fetcher(url: str, timeout: float = 10.0):
+        nonlocal active, peak
+        with lock:
+            fetch_calls.append(url)
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        if url not in pages:
+            return None, "404", 404
+        return pages[url], None, 200
+
+    results = list(
+        iter_listing_pages(url_for(1), fetcher=fetcher, max_pages=10, prefetch=3)
+    )
+
+    assert [page.url for page in results] == [url_for(n) for n in range(1, 6)]
+    assert all(page.error is None for page in results)
+    assert peak > 1
+    assert len(fetch_calls) == len(set(fetch_calls))
+
+
+def test_iter_listing_pages_prefetch_respects_max_pages() -> None:
+    url_for, pages = _numbered_site(last_page=10)
+    fetch_calls: list[str] = []
+    lock = threading.Lock()
+
+    def fetcher(url: str, timeout: float = 10.0):
+        with lock:
+            fetch_calls.append(url)
+        return pages[url], None, 200
+
+    results = list(
+        iter_listing_pages(url_for(1), fetcher=fetcher, max_pages=3, prefetch=4)
+    )
+
+    assert [page.url for page in results] == [url_for(1), url_for(2), url_for(3)]
+    assert sorted(fetch_calls) == sorted([url_for(1), url_for(2), url_for(3)])
+
+
+def test_iter_listing_pages_prefetch_stops_on_duplicate_content() -> None:
+    url_for, pages = _numbered_site(last_page=3)
+    # Past the end the site keeps serving its last page.
+    last = pages[url_for(3)].replace("</p>", '</p><a rel="next" href="?page=4">Weiter</a>')
+    pages[url_for(3)] = last
+
+    def fetcher(url: str, timeout: float = 10.0):
+        return pages.get(url, last), None, 200
+
+    results = list(
+        iter_listing_pages(url_for(1), fetcher=fetcher, max_pages=10, prefetch=2)
+    )
+
+    assert [page.url for page in results] == [url_for(1), url_for(2), url_for(3)]
+
+
+def test_iter_listing_pages_prefetch_stops_on_empty_page() -> None:
+    url_for, pages = _numbered_site(last_page=2)
+    pages[url_for(2)] = pages[url_for(2)].replace("</p>", '</p><a rel="next" href="?page=3">Weiter</a>')
+
+    def fetcher(url: str, timeout: float = 10.0):
+        return pages.get(url, "   "), None, 200
+
+    results = list(
+        iter_listing_pages(url_for(1), fetcher=fetcher, max_pages=10, prefetch=2)
+    )
+
+    assert [page.url for page in results] == [url_for(1), url_for(2), url_for(3)]
+    assert results[-1].error == "empty_response"
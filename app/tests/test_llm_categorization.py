@@ -4,6 +4,7 @@ from __future__ import annotations
 import json
 from unittest.mock import MagicMock, patch
 
+from app.services.llm.gateway import reset_llm_gateway
 from app.services.llm.summarizer import EventPageSummary, summarize_event_page
 
 
@@ -32,7 +33,7 @@ def test_summarize_returns_valid_category() -> None:
     mock_client = MagicMock()
     mock_client.chat.completions.create.return_value = _mock_openai_response(fake_data)
 
-    with patch("app.services.llm.summarizer.OpenAI", return_value=mock_client):
+    with patch("app.services.llm.gateway.OpenAI", return_value=mock_client):
         result = summarize_event_page("Puppet theater show page text.")
 
     assert result is not None
@@ -49,7 +50,7 @@ def test_summarize_returns_museum_category() -> None:
     mock_client = MagicMock()
     mock_client.chat.completions.create.return_value = _mock_openai_response(fake_data)
 
-    with patch("app.services.llm.summarizer.OpenAI", return_value=mock_client):
+    with patch("app.services.llm.gateway.OpenAI", return_value=mock_client):
         result = summarize_event_page("Museum page text.")
 
     assert result is not None
@@ -66,7 +67,7 @@ def test_invalid_category_falls_back_to_other() -> None:
     mock_client = MagicMock()
     mock_client.chat.completions.create.return_value = _mock_openai_response(fake_data)
 
-    with patch("app.services.llm.summarizer.OpenAI", return_value=mock_client):
+    with patch("app.services.llm.gateway.OpenAI", return_value=mock_client):
         result = summarize_event_page("Some event text.")
 
     assert result is not None
@@ -83,7 +84,7 @@ def test_missing_category_falls_back_to_other() -> None:
     mock_client = MagicMock()
     mock_client.chat.completions.create.return_value = _mock_openai_response(fake_data)
 
-    with patch("app.services.llm.summarizer.OpenAI", return_value=mock_client):
+    with patch("app.services.llm.gateway.OpenAI", return_value=mock_client):
         result = summarize_event_page("Some event text.")
 
     assert result is not None
@@ -103,7 +104,8 @@ def test_all_valid_categories_accepted() -> None:
         mock_client = MagicMock()
         mock_client.chat.completions.create.return_value = _mock_openai_response(fake_data)
 
-        with patch("app.services.llm.summarizer.OpenAI", return_value=mock_client):
+        reset_llm_gateway()  # the gateway pools its client; build one per mock
+        with patch("app.services.llm.gateway.OpenAI", return_value=mock_client):
             result = summarize_event_page("Event text.")
 
         assert result is not None
@@ -1,4 +1,5 @@
 from app.services.extract import llm_event_extractor
+from app.services.llm import gateway
 
 
 def test_build_completion_kwargs_uses_lowest_reasoning_effort() -> None:
@@ -44,11 +45,14 @@ def test_summarize_event_detail_returns_summary_and_cost(monkeypatch) -> None:
             self.completions = FakeCompletions()
 
     class FakeOpenAI:
-        def __init__(self, api_key: str) -> None:
+        def __init__(self, api_key: str, **client_kwargs) -> None:
             self.api_key = api_key
             self.chat = FakeChat()
 
-    monkeypatch.setattr(llm_event_extractor, "OpenAI", FakeOpenAI)
+        def close(self) -> None:
+            pass
+
+    monkeypatch.setattr(gateway, "OpenAI", FakeOpenAI)
 
     summary = llm_event_extractor.summarize_event_detail(
         "Plain detail text",
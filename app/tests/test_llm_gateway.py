@@ -0,0 +1,233 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import httpx
+import openai
+import pytest
+
+from app.services.fetch.cassette import configure_cassette
+from app.services.llm.gateway import (
+    AimdLimiter,
+    GatewayConfig,
+    LlmGateway,
+    acomplete_text,
+    llm_gateway,
+    reset_llm_gateway,
+)
+
+
+def _response(content: str, prompt_tokens: int = 10, completion_tokens: int = 5):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens),
+    )
+
+
+def _rate_limit_error(retry_after: str | None = None) -> openai.RateLimitError:
+    headers = {"retry-after": retry_after} if retry_after is not None else {}
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, headers=headers, request=request)
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+def _gateway(client: MagicMock, sleeps: list[float]) -> LlmGateway:
+    gateway = LlmGateway(
+        GatewayConfig(max_retries=2, backoff_base_s=0.5, max_concurrency=4),
+        sleep=sleeps.append,
+    )
+    gateway.client = lambda: client  # type: ignore[method-assign]
+    return gateway
+
+
+def test_retries_rate_limit_honouring_retry_after() -> None:
+    client = MagicMock()
+    client.chat.completions.create.side_effect = [_rate_limit_error("2"), _response("ok")]
+    sleeps: list[float] = []
+    gateway = _gateway(client, sleeps)
+
+    assert gateway.complete_text("site", model="m", messages=[]) == "ok"
+
+    assert sleeps == [2.0]
+    stats = gateway.stats["site"]
+    assert (stats.calls, stats.retries, stats.rate_limited, stats.errors) == (1, 1, 1, 0)
+    assert gateway.limiter.limit == 2.5  # halved, then one success
+    assert gateway.limiter.in_flight == 0
+
+
+def test_gives_up_after_max_retries() -> None:
+    client = MagicMock()
+    client.chat.completions.create.side_effect = [_rate_limit_error() for _ in range(3)]
+    sleeps: list[float] = []
+    gateway = _gateway(client, sleeps)
+
+    with pytest.raises(openai.RateLimitError):
+        gateway.complete("site", model="m", messages=[])
+
+    assert len(sleeps) == 2
+    assert all(0 <= delay <= 1.0 for delay in sleeps)
+    assert gateway.stats["site"].errors == 1
+    assert gateway.limiter.in_flight == 0
+
+
+def test_does_not_retry_other_errors() -> None:
+    client = MagicMock()
+    client.chat.completions.create.side_effect = ValueError("bad request")
+    sleeps: list[float] = []
+    gateway = _gateway(client, sleeps)
+
+    with pytest.raises(ValueError):
+        gateway.complete("site", model="m", messages=[])
+
+    assert sleeps == []
+    assert client.chat.completions.create.call_count == 1
+
+
+def test_counts_tokens_and_latency_per_call_site() -> None:
+    client = MagicMock()
+    client.chat.completions.create.side_effect = [_response("a", 100, 20), _response("b", 50, 10)]
+    gateway = _gateway(client, [])
+
+    gateway.complete_text("summarize", model="m", messages=[])
+    gateway.complete_text("summarize", model="m", messages=[])
+
+    stats = gateway.stats["summarize"]
+    assert (stats.calls, stats.prompt_tokens, stats.completion_tokens) == (2, 150, 30)
+    assert len(stats.latencies_s) == 2
+    assert gateway.summary_lines()[0].startswith(
+        "llm summarize calls=2 errors=0 retries=0 rate_limited=0 prompt_tokens=150"
+    )
+
+
+def test_aimd_limiter_halves_on_throttle_and_grows_on_success() -> None:
+    now = [0.0]
+    limiter = AimdLimiter(8, 1, time_fn=lambda: now[0])
+
+    for _ in range(8):
+        assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+
+    limiter.release(throttled=True)
+    limiter.release(throttled=True)  # same burst, inside the cooldown
+    assert limiter.limit == 4.0
+
+    now[0] = 5.0
+    limiter.release(throttled=True)
+    assert limiter.limit == 2.0
+
+    for _ in range(5):
+        limiter.release()
+    assert limiter.in_flight == 0
+    assert 3.0 < limiter.limit < 4.0
+
+
+def test_async_completion_goes_through_pooled_async_client() -> None:
+    client = MagicMock()
+
+    async def create(**kwargs):
+        return _response("async ok")
+
+    client.chat.completions.create = create
+
+    with patch("app.services.llm.gateway.AsyncOpenAI", return_value=client) as factory:
+        assert asyncio.run(acomplete_text("site", model="m", messages=[])) == "async ok"
+
+    assert factory.call_args.kwargs["max_retries"] == 0
+
+
+def test_retry_after_is_capped_at_backoff_max() -> None:
+    client = MagicMock()
+    client.chat.completions.create.side_effect = [_rate_limit_error("86400"), _response("ok")]
+    sleeps: list[float] = []
+    gateway = LlmGateway(GatewayConfig(max_retries=1, backoff_max_s=30.0), sleep=sleeps.append)
+    gateway.client = lambda: client  # type: ignore[method-assign]
+
+    assert gateway.complete_text("site", model="m", messages=[]) == "ok"
+    assert sleeps == [30.0]
+
+
+def test_client_closed_on_cassette_change_and_reset(tmp_path) -> None:
+    built: list[MagicMock] = []
+
+    def factory(**kwargs):
+        built.append(MagicMock())
+        return built[-1]
+
+    with patch("app.services.llm.gateway.OpenAI", side_effect=factory):
+        gateway = llm_gateway()
+        first = gateway.client()
+        assert gateway.client() is first
+        configure_cassette("record", str(tmp_path / "llm.jsonl.gz"))
+        try:
+            second = gateway.client()
+        finally:
+            configure_cassette("off")
+
+    assert second is not first
+    first.close.assert_called_once()
+    reset_llm_gateway()
+    second.close.assert_called_once()
+
+
+def test_reset_closes_async_clients_of_live_loops() -> None:
+    client = MagicMock()
+    closed: list[bool] = []
+
+    async def create(**kwargs):
+        return _response("ok")
+
+    async def close():
+        closed.append(True)
+
+    client.chat.completions.create = create
+    client.close = close
+    loop = asyncio.new_event_loop()
+    try:
+        with patch("app.services.llm.gateway.AsyncOpenAI", return_value=client):
+            loop.run_until_complete(acomplete_text("site", model="m", messages=[]))
+        reset_llm_gateway()
+    finally:
+        loop.close()
+
+    assert closed == [True]
+
+
+def test_replaced_client_is_closed_after_its_call_finishes(tmp_path) -> None:
+    built: list[MagicMock] = []
+    gateway = LlmGateway(GatewayConfig(max_retries=0), sleep=lambda _: None)
+
+    def create(**kwargs):
+        configure_cassette("record", str(tmp_path / "llm.jsonl.gz"))
+        try:
+            assert gateway.client() is not built[0]
+        finally:
+            configure_cassette("off")
+        built[0].close.assert_not_called()
+        return _response("ok")
+
+    def factory(**kwargs):
+        built.append(MagicMock())
+        built[-1].chat.completions.create.side_effect = create
+        return built[-1]
+
+    with patch("app.services.llm.gateway.OpenAI", side_effect=factory):
+        assert gateway.complete_text("site", model="m", messages=[]) == "ok"
+
+    built[0].close.assert_called_once()
+    built[1].close.assert_not_called()
+
+
+def test_async_acquire_waits_for_release_from_another_thread() -> None:
+    limiter = AimdLimiter(1)
+    assert limiter.try_acquire()
+
+    async def acquire() -> None:
+        waiting = asyncio.ensure_future(limiter.acquire_async())
+        await asyncio.sleep(0)
+        assert not waiting.done()
+        threading.Timer(0.01, limiter.release).start()
+        await asyncio.wait_for(waiting, timeout=1.0)
+
+    asyncio.run(acquire())
+    assert limiter.in_flight == 1
@@ -0,0 +1,159 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.llm import response_cache
+from app.services.llm.client import generate_kids_events_munich
+from app.services.llm.gateway import complete_text
+from app.services.llm.response_cache import (
+    LlmResponseCache,
+    completion_key,
+    configure_llm_cache,
+    is_json_object,
+)
+from app.services.llm.summarizer import summarize_event_page
+
+
+def _client(*contents: str) -> MagicMock:
+    responses = []
+    for content in contents:
+        message = MagicMock()
+        message.content = content
+        choice = MagicMock()
+        choice.message = message
+        response = MagicMock()
+        response.choices = [choice]
+        responses.append(response)
+    client = MagicMock()
+    client.chat.completions.create.side_effect = responses
+    return client
+
+
+@pytest.fixture
+def active_cache(tmp_path):
+    cache = configure_llm_cache("use", str(tmp_path / "llm.sqlite"))
+    yield cache
+    configure_llm_cache("off")
+
+
+def test_completion_key_covers_model_prompts_and_sampling() -> None:
+    base = {
+        "model": "gpt-4.1-nano",
+        "messages": [{"role": "user", "content": "text"}],
+        "temperature": 0.3,
+    }
+
+    assert completion_key(base) == completion_key(dict(reversed(list(base.items()))))
+    assert completion_key(base) != completion_key({**base, "model": "gpt-4o-mini"})
+    assert completion_key(base) != completion_key({**base, "temperature": 0.0})
+    assert completion_key(base) != completion_key(
+        {**base, "messages": [{"role": "user", "content": "other text"}]}
+    )
+
+
+def test_gateway_serves_repeated_completion_from_cache(active_cache) -> None:
+    client = _client('{"a": 1}')
+    kwargs = {"model": "m", "messages": [{"role": "user", "content": "x"}]}
+
+    with patch("app.services.llm.gateway.OpenAI", return_value=client):
+        first = complete_text("site", accept=is_json_object, **kwargs)
+        second = complete_text("site", accept=is_json_object, **kwargs)
+
+    assert first == second == '{"a": 1}'
+    assert client.chat.completions.create.call_count == 1
+    stats = active_cache.stats["site"]
+    assert (stats.hits, stats.misses, stats.stores) == (1, 1, 1)
+    assert "site=1/2" in active_cache.summary_line()
+
+
+def test_cache_does_not_store_rejected_content(active_cache) -> None:
+    client = _client("not json", '{"ok": true}')
+    kwargs = {"model": "m", "messages": [{"role": "user", "content": "x"}]}
+
+    with patch("app.services.llm.gateway.OpenAI", return_value=client):
+        assert complete_text("site", accept=is_json_object, **kwargs) == "not json"
+        assert complete_text("site", accept=is_json_object, **kwargs) == '{"ok": true}'
+    assert client.chat.completions.create.call_count == 2
+
+
+def test_without_active_cache_every_call_goes_to_the_api() -> None:
+    configure_llm_cache("off")
+    client = _client("a", "b")
+
+    with patch("app.services.llm.gateway.OpenAI", return_value=client):
+        assert complete_text("site", model="m") == "a"
+        assert complete_text("site", model="m") == "b"
+    assert response_cache.active_llm_cache() is None
+
+
+def test_cache_expires_entries_after_ttl(tmp_path) -> None:
+    now = [1000.0]
+    cache = LlmResponseCache(tmp_path / "llm.sqlite", ttl_s=60, time_fn=lambda: now[0])
+    cache.put("site", "k", "value")
+
+    now[0] += 59
+    assert cache.get("site", "k") == "value"
+    now[0] += 1
+    assert cache.get("site", "k") is None
+    assert cache.total_bytes() == 0
+
+
+def test_cache_evicts_least_recently_used_entries(tmp_path) -> None:
+    now = [0.0]
+    cache = LlmResponseCache(tmp_path / "llm.sqlite", max_bytes=25, time_fn=lambda: now[0])
+    for key in ("a", "b"):
+        now[0] += 1
+        cache.put("site", key, "x" * 10)
+    now[0] += 1
+    assert cache.get("site", "a") is not None
+
+    now[0] += 1
+    cache.put("site", "c", "x" * 10)
+
+    assert cache.get("site", "b") is None
+    assert cache.get("site", "a") is not None
+    assert cache.get("site", "c") is not None
+    assert cache.total_bytes() == 20
+
+
+def test_refresh_mode_skips_reads_but_stores(tmp_path) -> None:
+    path = tmp_path / "llm.sqlite"
+    LlmResponseCache(path).put("site", "k", "old")
+    refresh = LlmResponseCache(path, mode="refresh")
+
+    assert refresh.get("site", "k") is None
+    refresh.put("site", "k", "new")
+    assert LlmResponseCache(path).get("site", "k") == "new"
+
+
+def test_configure_llm_cache_rejects_unknown_mode() -> None:
+    with pytest.raises(ValueError):
+        configure_llm_cache("sometimes")
+
+
+def test_summarize_event_page_reuses_cached_response(active_cache) -> None:
+    content = json.dumps({"summary": "Puppet show.", "is_paid": True, "address": None})
+    client = _client(content)
+
+    with patch("app.services.llm.gateway.OpenAI", return_value=client):
+        first = summarize_event_page("Puppentheater im Gasteig")
+        second = summarize_event_page("Puppentheater im Gasteig")
+
+    assert first == second
+    assert first.summary == "Puppet show."
+    assert client.chat.completions.create.call_count == 1
+    assert active_cache.stats["summarize_event_page"].hits == 1
+
+
+def test_constant_prompts_bypass_cache_on_every_run(active_cache, monkeypatch) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    client = _client('{"events": [{"title": "A"}]}', '{"events": [{"title": "B"}]}')
+
+    with patch("app.services.llm.gateway.OpenAI", return_value=client):
+        first = generate_kids_events_munich()
+        second = generate_kids_events_munich()
+
+    assert [first[0]["title"], second[0]["title"]] == ["A", "B"]
+    assert client.chat.completions.create.call_count == 2
+    assert active_cache.total_bytes() == 0
@@ -0,0 +1,102 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.models.llm_stage_usage import LlmStageUsage
+from app.services.llm.gateway import GatewayConfig, LlmGateway, estimate_cost_usd
+from app.services.llm.usage import record_llm_usage, save_llm_usage
+from app.utils.timing import RunStats
+
+STARTED_AT = datetime(2026, 3, 1, 8, 0, tzinfo=timezone.utc)
+
+
+def _make_session():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, future=True)()
+
+
+def _response(prompt_tokens: int, completion_tokens: int):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content="{}"))],
+        usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens),
+    )
+
+
+def _gateway(*responses) -> LlmGateway:
+    client = MagicMock()
+    client.chat.completions.create.side_effect = list(responses)
+    gateway = LlmGateway(GatewayConfig(), sleep=lambda _: None)
+    gateway.client = lambda: client  # type: ignore[method-assign]
+    return gateway
+
+
+def test_stage_stats_roll_up_call_sites_with_cost() -> None:
+    gateway = _gateway(_response(1000, 200), _response(500, 100), _response(2000, 0))
+
+    gateway.complete("summarize_event_page", model="gpt-4.1-nano", messages=[])
+    gateway.complete("summarize_event_detail", model="gpt-5.1", messages=[])
+    gateway.complete("some_new_call_site", model="unknown-model", messages=[])
+
+    stages = gateway.stage_stats()
+    assert list(stages) == ["detail_summarization", "other"]
+    detail = stages["detail_summarization"]
+    assert (detail.calls, detail.prompt_tokens, detail.completion_tokens) == (2, 1500, 300)
+    assert detail.cost_usd == estimate_cost_usd("gpt-4.1-nano", 1000, 200) + estimate_cost_usd(
+        "gpt-5.1", 500, 100
+    )
+    assert stages["other"].cost_usd == 0.0
+    assert gateway.totals().calls == 3
+
+
+def test_record_llm_usage_persists_one_row_per_stage() -> None:
+    session = _make_session()
+    gateway = _gateway(_response(100, 10), _response(300, 30))
+    gateway.complete("extract_events_from_text", model="gpt-5.1", messages=[])
+    gateway.complete("backfill_categories", model="gpt-4.1-nano", messages=[])
+
+    rows = record_llm_usage(session, "extract_muenchen_kinder", STARTED_AT, gateway=gateway)
+    session.commit()
+
+    stored = session.scalars(select(LlmStageUsage).order_by(LlmStageUsage.stage)).all()
+    assert [row.stage for row in stored] == ["categorization", "listing_extraction"]
+    assert {row.run_id for row in rows} == {stored[0].run_id}
+    assert (stored[1].calls, stored[1].prompt_tokens, stored[1].completion_tokens) == (1, 100, 10)
+    assert stored[1].latency_p95_s >= stored[1].latency_p50_s >= 0.0
+    assert stored[1].script == "extract_muenchen_kinder"
+
+
+def test_record_llm_usage_skips_runs_without_calls() -> None:
+    session = _make_session()
+
+    assert record_llm_usage(session, "extract_muenchen_kinder", STARTED_AT, gateway=_gateway()) == []
+
+
+def test_save_llm_usage_commits_and_survives_failures() -> None:
+    session = _make_session()
+    gateway = _gateway(_response(100, 10))
+    gateway.complete("extract_events_from_text", model="gpt-5.1", messages=[])
+
+    save_llm_usage(session, "run_weekly", STARTED_AT, gateway=gateway)
+    session.rollback()
+    assert [row.script for row in session.scalars(select(LlmStageUsage))] == ["run_weekly"]
+
+    broken = MagicMock()
+    broken.commit.side_effect = RuntimeError("database is locked")
+    save_llm_usage(broken, "run_weekly", STARTED_AT, gateway=gateway)
+    broken.rollback.assert_called_once()
+
+
+def test_run_stats_combines_llm_usage() -> None:
+    totals = RunStats.combine(
+        [
+            RunStats(llm_calls=2, llm_prompt_tokens=100, llm_completion_tokens=20, llm_cost_usd=0.5),
+            RunStats(llm_calls=1, llm_prompt_tokens=50, llm_completion_tokens=5, llm_cost_usd=0.25),
+        ]
+    )
+
+    assert totals.llm_line() == "llm_calls=3 prompt_tokens=150 completion_tokens=25 cost=$0.7500"
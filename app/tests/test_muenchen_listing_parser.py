@@ -1,4 +1,20 @@
-from app.services.extract.muenchen_listing_parser import parse_listing
+from bs4 import BeautifulSoup
+import pytest
+
+from app.scripts.benchmark_listing_parse import (
+    benchmark_page,
+    synthetic_generic_page,
+    synthetic_listing_page,
+)
+from app.services.extract import muenchen_listing_parser as listing_parser
+from app.services.extract.muenchen_listing_parser import (
+    ScopedTree,
+    build_tree,
+    next_link_href,
+    parse_listing,
+    resolve_backend,
+    scan_next_link_href,
+)
 
 
 HTML = """
@@ -249,3 +265,149 @@ def test_parse_listing_extracts_real_muenchen_event_rows() -> None:
     assert events[1]["ticket_url"].startswith("https://www.muenchenticket.de/event/die-kleine-zauberfloete")
     assert events[1]["end_time"] == "2026-03-06T17:00:00+01:00"
     assert events[1]["range_end_date"] == "2026-07-11"
+
+
+NOISY_HTML = """
+<!DOCTYPE html>
+<html><head><title>Kinder</title><style>.card { color: red; }</style></head><body>
+<nav><a href="/veranstaltungen/event/kinder">Alle</a></nav>
+<div class="card teaser">
+ <!-- teaser start -->
+ <a href="/veranstaltungen/kinder/puppentheater">Puppen&shy;theater &amp; Musik</a>
+ <script>var tracking = "Sa. 07.03.2026 10:00 Uhr";</script>
+ <div>Sa. 07.03.2026 10:00&nbsp;Uhr</div>
+ <div class="address"> Hans-Sachs-Str. <b>7</b> </div>
+ <a class="btn" href="https://karten.example.com/puppen" aria-label="Karten kaufen">Kaufen</a>
+</div>
+<section>
+ <h2><a href="/veranstaltungen/kinder/zirkus">Zirkus</a></h2>
+ <p>So. 08.03.2026 14:00 - 15:30 Uhr</p>
+ <template><div class="location">Hidden</div></template>
+ <span class="location">Zirkuszelt</span>
+</section>
+<a href="/veranstaltungen/kinder/ohne-karte">Ohne Karte</a>
+<a rel="next" href="?page=2">Weiter</a>
+</body></html>
+"""
+
+SPLIT_SCHEDULE_HTML = """
+<html><body>
+<ul>
+ <li><div class="teaser">
+  <a href="/veranstaltungen/kinder/lesung">Lesung</a>
+  <span>So. 08.03.2026</span><span>11:00</span> Uhr
+ </div></li>
+ <li><a class="card-link" href="/veranstaltungen/kinder/ohne-termin">Ohne Termin</a></li>
+</ul>
+</body></html>
+"""
+
+FIXTURES = [
+    HTML,
+    DETAIL_VARIANT_HTML,
+    TICKET_HTML,
+    OCCURRENCE_HTML,
+    NESTED_CARD_HTML,
+    NESTED_NON_CARD_HTML,
+    REAL_LISTING_HTML,
+    NOISY_HTML,
+    SPLIT_SCHEDULE_HTML,
+]
+
+
+@pytest.mark.parametrize("html", FIXTURES)
+def test_lxml_backend_matches_bs4_backend(html: str) -> None:
+    pytest.importorskip("lxml")
+    base_url = "https://www.muenchen.de/veranstaltungen/event/kinder"
+
+    expected = parse_listing(html, base_url, soup=build_tree(html, "bs4", scoped=False))
+    actual = parse_listing(html, base_url, backend="lxml")
+
+    assert expected
+    assert actual == expected
+    assert next_link_href(build_tree(html, "lxml")) == next_link_href(build_tree(html, "bs4"))
+
+
+@pytest.mark.parametrize("html", FIXTURES)
+def test_scoped_parse_matches_full_parse(html: str) -> None:
+    base_url = "https://www.muenchen.de/veranstaltungen/event/kinder"
+    full = build_tree(html, "bs4", scoped=False)
+    scoped = build_tree(html, "bs4")
+
+    assert parse_listing(html, base_url, soup=scoped) == parse_listing(html, base_url, soup=full)
+    assert next_link_href(scoped) == next_link_href(full)
+    assert scan_next_link_href(html) == next_link_href(full)
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        '<a rel="next" href="?page=2&amp;sort=date">Weiter</a>',
+        "<A HREF=/seite/3 REL=next>Weiter</A>",
+        "<a href='/a' rel='prev'>Zurück</a><a class=x rel='nofollow next' href='/n'>Weiter</a>",
+        '<a rel="next">Weiter</a><a rel="next" href="/later">Weiter</a>',
+        '<a data-tip="1 > 0" rel="next" href="/q">Weiter</a>',
+        '<abbr rel="next">n.</abbr><p>next</p>',
+    ],
+)
+def test_scan_next_link_href_matches_tree_lookup(html: str) -> None:
+    assert scan_next_link_href(html) == next_link_href(build_tree(html, "bs4", scoped=False))
+
+
+def test_scoped_tree_keeps_only_event_items_and_next_link() -> None:
+    html = REAL_LISTING_HTML.replace(
+        "<html><body>",
+        '<html><head><script>var x = 1;</script></head><body><nav><a href="/">Start</a></nav>',
+    ).replace("</body>", '<footer>Impressum</footer><a rel="next" href="?page=2">Weiter</a></body>')
+
+    tree = build_tree(html, "bs4")
+
+    assert isinstance(tree, ScopedTree)
+    assert [tag.name for tag in tree.tree.contents] == ["div", "div", "a"]
+    assert "Impressum" not in tree.tree.get_text()
+    assert next_link_href(tree) == "?page=2"
+    assert len(parse_listing(html, "https://www.muenchen.de/", soup=tree)) == 2
+
+
+def test_backend_switch_reads_env_and_falls_back_without_lxml(monkeypatch) -> None:
+    monkeypatch.setenv("PLANZ_LISTING_PARSER", "lxml")
+    monkeypatch.setattr(listing_parser, "_lxml_html", None)
+
+    assert resolve_backend() == "bs4"
+    assert isinstance(build_tree(HTML), BeautifulSoup)
+    with pytest.raises(ValueError):
+        resolve_backend("html5lib")
+
+
+def test_benchmark_modes_agree_on_synthetic_listing_page() -> None:
+    html = synthetic_listing_page(items=5, chrome_links=10)
+
+    full = benchmark_page(html, "bs4-full", repeat=1)
+    scoped = benchmark_page(html, "bs4-scoped", repeat=1)
+
+    assert full.items == scoped.items == 5
+    assert scoped.peak_kib < full.peak_kib
+
+
+def test_parse_listing_finds_schedule_split_across_elements() -> None:
+    events = parse_listing(
+        SPLIT_SCHEDULE_HTML,
+        base_url="https://www.muenchen.de/veranstaltungen/event/kinder",
+        backend="bs4",
+    )
+
+    assert [event["title"] for event in events] == ["Lesung", "Ohne Termin"]
+    assert events[0]["raw_schedule"] == "So. 08.03.2026 11:00 Uhr"
+    assert events[0]["start_time"] == "2026-03-08T11:00:00+01:00"
+    # The outermost ancestor holding a schedule wraps both links.
+    assert events[1]["listing_text"] == events[0]["listing_text"]
+
+
+def test_generic_listing_handles_large_pages() -> None:
+    html = synthetic_generic_page(items=1500)
+
+    events = parse_listing(html, "https://www.muenchen.de/veranstaltungen/event/kinder")
+
+    assert len(events) == 1500
+    assert events[-1]["detail_url"].endswith("/event-1499")
+    assert all(event["ticket_url"] for event in events)
@@ -0,0 +1,168 @@
+from pathlib import Path
+
+from app.services.fetch.conditional import ConditionalFetcher
+from app.services.fetch.http_fetcher import ConditionalFetchResult
+from app.services.fetch.page_cache import PageCache, parse_domain_ttls
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _blob_files(root: Path) -> list[Path]:
+    return list((root / "blobs").rglob("*.gz"))
+
+
+def test_page_cache_round_trips_by_canonical_url(tmp_path: Path) -> None:
+    cache = PageCache(tmp_path)
+    cache.put("https://www.muenchen.de/event/1/", "<html>Ä</html>", etag='"e1"')
+
+    cached = cache.get("www.muenchen.de/event/1")
+
+    assert cached is not None
+    assert cached.text == "<html>Ä</html>"
+    assert cached.etag == '"e1"'
+    assert cached.fresh is True
+
+
+def test_page_cache_stores_identical_bodies_once(tmp_path: Path) -> None:
+    cache = PageCache(tmp_path)
+    cache.put("https://example.com/a", "same body")
+    cache.put("https://example.com/b", "same body")
+
+    assert len(_blob_files(tmp_path)) == 1
+    assert cache.get("https://example.com/b").text == "same body"
+
+
+def test_page_cache_applies_domain_ttls(tmp_path: Path) -> None:
+    clock = _Clock()
+    cache = PageCache(
+        tmp_path,
+        default_ttl_s=100,
+        domain_ttls={"muenchen.de": 10},
+        time_fn=clock,
+    )
+    cache.put("https://www.muenchen.de/event", "short-lived")
+    cache.put("https://example.com/event", "long-lived")
+
+    clock.now += 50
+
+    assert cache.get("https://www.muenchen.de/event").fresh is False
+    assert cache.get("https://example.com/event").fresh is True
+
+
+def test_page_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    clock = _Clock()
+    cache = PageCache(tmp_path, max_bytes=10_000_000, time_fn=clock)
+    for name in ["a", "b", "c"]:
+        cache.put(f"https://example.com/{name}", name * 5000)
+        clock.now += 1
+    cache.get("https://example.com/a")
+    clock.now += 1
+
+    cache.max_bytes = cache.total_bytes() - 1
+    cache.put("https://example.com/d", "d" * 5000)
+
+    assert cache.get("https://example.com/b") is None
+    assert cache.get("https://example.com/a") is not None
+    assert cache.get("https://example.com/d") is not None
+    assert cache.total_bytes() <= cache.max_bytes
+
+
+def test_page_cache_survives_reopen(tmp_path: Path) -> None:
+    PageCache(tmp_path).put("https://example.com/a", "persisted")
+
+    assert PageCache(tmp_path).get("https://example.com/a").text == "persisted"
+
+
+def test_parse_domain_ttls_skips_invalid_entries() -> None:
+    assert parse_domain_ttls("muenchen.de=60, bad, x.de=oops,EXAMPLE.com=5") == {
+        "muenchen.de": 60.0,
+        "example.com": 5.0,
+    }
+
+
+def _recording_fetch(calls: list[dict], result: ConditionalFetchResult):
+    def fetch(url, etag=None, last_modified=None, timeout=10.0):
+        calls.append({"url": url, "etag": etag, "last_modified": last_modified})
+        return result
+
+    return fetch
+
+
+def test_conditional_fetcher_serves_fresh_cache_without_network(tmp_path: Path) -> None:
+    cache = PageCache(tmp_path)
+    cache.put("https://example.com/detail", "cached detail")
+    calls: list[dict] = []
+    fetcher = ConditionalFetcher(
+        fetch=_recording_fetch(calls, ConditionalFetchResult(text="new", error=None, status=200)),
+        cache=cache,
+    )
+
+    text, error, _status = fetcher("https://example.com/detail")
+
+    assert text == "cached detail"
+    assert error is None
+    assert calls == []
+    assert fetcher.stats.cache_hits == 1
+
+
+def test_conditional_fetcher_revalidates_stale_cache_entry(tmp_path: Path) -> None:
+    clock = _Clock()
+    cache = PageCache(tmp_path, default_ttl_s=10, time_fn=clock)
+    cache.put("https://example.com/detail", "cached detail", etag='"v1"')
+    clock.now += 60
+    calls: list[dict] = []
+    fetcher = ConditionalFetcher(
+        fetch=_recording_fetch(
+            calls,
+            ConditionalFetchResult(text=None, error=None, status=304, not_modified=True),
+        ),
+        cache=cache,
+    )
+
+    text, _error, _status = fetcher("https://example.com/detail")
+
+    assert text == "cached detail"
+    assert calls[0]["etag"] == '"v1"'
+    assert fetcher.stats.not_modified == 1
+    assert cache.get("https://example.com/detail").fresh is True
+
+
+def test_conditional_fetcher_refresh_mode_redownloads(tmp_path: Path) -> None:
+    cache = PageCache(tmp_path)
+    cache.put("https://example.com/detail", "old detail", etag='"v1"')
+    calls: list[dict] = []
+    fetcher = ConditionalFetcher(
+        fetch=_recording_fetch(
+            calls,
+            ConditionalFetchResult(text="new detail", error=None, status=200, etag='"v2"'),
+        ),
+        cache=cache,
+        cache_mode="refresh",
+    )
+
+    text, _error, _status = fetcher("https://example.com/detail")
+
+    assert text == "new detail"
+    assert calls[0]["etag"] is None
+    assert cache.get("https://example.com/detail").text == "new detail"
+
+
+def test_conditional_fetcher_keeps_truncated_bodies_out_of_the_cache(tmp_path: Path) -> None:
+    cache = PageCache(tmp_path)
+    fetcher = ConditionalFetcher(
+        fetch=_recording_fetch(
+            [],
+            ConditionalFetchResult(text="<html>cut", error=None, status=200, truncated="max_bytes"),
+        ),
+        cache=cache,
+    )
+
+    assert fetcher("https://example.com/detail")[0] == "<html>cut"
+    assert cache.get("https://example.com/detail") is None
+    assert fetcher.pages == {}
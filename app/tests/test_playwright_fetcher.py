@@ -1,6 +1,11 @@
+import asyncio
 import types
 
-from app.services.fetch.playwright_fetcher import fetch_url_playwright
+import pytest
+
+from app.services.fetch import playwright_fetcher
+from app.services.fetch.browser_pool import BrowserPool
+from app.services.fetch.playwright_fetcher import fetch_url_playwright, fetch_urls_playwright
 
 
 class _DummyResponse:
@@ -10,60 +15,179 @@ class _DummyResponse:
 
 
 class _DummyPage:
-    def __init__(self, response):
+    def __init__(self, response, tracker, delay: float = 0.0):
         self._response = response
+        self._tracker = tracker
+        self._delay = delay
+        self.url = None
         self.content_called = False
         self.goto_called = False
+        self.wait_until = None
+        self.routes = []
+        self.waited_for = []
 
     async def goto(self, url, wait_until=None, timeout=None):
         self.goto_called = True
+        self.wait_until = wait_until
+        self.url = url
+        self._tracker.active += 1
+        self._tracker.peak = max(self._tracker.peak, self._tracker.active)
+        await asyncio.sleep(self._delay)
+        self._tracker.active -= 1
         return self._response
 
     async def content(self):
         self.content_called = True
-        return "<html>ok</html>"
+        return f"<html>{self.url}</html>"
 
+    def on(self, event, handler):
+        return None
 
-class _DummyBrowser:
-    def __init__(self, page):
-        self._page = page
+    async def route(self, pattern, handler):
+        self.routes.append(pattern)
+
+    async def wait_for_selector(self, selector, timeout=None):
+        self.waited_for.append(selector)
+
+
+class _DummyBrowserContext:
+    def __init__(self, browser):
+        self._browser = browser
         self.closed = False
 
     async def new_page(self):
-        return self._page
+        page = _DummyPage(_DummyResponse(), self._browser.tracker, delay=self._browser.tracker.delay)
+        self._browser.pages.append(page)
+        return page
 
     async def close(self):
         self.closed = True
 
 
-class _DummyContext:
-    def __init__(self, browser):
-        self._browser = browser
+class _DummyBrowser:
+    def __init__(self, tracker):
+        self.tracker = tracker
+        self.pages: list[_DummyPage] = []
+        self.contexts: list[_DummyBrowserContext] = []
+        self.closed = False
+
+    async def new_context(self):
+        context = _DummyBrowserContext(self)
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.closed = True
+
+
+class _DummyPlaywright:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.browsers: list[_DummyBrowser] = []
+        self.exited = False
+        self.active = 0
+        self.peak = 0
 
     async def __aenter__(self):
         return types.SimpleNamespace(chromium=self)
 
     async def __aexit__(self, exc_type, exc, tb):
+        self.exited = True
         return False
 
     async def launch(self, headless=True):
-        return self._browser
+        browser = _DummyBrowser(self)
+        self.browsers.append(browser)
+        return browser
 
 
-def test_playwright_fetcher_uses_goto(monkeypatch):
-    response = _DummyResponse()
-    page = _DummyPage(response)
-    browser = _DummyBrowser(page)
-    ctx = _DummyContext(browser)
+@pytest.fixture
+def dummy_playwright(monkeypatch):
+    ctx = _DummyPlaywright()
+    monkeypatch.setattr(playwright_fetcher, "_async_playwright", lambda: ctx)
+    playwright_fetcher.close_browser_pool()
+    yield ctx
+    playwright_fetcher.close_browser_pool()
 
-    monkeypatch.setattr(
-        "app.services.fetch.playwright_fetcher._async_playwright", lambda: ctx
-    )
 
+def test_playwright_fetcher_uses_goto(dummy_playwright):
     content, err, status = fetch_url_playwright("https://example.com")
 
     assert err is None
     assert status == 200
-    assert content == "<html>ok</html>"
+    assert content == "<html>https://example.com</html>"
+    page = dummy_playwright.browsers[0].pages[0]
     assert page.goto_called is True
     assert page.content_called is True
+
+
+def test_playwright_fetcher_reuses_browser_with_isolated_contexts(dummy_playwright):
+    fetch_url_playwright("https://www.muenchen.de/a")
+    fetch_url_playwright("https://www.muenchen.de/b")
+
+    assert len(dummy_playwright.browsers) == 1
+    browser = dummy_playwright.browsers[0]
+    assert len(browser.contexts) == 2
+    assert all(context.closed for context in browser.contexts)
+
+    playwright_fetcher.close_browser_pool()
+    assert browser.closed is True
+    assert dummy_playwright.exited is True
+
+
+def test_playwright_fetch_urls_renders_allowlisted_in_order(dummy_playwright):
+    results = fetch_urls_playwright(
+        [
+            "https://www.muenchen.de/a",
+            "https://other.example/b",
+            "https://muenchen.de/c",
+        ]
+    )
+
+    assert results[0] == ("<html>https://www.muenchen.de/a</html>", None, 200)
+    assert results[1] == (None, "not_allowlisted", None)
+    assert results[2] == ("<html>https://muenchen.de/c</html>", None, 200)
+
+
+def test_browser_pool_recycles_after_n_pages():
+    ctx = _DummyPlaywright()
+    pool = BrowserPool(playwright_factory=lambda: ctx, recycle_after=2)
+    try:
+        for idx in range(5):
+            pool.fetch(f"https://example.com/{idx}")
+    finally:
+        pool.close()
+
+    assert len(ctx.browsers) == 3
+    assert [len(browser.pages) for browser in ctx.browsers] == [2, 2, 1]
+    assert all(browser.closed for browser in ctx.browsers)
+    assert pool.stats.recycles == 2
+
+
+def test_browser_pool_renders_concurrently_up_to_max_pages():
+    ctx = _DummyPlaywright(delay=0.05)
+    pool = BrowserPool(playwright_factory=lambda: ctx, max_pages=3)
+    urls = [f"https://example.com/{idx}" for idx in range(6)]
+    try:
+        results = pool.fetch_many(urls)
+    finally:
+        pool.close()
+
+    assert [text for text, _err, _status in results] == [f"<html>{url}</html>" for url in urls]
+    assert ctx.peak == 3
+    assert len(ctx.browsers) == 1
+
+
+def test_playwright_fetcher_applies_domain_render_profile(dummy_playwright, monkeypatch):
+    monkeypatch.delenv("PLANZ_RENDER_PROFILE", raising=False)
+
+    fetch_url_playwright("https://www.muenchen.de/veranstaltungen/event/kinder")
+    fetch_url_playwright("https://example.com/")
+
+    muenchen_page, other_page = dummy_playwright.browsers[0].pages
+    assert muenchen_page.wait_until == "domcontentloaded"
+    assert muenchen_page.routes == ["**/*"]
+    assert muenchen_page.waited_for == [".m-event-list-item"]
+    assert other_page.wait_until == "networkidle"
+    assert other_page.routes == []
+    assert other_page.waited_for == []
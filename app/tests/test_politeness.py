@@ -0,0 +1,137 @@
+import asyncio
+from time import monotonic
+
+import httpx
+
+from app.services.fetch.async_fetcher import FetchJob, fetch_all
+from app.services.fetch.politeness import (
+    PolitenessScheduler,
+    TokenBucket,
+    parse_crawl_delay,
+    polite,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def test_parse_crawl_delay_uses_wildcard_agent() -> None:
+    robots = "User-agent: *\nCrawl-delay: 5\nDisallow: /private\n"
+
+    assert parse_crawl_delay(robots) == 5.0
+    assert parse_crawl_delay("User-agent: *\nDisallow:\n") is None
+
+
+def test_token_bucket_allows_burst_then_spaces_requests() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_s=2.0, burst=2, time_fn=clock)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.5
+    assert bucket.reserve() == 1.0
+
+    clock.now = 10.0
+    assert bucket.reserve() == 0.0
+
+
+def test_scheduler_honours_crawl_delay_and_caches_robots() -> None:
+    clock = FakeClock()
+    robots_calls: list[str] = []
+
+    def robots_fetcher(domain: str):
+        robots_calls.append(domain)
+        return "User-agent: *\nCrawl-delay: 3\n" if domain == "slow.example" else None
+
+    scheduler = PolitenessScheduler(
+        rate_per_s=10.0,
+        burst=5,
+        robots_fetcher=robots_fetcher,
+        time_fn=clock,
+        sleep_fn=clock.sleep,
+    )
+
+    waits = [scheduler.reserve("https://www.slow.example/a") for _ in range(3)]
+    fast_waits = [scheduler.reserve("https://fast.example/a") for _ in range(3)]
+
+    assert waits == [0.0, 3.0, 6.0]
+    assert fast_waits == [0.0, 0.0, 0.0]
+    assert sorted(robots_calls) == ["fast.example", "slow.example"]
+    assert scheduler.stats.crawl_delays == {"slow.example": 3.0}
+    assert scheduler.stats.delayed == 2
+
+
+def test_scheduler_caps_crawl_delay() -> None:
+    scheduler = PolitenessScheduler(
+        max_crawl_delay_s=10.0,
+        robots_fetcher=lambda domain: "User-agent: *\nCrawl-delay: 600\n",
+    )
+
+    assert scheduler.crawl_delay("example.com") == 10.0
+
+
+def test_polite_wrapper_waits_before_each_fetch() -> None:
+    clock = FakeClock()
+    scheduler = PolitenessScheduler(
+        rate_per_s=1.0,
+        burst=1,
+        robots_fetcher=None,
+        time_fn=clock,
+        sleep_fn=clock.sleep,
+    )
+    seen: list[tuple[str, float]] = []
+
+    def fetch(url: str, timeout: float = 10.0):
+        seen.append((url, clock.now))
+        return "ok", None, 200
+
+    fetcher = polite(fetch, scheduler)
+    fetcher("https://example.com/a", 5.0)
+    fetcher("https://example.com/b", 5.0)
+
+    assert seen == [("https://example.com/a", 0.0), ("https://example.com/b", 1.0)]
+
+
+def test_fetch_all_throttled_domain_does_not_stall_others() -> None:
+    finished: dict[str, float] = {}
+    started = monotonic()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        finished[str(request.url)] = monotonic() - started
+        return httpx.Response(200, text="ok")
+
+    scheduler = PolitenessScheduler(
+        rate_per_s=100.0,
+        burst=10,
+        robots_fetcher=lambda domain: (
+            "User-agent: *\nCrawl-delay: 1\n" if domain == "slow.example" else None
+        ),
+    )
+    jobs = [FetchJob(url=f"https://slow.example/{i}", domain="slow.example") for i in range(2)]
+    jobs += [FetchJob(url=f"https://fast.example/{i}", domain="fast.example") for i in range(4)]
+
+    async def _main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await fetch_all(
+                jobs,
+                lambda idx, outcome: None,
+                client=client,
+                max_concurrency=2,
+                per_domain=2,
+                scheduler=scheduler,
+            )
+
+    asyncio.run(_main())
+
+    slow = sorted(t for url, t in finished.items() if "slow" in url)
+    fast = [t for url, t in finished.items() if "fast" in url]
+    assert slow[-1] >= 0.9
+    assert max(fast) < 0.5
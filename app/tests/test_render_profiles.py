@@ -0,0 +1,128 @@
+import asyncio
+import types
+
+import pytest
+
+from app.services.fetch.render_profiles import (
+    FULL,
+    LIGHT,
+    MUENCHEN_LISTING,
+    MUENCHEN_PAGE,
+    RenderMetrics,
+    apply_profile,
+    get_profile,
+    profile_for_url,
+    should_block,
+    wait_until_ready,
+)
+
+PAGE_URL = "https://www.muenchen.de/veranstaltungen/event/kinder"
+
+
+def test_should_block_heavy_resources_but_never_documents() -> None:
+    assert should_block(LIGHT, "image", "https://www.muenchen.de/a.jpg", PAGE_URL)
+    assert should_block(LIGHT, "font", "https://www.muenchen.de/a.woff2", PAGE_URL)
+    assert not should_block(LIGHT, "script", "https://www.muenchen.de/app.js", PAGE_URL)
+    assert not should_block(LIGHT, "document", "https://ads.doubleclick.net/x", PAGE_URL)
+    assert not should_block(FULL, "image", "https://www.muenchen.de/a.jpg", PAGE_URL)
+
+
+def test_should_block_tracking_and_third_party_hosts() -> None:
+    assert should_block(LIGHT, "script", "https://www.googletagmanager.com/gtm.js", PAGE_URL)
+    assert not should_block(LIGHT, "script", "https://cdn.example.net/lib.js", PAGE_URL)
+    assert should_block(MUENCHEN_LISTING, "script", "https://cdn.example.net/lib.js", PAGE_URL)
+    assert not should_block(
+        MUENCHEN_LISTING, "xhr", "https://api.muenchen.de/events", PAGE_URL
+    )
+
+
+def test_profile_for_url_uses_domain_mapping_and_env_override(monkeypatch) -> None:
+    monkeypatch.delenv("PLANZ_RENDER_PROFILE", raising=False)
+    assert profile_for_url(PAGE_URL) is MUENCHEN_LISTING
+    assert profile_for_url(f"{PAGE_URL}?page=2") is MUENCHEN_LISTING
+    assert profile_for_url("https://www.muenchen.de/veranstaltungen/event/456") is MUENCHEN_PAGE
+    assert (
+        profile_for_url("https://www.muenchen.de/veranstaltungen/ausstellungen/kinder/example")
+        is MUENCHEN_PAGE
+    )
+    assert profile_for_url("https://example.com/") is FULL
+
+    monkeypatch.setenv("PLANZ_RENDER_PROFILE", "light")
+    assert profile_for_url(PAGE_URL) is LIGHT
+
+
+def test_get_profile_rejects_unknown_names() -> None:
+    with pytest.raises(ValueError):
+        get_profile("turbo")
+
+
+class _FakeRoute:
+    def __init__(self, resource_type: str, url: str) -> None:
+        self.request = types.SimpleNamespace(resource_type=resource_type, url=url)
+        self.outcome = None
+
+    async def abort(self) -> None:
+        self.outcome = "aborted"
+
+    async def continue_(self) -> None:
+        self.outcome = "continued"
+
+
+class _FakeRequest:
+    def __init__(self, body: int, headers: int) -> None:
+        self._sizes = {"responseBodySize": body, "responseHeadersSize": headers}
+
+    async def sizes(self) -> dict:
+        return self._sizes
+
+
+class _FakePage:
+    def __init__(self) -> None:
+        self.handlers: dict = {}
+        self.route_handler = None
+
+    def on(self, event, handler) -> None:
+        self.handlers[event] = handler
+
+    async def route(self, pattern, handler) -> None:
+        self.route_handler = handler
+
+
+def test_apply_profile_aborts_blocked_requests_and_meters_bytes() -> None:
+    page = _FakePage()
+    metrics = RenderMetrics()
+    image = _FakeRoute("image", "https://www.muenchen.de/a.jpg")
+    script = _FakeRoute("script", "https://www.muenchen.de/app.js")
+
+    async def _run() -> None:
+        await apply_profile(page, LIGHT, PAGE_URL, metrics)
+        await page.route_handler(image)
+        await page.route_handler(script)
+
+    asyncio.run(_run())
+    page.handlers["response"](types.SimpleNamespace(headers={"content-length": "1200"}))
+    page.handlers["response"](types.SimpleNamespace(headers={}))
+    # A chunked response has no Content-Length; its size still counts.
+    asyncio.run(page.handlers["requestfinished"](_FakeRequest(1000, 200)))
+    asyncio.run(page.handlers["requestfinished"](_FakeRequest(3000, 300)))
+
+    assert image.outcome == "aborted"
+    assert script.outcome == "continued"
+    assert metrics.profile == "light"
+    assert metrics.blocked == 1
+    assert metrics.requests == 2
+    assert metrics.bytes_transferred == 4500
+
+
+def test_wait_until_ready_caps_selector_wait() -> None:
+    waits = []
+
+    class _Page:
+        async def wait_for_selector(self, selector, timeout):
+            waits.append(timeout)
+            raise TimeoutError(selector)
+
+    asyncio.run(wait_until_ready(_Page(), MUENCHEN_LISTING, timeout=30.0))
+    asyncio.run(wait_until_ready(_Page(), MUENCHEN_PAGE, timeout=30.0))
+
+    assert waits == [MUENCHEN_LISTING.selector_timeout_s * 1000]
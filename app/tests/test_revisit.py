@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.models.source_domain import SourceDomain
+from app.db.models.source_url import SourceUrl
+from app.services.fetch.revisit import RevisitPolicy, estimate_change_rate, is_due
+from app.services.fetch.store_fetch_result import store_fetch_result
+
+DAY = 24 * 3600.0
+POLICY = RevisitPolicy(min_interval_s=0.25 * DAY, max_interval_s=14 * DAY, default_interval_s=DAY)
+
+
+def _make_session():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, future=True)()
+
+
+def _create_source_url(session) -> SourceUrl:
+    domain = SourceDomain(domain="example.com")
+    session.add(domain)
+    session.flush()
+    source_url = SourceUrl(url="https://example.com/events", domain_id=domain.id)
+    session.add(source_url)
+    session.commit()
+    return source_url
+
+
+def test_estimate_change_rate_accounts_for_missed_changes() -> None:
+    assert estimate_change_rate(0, 0, 0.0) is None
+    assert estimate_change_rate(10, 0, 10 * DAY) == 0.0
+    # Every check saw a change: the true rate is higher than one per interval.
+    assert estimate_change_rate(10, 10, 10 * DAY) > 1.0 / DAY
+
+
+def test_interval_uses_default_until_enough_observations() -> None:
+    source_url = SourceUrl(url="https://example.com", revisit_checks=1, revisit_changes=0)
+
+    assert POLICY.interval_for(source_url) == DAY
+
+
+def test_interval_is_clamped_to_bounds() -> None:
+    static = SourceUrl(
+        url="https://example.com/a",
+        revisit_checks=6,
+        revisit_changes=0,
+        revisit_observed_s=6 * DAY,
+    )
+    busy = SourceUrl(
+        url="https://example.com/b",
+        revisit_checks=6,
+        revisit_changes=6,
+        revisit_observed_s=0.6 * DAY,
+    )
+
+    assert POLICY.interval_for(static) == 14 * DAY
+    assert POLICY.interval_for(busy) == 0.25 * DAY
+
+
+def test_store_fetch_result_records_change_history_and_schedules() -> None:
+    session = _make_session()
+    source_url = _create_source_url(session)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    bodies = ["v1", "v1", "v2", "v2", "v2"]
+    for day, body in enumerate(bodies):
+        now = start + timedelta(days=7 * day)
+        store_fetch_result(session, source_url, body, None, now, revisit=POLICY)
+
+    # First fetch is only a baseline; then four weekly checks, one change.
+    assert source_url.revisit_checks == 4
+    assert source_url.revisit_changes == 1
+    assert source_url.revisit_observed_s == 28 * DAY
+    assert source_url.last_changed_at == start + timedelta(days=14)
+    # One change in four weeks: ~28 days expected, clamped to the 14-day max.
+    assert 1.0 / estimate_change_rate(4, 1, 28 * DAY) > 14 * DAY
+    assert source_url.next_fetch_at == now + timedelta(days=14)
+
+
+def test_not_modified_counts_as_unchanged_check() -> None:
+    session = _make_session()
+    source_url = _create_source_url(session)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    store_fetch_result(session, source_url, "v1", None, start, revisit=POLICY)
+
+    store_fetch_result(
+        session, source_url, None, None, start + timedelta(days=1), not_modified=True, revisit=POLICY
+    )
+
+    assert source_url.revisit_checks == 1
+    assert source_url.revisit_changes in (None, 0)
+
+
+def test_is_due() -> None:
+    now = datetime(2026, 1, 10, tzinfo=timezone.utc)
+    never_fetched = SourceUrl(url="https://example.com/a")
+    scheduled = SourceUrl(
+        url="https://example.com/b", fetch_status="ok", next_fetch_at=now + timedelta(hours=1)
+    )
+    overdue = SourceUrl(
+        url="https://example.com/c", fetch_status="ok", next_fetch_at=now - timedelta(hours=1)
+    )
+    failed = SourceUrl(
+        url="https://example.com/d", fetch_status="error", next_fetch_at=now + timedelta(days=3)
+    )
+
+    assert is_due(never_fetched, now)
+    assert not is_due(scheduled, now)
+    assert is_due(overdue, now)
+    assert is_due(failed, now)
@@ -25,7 +25,7 @@ def test_summarize_event_page_returns_summary() -> None:
     mock_client = MagicMock()
     mock_client.chat.completions.create.return_value = fake_response
 
-    with patch("app.services.llm.summarizer.OpenAI", return_value=mock_client):
+    with patch("app.services.llm.gateway.OpenAI", return_value=mock_client):
         result = summarize_event_page("Some event page text about a kids festival.")
 
     assert isinstance(result, EventPageSummary)
@@ -45,7 +45,7 @@ def test_summarize_event_page_is_paid_true() -> None:
     mock_client = MagicMock()
     mock_client.chat.completions.create.return_value = fake_response
 
-    with patch("app.services.llm.summarizer.OpenAI", return_value=mock_client):
+    with patch("app.services.llm.gateway.OpenAI", return_value=mock_client):
         result = summarize_event_page("Theater show page text.")
 
     assert isinstance(result, EventPageSummary)
@@ -64,7 +64,7 @@ def test_summarize_event_page_includes_address() -> None:
     mock_client = MagicMock()
     mock_client.chat.completions.create.return_value = fake_response
 
-    with patch("app.services.llm.summarizer.OpenAI", return_value=mock_client):
+    with patch("app.services.llm.gateway.OpenAI", return_value=mock_client):
         result = summarize_event_page("Museum exhibit page text.")
 
     assert isinstance(result, EventPageSummary)
@@ -99,7 +99,7 @@ def test_summarize_event_page_is_paid_true_for_german_abendkasse_text() -> None:
         "Vorverkauf ab 29 €. Olympiapark München."
     )
 
-    with patch("app.services.llm.summarizer.OpenAI", return_value=mock_client):
+    with patch("app.services.llm.gateway.OpenAI", return_value=mock_client):
         result = summarize_event_page(german_page_text)
 
     assert isinstance(result, EventPageSummary)
@@ -110,14 +110,14 @@ def test_summarize_event_page_returns_none_on_api_error() -> None:
     mock_client = MagicMock()
     mock_client.chat.completions.create.side_effect = Exception("API error")
 
-    with patch("app.services.llm.summarizer.OpenAI", return_value=mock_client):
+    with patch("app.services.llm.gateway.OpenAI", return_value=mock_client):
         result = summarize_event_page("Some event page text.")
 
     assert result is None
 
 
 def test_summarize_event_page_returns_none_for_empty_text() -> None:
-    with patch("app.services.llm.summarizer.OpenAI") as mock_openai_cls:
+    with patch("app.services.llm.gateway.OpenAI") as mock_openai_cls:
         result = summarize_event_page("")
 
     mock_openai_cls.assert_not_called()
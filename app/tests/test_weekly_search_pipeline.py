@@ -50,3 +50,33 @@ def test_weekly_pipeline_runs_fetch_extract_and_sync_stages():
     )
 
     assert called == {"fetch": 1, "extract": 1, "sync": 1}
+
+
+def test_weekly_pipeline_reports_fetches_skipped_by_revisit_planner(capsys):
+    session = _make_session()
+
+    def fetch_runner():
+        return {"fetched_ok": 2, "fetched_error": 0, "fetched_skipped_not_due": 5}
+
+    def extract_runner():
+        return {
+            "sources_processed": 0,
+            "events_created_total": 0,
+            "sources_skipped_no_content": 0,
+            "sources_skipped_unchanged_hash": 0,
+            "sources_skipped_disabled_domain": 0,
+            "sources_empty_extraction": 0,
+            "sources_error_extraction": 0,
+            "sources_past_only": 0,
+        }
+
+    run_weekly_pipeline(
+        session=session,
+        now=datetime.now(tz=timezone.utc),
+        fetch_runner=fetch_runner,
+        extract_runner=extract_runner,
+        sync_runner=lambda *args, **kwargs: 0,
+        calendar_client_factory=None,
+    )
+
+    assert "Skipped (not due): 5" in capsys.readouterr().out
@@ -45,6 +45,10 @@ class RunStats:
     events_updated: int = 0
     errors_count: int = 0
     total_elapsed_s: float = 0.0
+    llm_calls: int = 0
+    llm_prompt_tokens: int = 0
+    llm_completion_tokens: int = 0
+    llm_cost_usd: float = 0.0
 
     @classmethod
     def combine(cls, runs: list["RunStats"]) -> "RunStats":
@@ -59,8 +63,18 @@ class RunStats:
         combined.events_updated = sum(r.events_updated for r in runs)
         combined.errors_count = sum(r.errors_count for r in runs)
         combined.total_elapsed_s = sum(r.total_elapsed_s for r in runs)
+        combined.llm_calls = sum(r.llm_calls for r in runs)
+        combined.llm_prompt_tokens = sum(r.llm_prompt_tokens for r in runs)
+        combined.llm_completion_tokens = sum(r.llm_completion_tokens for r in runs)
+        combined.llm_cost_usd = sum(r.llm_cost_usd for r in runs)
         return combined
 
+    def llm_line(self) -> str:
+        return (
+            f"llm_calls={self.llm_calls} prompt_tokens={self.llm_prompt_tokens} "
+            f"completion_tokens={self.llm_completion_tokens} cost=${self.llm_cost_usd:.4f}"
+        )
+
     def status_line(self) -> str:
         return (
             f"[{self.page_index}/{self.page_total}] "